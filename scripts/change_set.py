@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""# file: scripts/change_set.py
+Formatter change collection for the Auto Formatter GitHub Action
+
+``git status`` and ``git add .`` stat every file in the work tree to find
+what the formatters rewrote, which dominates the commit step on large
+repositories. The format runner already knows which files it handed to
+tools: it stats just those before and after the run (``--changes``) and
+lists the ones whose size or mtime moved. This module hashes only those
+files, compares them with their index blobs, and stages the real rewrites
+with one ``git hash-object`` and one ``git update-index`` call, followed
+by ``git write-tree``. The staged changes can be committed as usual or
+written out as a binary patch instead of pushed.
+
+Usage:
+    python scripts/change_set.py collect --list rewritten.list
+    python scripts/change_set.py collect --list rewritten.list \
+        --patch formatting.patch
+"""
+
+import argparse
+import contextlib
+import hashlib
+import os
+import sys
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from file_discovery import GitError, run_git, write_github_output
+from format_cache import read_list
+
+# Index modes of entries the formatters can rewrite; symlinks (120000)
+# and submodules (160000) are left alone
+FILE_MODES = ("100644", "100755")
+
+
+class Change(NamedTuple):
+    """A tracked file whose contents differ from its index entry."""
+
+    path: str
+    mode: str
+    old_blob: str
+    new_blob: str
+
+
+def stat_snapshot(paths: Iterable[str], root: str = ".") -> Dict[str, Tuple]:
+    """Record the size and mtime of files.
+
+    Args:
+        paths: File paths relative to root
+        root: Repository directory
+
+    Returns:
+        Dict mapping each existing path to (size, mtime_ns)
+    """
+    snapshot = {}
+    for path in paths:
+        with contextlib.suppress(OSError):
+            stat = os.stat(os.path.join(root, path))
+            snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+    return snapshot
+
+
+def rewritten_files(before: Dict[str, Tuple], root: str = ".") -> List[str]:
+    """List files whose size or mtime changed since a snapshot.
+
+    Args:
+        before: Snapshot from stat_snapshot
+        root: Repository directory
+
+    Returns:
+        Paths that were rewritten (or removed), sorted
+    """
+    after = stat_snapshot(before, root)
+    return sorted(path for path in before if after.get(path) != before[path])
+
+
+def blob_id(data: bytes, algorithm: str = "sha1") -> str:
+    """Compute the git object id of a blob without writing it.
+
+    Args:
+        data: File contents
+        algorithm: The repository's object format, sha1 or sha256
+
+    Returns:
+        Hex object id
+    """
+    digest = hashlib.new(algorithm)
+    digest.update(b"blob %d\0" % len(data))
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def index_entries(root: str, paths: Iterable[str]) -> Dict[str, Tuple]:
+    """Look up the index entries of paths.
+
+    Reads the whole index once instead of passing the paths to git, so a
+    long list does not run into ARG_MAX; the index is read, not the work
+    tree, so nothing is stat-ed.
+
+    Args:
+        root: Directory inside the work tree; paths are relative to it
+        paths: Paths to look up
+
+    Returns:
+        Dict mapping tracked paths to (mode, blob id); conflicted and
+        untracked paths are missing
+    """
+    wanted = set(paths)
+    entries = {}
+    for record in run_git(root, "ls-files", "-s", "-z").split(b"\0"):
+        if not record:
+            continue
+        info, _, raw_path = record.partition(b"\t")
+        path = raw_path.decode("utf-8", "surrogateescape")
+        mode, blob, stage = info.decode().split()
+        if path in wanted and stage == "0":
+            entries[path] = (mode, blob)
+    return entries
+
+
+def collect_changes(root: str, paths: Iterable[str]) -> List[Change]:
+    """Compare rewritten files with their index blobs.
+
+    Files a formatter touched but left byte-identical, untracked files
+    and files that disappeared are not changes. The new blob id is
+    computed in-process from the raw contents; stage_changes confirms it
+    through git's filters.
+
+    Args:
+        root: Directory inside the work tree; paths are relative to it
+        paths: Candidate paths, e.g. from rewritten_files
+
+    Returns:
+        Changes, in path order
+    """
+    paths = sorted(set(paths))
+    algorithm = (
+        run_git(root, "rev-parse", "--show-object-format").decode().strip()
+    )
+    entries = index_entries(root, paths)
+    changes = []
+    for path in paths:
+        if path not in entries or entries[path][0] not in FILE_MODES:
+            continue
+        try:
+            with open(os.path.join(root, path), "rb") as f:
+                data = f.read()
+        except OSError:
+            continue
+        mode, old_blob = entries[path]
+        new_blob = blob_id(data, algorithm)
+        if new_blob != old_blob:
+            changes.append(Change(path, mode, old_blob, new_blob))
+    return changes
+
+
+def stage_changes(root: str, changes: List[Change]) -> Tuple[List[Change], str]:
+    """Write the changed blobs and point their index entries at them.
+
+    The blobs are stored by ``git hash-object`` with the repository's
+    clean filters (e.g. ``eol`` attributes) applied, like ``git add``
+    would; changes the filters turn back into the indexed blob are
+    dropped.
+
+    Args:
+        root: Directory inside the work tree; paths are relative to it
+        changes: Changes from collect_changes
+
+    Returns:
+        Tuple of the changes staged and the id of the tree the updated
+        index describes
+
+    Raises:
+        GitError: If git cannot store the blobs or update the index
+    """
+    staged = []
+    # git reads both path lists relative to the top of the work tree
+    prefix = run_git(root, "rev-parse", "--show-prefix").decode().strip()
+    if changes:
+        stored = run_git(
+            root,
+            "hash-object",
+            "-w",
+            "--stdin-paths",
+            stdin="".join(f"{prefix}{c.path}\n" for c in changes).encode(
+                "utf-8", "surrogateescape"
+            ),
+        ).split()
+        staged = [
+            c._replace(new_blob=blob.decode())
+            for c, blob in zip(changes, stored)
+            if blob.decode() != c.old_blob
+        ]
+    if staged:
+        info = "".join(
+            f"{c.mode} {c.new_blob}\t{prefix}{c.path}\0" for c in staged
+        )
+        run_git(
+            root,
+            "update-index",
+            "-z",
+            "--index-info",
+            stdin=info.encode("utf-8", "surrogateescape"),
+        )
+    return staged, run_git(root, "write-tree").decode().strip()
+
+
+def write_patch(root: str, output: str) -> int:
+    """Write the staged changes as a binary patch.
+
+    Compares the index with HEAD, so the work tree is not stat-ed again.
+
+    Args:
+        root: Directory inside the work tree
+        output: Patch file to write
+
+    Returns:
+        Size of the patch in bytes
+    """
+    patch = run_git(root, "diff", "--cached", "--binary", "--no-color")
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(output, "wb") as f:
+        f.write(patch)
+    return len(patch)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point for the change collection CLI.
+
+    Args:
+        argv: Command line arguments, defaults to sys.argv
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(
+        description="Collect and stage formatter rewrites for Auto Formatter"
+    )
+    parser.add_argument("--root", default=".", help="Repository directory")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    collect = subparsers.add_parser(
+        "collect", help="Stage the files the formatters rewrote"
+    )
+    collect.add_argument(
+        "--list",
+        required=True,
+        help="NUL-separated rewritten files from format_runner.py --changes",
+    )
+    collect.add_argument(
+        "--patch", help="Also write the staged changes to this patch file"
+    )
+
+    args = parser.parse_args(argv)
+
+    try:
+        candidates = collect_changes(args.root, read_list(args.list))
+        changes, tree = stage_changes(args.root, candidates)
+        outputs = {
+            "changes": "true" if changes else "false",
+            "files": len(changes),
+            "tree": tree,
+        }
+        if args.patch:
+            size = write_patch(args.root, args.patch)
+            outputs["patch"] = args.patch
+            print(f"📤 Wrote {size} byte patch to {args.patch}")
+    except GitError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    write_github_output(outputs)
+    print(f"📝 Staged {len(changes)} formatted files (tree {tree[:12]})")
+    for change in changes:
+        print(f"  {change.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
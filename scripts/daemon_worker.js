@@ -0,0 +1,198 @@
+#!/usr/bin/env node
+// file: scripts/daemon_worker.js
+// Warm Node worker for the Auto Formatter daemon (format_daemon.py).
+//
+// Loads prettier and eslint once and serves the command lines the format
+// runner would otherwise start as new processes. Requests arrive on stdin
+// and responses leave on stdout, one JSON object per line:
+//
+//   {"id": 1, "argv": ["prettier", "--write", "a.js"], "cwd": "/repo"}
+//   {"id": 1, "returncode": 0, "output": ""}
+//
+// Only the flags the runner passes are understood; anything else is
+// answered with returncode 125 so the caller runs the real CLI instead.
+
+"use strict";
+
+const fs = require("fs");
+const path = require("path");
+const readline = require("readline");
+
+// Returned for command lines the worker does not emulate
+const UNSUPPORTED = 125;
+
+// Returned when a tool's package cannot be loaded
+const NOT_INSTALLED = 127;
+
+const modules = {};
+
+function load(name) {
+  if (!(name in modules)) {
+    modules[name] = require(name);
+  }
+  return modules[name];
+}
+
+function loadPlugins(names) {
+  const plugins = [];
+  for (const name of names) {
+    try {
+      plugins.push(load(name));
+    } catch (_err) {
+      // Optional plugins are only used when installed next to prettier
+    }
+  }
+  return plugins;
+}
+
+async function runPrettier(args, cwd) {
+  const prettier = load("prettier");
+  let mode = null;
+  const files = [];
+  for (const arg of args) {
+    if (arg === "--write" || arg === "--check") {
+      mode = arg;
+    } else if (
+      arg === "--cache" ||
+      arg.startsWith("--cache-location=") ||
+      arg.startsWith("--cache-strategy=")
+    ) {
+      // The worker keeps no results cache; every file is formatted
+      continue;
+    } else if (arg.startsWith("-")) {
+      return { returncode: UNSUPPORTED, output: `unsupported flag ${arg}` };
+    } else {
+      files.push(arg);
+    }
+  }
+  if (mode === null) {
+    return { returncode: UNSUPPORTED, output: "expected --write or --check" };
+  }
+
+  // Pick up config edits made while the daemon was running
+  await prettier.clearConfigCache();
+  const ignorePath = [".gitignore", ".prettierignore"].map((name) =>
+    path.join(cwd, name),
+  );
+  const plugins = loadPlugins(["@prettier/plugin-xml"]);
+  const lines = [];
+  let returncode = 0;
+  for (const file of files) {
+    const filepath = path.resolve(cwd, file);
+    const start = Date.now();
+    try {
+      const info = await prettier.getFileInfo(filepath, { ignorePath });
+      if (info.ignored) {
+        continue;
+      }
+      if (!info.inferredParser) {
+        lines.push(`[error] No parser could be inferred for file "${file}".`);
+        returncode = 2;
+        continue;
+      }
+      const config = (await prettier.resolveConfig(filepath, {
+        editorconfig: true,
+      })) || {};
+      const source = fs.readFileSync(filepath, "utf8");
+      const formatted = await prettier.format(source, {
+        ...config,
+        filepath,
+        plugins: [...plugins, ...(config.plugins || [])],
+      });
+      // Log like prettier --write, which the runner's per-extension
+      // statistics read
+      if (formatted === source) {
+        if (mode === "--write") {
+          lines.push(`${file} ${Date.now() - start}ms (unchanged)`);
+        }
+        continue;
+      }
+      if (mode === "--write") {
+        fs.writeFileSync(filepath, formatted);
+        lines.push(`${file} ${Date.now() - start}ms`);
+      } else {
+        lines.push(`[warn] ${file}`);
+        returncode = Math.max(returncode, 1);
+      }
+    } catch (err) {
+      lines.push(`[error] ${file}: ${err.message.split("\n")[0]}`);
+      returncode = 2;
+    }
+  }
+  return { returncode, output: lines.join("\n") };
+}
+
+async function runEslint(args, cwd) {
+  const { ESLint } = load("eslint");
+  const options = { cwd };
+  let format = "stylish";
+  const files = [];
+  for (let i = 0; i < args.length; i++) {
+    const arg = args[i];
+    if (arg === "--no-eslintrc") {
+      options.useEslintrc = false;
+    } else if (arg === "--config") {
+      options.overrideConfigFile = path.resolve(cwd, args[++i]);
+    } else if (arg === "--format") {
+      format = args[++i];
+    } else if (arg === "--fix") {
+      options.fix = true;
+    } else if (arg.startsWith("-")) {
+      return { returncode: UNSUPPORTED, output: `unsupported flag ${arg}` };
+    } else {
+      files.push(arg);
+    }
+  }
+
+  // A new instance per request re-reads configs; the loaded plugin and
+  // parser modules stay in the require cache, which is the slow part
+  const eslint = new ESLint(options);
+  const results = await eslint.lintFiles(files);
+  if (options.fix) {
+    await ESLint.outputFixes(results);
+  }
+  const formatter = await eslint.loadFormatter(format);
+  const output = await formatter.format(results);
+  const failed = results.some((r) => r.errorCount > 0);
+  return { returncode: failed ? 1 : 0, output: output.trim() };
+}
+
+const TOOLS = { prettier: runPrettier, eslint: runEslint };
+
+async function handle(request) {
+  const [tool, ...args] = request.argv || [];
+  const run = TOOLS[tool];
+  if (!run) {
+    return { returncode: UNSUPPORTED, output: `${tool} is not served` };
+  }
+  try {
+    return await run(args, request.cwd || process.cwd());
+  } catch (err) {
+    if (err.code === "MODULE_NOT_FOUND") {
+      return { returncode: NOT_INSTALLED, output: `${tool} is not installed` };
+    }
+    return { returncode: 2, output: String(err.stack || err) };
+  }
+}
+
+async function main() {
+  const input = readline.createInterface({ input: process.stdin });
+  for await (const line of input) {
+    if (!line.trim()) {
+      continue;
+    }
+    let request;
+    try {
+      request = JSON.parse(line);
+    } catch (err) {
+      process.stdout.write(
+        JSON.stringify({ id: null, returncode: 2, output: err.message }) + "\n",
+      );
+      continue;
+    }
+    const response = await handle(request);
+    process.stdout.write(JSON.stringify({ id: request.id, ...response }) + "\n");
+  }
+}
+
+main();
@@ -0,0 +1,840 @@
+#!/usr/bin/env python3
+"""# file: scripts/file_discovery.py
+Single-pass file discovery for the Auto Formatter GitHub Action
+
+Walks the repository once with ``os.scandir``, prunes ignored directories
+as it goes and sorts every file into per-language buckets, so the
+formatting steps and ``FormattingManager`` share one traversal instead of
+running a separate ``find``/``glob`` per language.
+
+File lists can also come from the git index: ``tracked`` lists every
+tracked file with ``git ls-files``, and ``changed`` lists the files a
+branch changed since ``<base>...HEAD``, falling back to every tracked file
+when formatter configuration changed or the base cannot be diffed.
+
+A listing can be split into size-balanced shards so several runners each
+format part of a large repository.
+
+Usage:
+    python scripts/file_discovery.py scan
+    python scripts/file_discovery.py scan --languages python,go --json
+    python scripts/file_discovery.py scan --output-dir "$RUNNER_TEMP/files"
+    python scripts/file_discovery.py scan --mode changed --base origin/main
+    python scripts/file_discovery.py scan --shard-index 0 --shard-count 4
+"""
+
+import argparse
+import heapq
+import json
+import os
+import re
+import subprocess
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Pattern, Tuple
+
+# File name suffixes for each language bucket; a file may land in several
+# buckets (e.g. "app.component.ts" is both nodejs and angular)
+LANGUAGE_SUFFIXES: Dict[str, Tuple[str, ...]] = {
+    "python": (".py",),
+    "go": (".go",),
+    "nodejs": (".js", ".jsx", ".ts", ".tsx", ".vue"),
+    "typescript": (".ts", ".tsx"),
+    "angular": (".component.ts", ".service.ts", ".module.ts"),
+    "cpp": (".cpp", ".cc", ".cxx", ".h", ".hpp", ".hxx"),
+    "csharp": (".cs",),
+    "dotnet": (".sln", ".csproj"),
+    "json": (".json",),
+    "shell": (".sh", ".bash"),
+    "swift": (".swift",),
+    "r": (".R", ".r", ".Rmd"),
+    "css": (".css", ".scss", ".sass", ".less"),
+    "markdown": (".md", ".markdown"),
+    "html": (".html", ".htm"),
+    "yaml": (".yml", ".yaml"),
+    "toml": (".toml",),
+    "xml": (".xml", ".svg"),
+}
+
+# Directories never descended into, whatever the ignore files say
+DEFAULT_PRUNE_DIRS = frozenset({".git", ".hg", ".svn", "node_modules"})
+
+# Ignore files honoured in every directory of the walk
+DEFAULT_IGNORE_FILES = (".gitignore", ".prettierignore")
+
+# Where file lists come from: a filesystem walk, every tracked file, or
+# the files changed relative to a base revision
+DISCOVERY_MODES = ("walk", "tracked", "changed")
+
+# Files that change the output of formatters or linters for files that did
+# not change themselves; a "changed" run falls back to every tracked file
+# when one of them is modified
+CONFIG_FILES = frozenset(
+    {
+        ".clang-format",
+        ".editorconfig",
+        ".golangci.yml",
+        ".lintr",
+        ".prettierignore",
+        ".pylintrc",
+        ".ruff.toml",
+        ".swiftlint.yml",
+        "action.yml",
+        "go.mod",
+        "package.json",
+        "pyproject.toml",
+        "ruff.toml",
+        "setup.cfg",
+    }
+)
+CONFIG_PREFIXES = (
+    ".eslintrc",
+    ".markdownlint",
+    ".prettierrc",
+    ".stylelintrc",
+    "eslint.config.",
+    "prettier.config.",
+    "stylelint.config.",
+)
+
+# Fixed cost charged per file when balancing shards, in bytes, so a shard
+# of many small files is not treated as free next to one of a few large
+# ones (process start, parsing and rewriting are per file)
+SHARD_FILE_WEIGHT = 4096
+
+# Buckets formatted only by tools that run over the whole tree (dotnet
+# format, swiftlint, styler, lintr); only shard 0 runs those tools, so a
+# sharded run keeps all of their files there
+WHOLE_TREE_BUCKETS = ("csharp", "dotnet", "swift", "r")
+
+# Buckets with per-file tools and whole-tree tools (go mod tidy,
+# golangci-lint); shard 0 gets one of their files, so it sets up the
+# language and runs the whole-tree tools while the rest stays balanced
+ANCHORED_BUCKETS = ("go",)
+
+
+class GitError(Exception):
+    """Raised when a git command needed for file discovery fails."""
+
+
+def run_git(root: str, *args: str, stdin: Optional[bytes] = None) -> bytes:
+    """Run git and return its stdout.
+
+    Args:
+        root: Directory to run git in
+        *args: git arguments
+        stdin: Bytes fed to git's standard input
+
+    Returns:
+        Raw stdout
+
+    Raises:
+        GitError: If git is missing or the command fails
+    """
+    try:
+        result = subprocess.run(
+            ["git", *args],
+            cwd=root,
+            input=stdin,
+            capture_output=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError) as e:
+        stderr = getattr(e, "stderr", b"") or b""
+        lines = stderr.decode("utf-8", "replace").strip().splitlines()
+        detail = lines[0] if lines else str(e)
+        raise GitError(f"git {args[0]} failed: {detail}") from e
+    return result.stdout
+
+
+def _translate_glob(pattern: str) -> str:
+    """Translate a gitignore glob into a regular expression body.
+
+    Args:
+        pattern: Glob without leading/trailing slashes or negation
+
+    Returns:
+        Regular expression matching a slash-separated relative path
+    """
+    parts = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            parts.append("/.*")
+            i += 3
+        elif pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 1 :]:
+            end = pattern.index("]", i + 1)
+            body = pattern[i + 1 : end].replace("\\", "\\\\")
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            parts.append(f"[{body}]")
+            i = end + 1
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(parts)
+
+
+class IgnoreRules:
+    """Gitignore-style rules scoped to the directory that declared them.
+
+    Supports comments, blank lines, ``!`` negation, trailing ``/`` for
+    directory-only rules, anchoring by a leading or inner ``/``, and the
+    ``*``, ``?``, ``[...]`` and ``**`` wildcards. As in git, the last
+    matching rule wins and files inside an ignored directory cannot be
+    re-included, because the directory is never walked.
+    """
+
+    def __init__(self):
+        """Initialize an empty rule set."""
+        # (base directory, compiled pattern, negated, directory only)
+        self.rules: List[Tuple[str, Pattern, bool, bool]] = []
+
+    def add_lines(self, lines: Iterable[str], base: str = "") -> None:
+        """Add rules from ignore file lines.
+
+        Args:
+            lines: Lines of an ignore file
+            base: Directory of the ignore file, relative to the walk root
+        """
+        for raw in lines:
+            line = raw.rstrip("\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+            line = line.rstrip()
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:]
+            if line.startswith("\\"):
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.strip("/") if dir_only else line.lstrip("/")
+            if not line:
+                continue
+            anchored = raw.lstrip("!").startswith("/") or "/" in line
+            prefix = "" if anchored else "(?:.*/)?"
+            regex = re.compile(f"{prefix}{_translate_glob(line)}$")
+            self.rules.append((base, regex, negated, dir_only))
+
+    def add_file(self, path: str, base: str = "") -> bool:
+        """Add rules from an ignore file if it exists.
+
+        Args:
+            path: Path to the ignore file
+            base: Directory of the ignore file, relative to the walk root
+
+        Returns:
+            True if the file was read
+        """
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                self.add_lines(f, base)
+        except OSError:
+            return False
+        return True
+
+    def is_ignored(self, rel_path: str, is_dir: bool = False) -> bool:
+        """Check a path against the rules.
+
+        Args:
+            rel_path: Slash-separated path relative to the walk root
+            is_dir: Whether the path is a directory
+
+        Returns:
+            True if the last matching rule ignores the path
+        """
+        ignored = False
+        for base, regex, negated, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if base:
+                if not rel_path.startswith(base + "/"):
+                    continue
+                candidate = rel_path[len(base) + 1 :]
+            else:
+                candidate = rel_path
+            if regex.match(candidate):
+                ignored = not negated
+        return ignored
+
+    def child(self) -> "IgnoreRules":
+        """Copy the rules for a subdirectory that adds its own.
+
+        Returns:
+            New rule set sharing the current rules
+        """
+        rules = IgnoreRules()
+        rules.rules = list(self.rules)
+        return rules
+
+
+def classify(name: str, languages: Optional[Iterable[str]] = None) -> List[str]:
+    """Return the language buckets a file name belongs to.
+
+    Args:
+        name: File name or path
+        languages: Buckets to consider, defaults to all
+
+    Returns:
+        Matching bucket names
+    """
+    wanted = LANGUAGE_SUFFIXES if languages is None else languages
+    return [
+        language
+        for language in wanted
+        if name.endswith(LANGUAGE_SUFFIXES.get(language, ()))
+    ]
+
+
+def _with_ignore_files(
+    rules: IgnoreRules,
+    path: str,
+    rel_dir: str,
+    entries: List[os.DirEntry],
+    ignore_files: Tuple[str, ...],
+) -> IgnoreRules:
+    """Extend the inherited rules with a directory's own ignore files.
+
+    Args:
+        rules: Rules inherited from the parent directories
+        path: Directory path
+        rel_dir: Directory path relative to the walk root
+        entries: Directory entries
+        ignore_files: Ignore file names to look for
+
+    Returns:
+        The inherited rules, or a copy extended with the directory's rules
+    """
+    names = {entry.name for entry in entries}
+    own = [name for name in ignore_files if name in names]
+    if not own:
+        return rules
+    rules = rules.child()
+    for name in own:
+        rules.add_file(os.path.join(path, name), rel_dir)
+    return rules
+
+
+def walk_files(
+    root: str = ".",
+    ignore_files: Iterable[str] = DEFAULT_IGNORE_FILES,
+    prune_dirs: Iterable[str] = DEFAULT_PRUNE_DIRS,
+) -> Iterator[str]:
+    """Walk a tree once, skipping pruned and ignored entries.
+
+    Symlinked directories are not followed.
+
+    Args:
+        root: Directory to walk
+        ignore_files: Ignore file names read in every directory
+        prune_dirs: Directory names never descended into
+
+    Yields:
+        Slash-separated file paths relative to root
+    """
+    ignore_files = tuple(ignore_files)
+    prune_dirs = frozenset(prune_dirs)
+    stack: List[Tuple[str, str, IgnoreRules]] = [(root, "", IgnoreRules())]
+
+    while stack:
+        path, rel_dir, rules = stack.pop()
+        try:
+            entries = sorted(os.scandir(path), key=lambda e: e.name)
+        except OSError:
+            continue
+
+        rules = _with_ignore_files(rules, path, rel_dir, entries, ignore_files)
+
+        subdirs = []
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                is_file = not is_dir and entry.is_file()
+            except OSError:
+                continue
+            if is_dir:
+                if entry.name in prune_dirs:
+                    continue
+                if not rules.is_ignored(rel_path, is_dir=True):
+                    subdirs.append((entry.path, rel_path, rules))
+            elif is_file and not rules.is_ignored(rel_path):
+                yield rel_path
+
+        # Reversed so subdirectories are walked in name order
+        stack.extend(reversed(subdirs))
+
+
+def _git_paths(root: str, *args: str) -> List[str]:
+    """Run a git command that prints NUL-separated paths.
+
+    Args:
+        root: Directory to run git in
+        *args: git arguments
+
+    Returns:
+        Paths printed by git
+
+    Raises:
+        GitError: If git is missing or the command fails
+    """
+    return [
+        path.decode("utf-8", "surrogateescape")
+        for path in run_git(root, *args).split(b"\0")
+        if path
+    ]
+
+
+def git_tracked_files(root: str = ".") -> List[str]:
+    """List tracked files from the git index.
+
+    Args:
+        root: Directory inside the work tree; paths are relative to it
+
+    Returns:
+        Tracked file paths
+
+    Raises:
+        GitError: If root is not in a git work tree
+    """
+    return _git_paths(root, "ls-files", "-z")
+
+
+def git_changed_files(base: str, root: str = ".") -> List[str]:
+    """List files added, copied, modified or renamed since a base revision.
+
+    Compares against the merge base (``<base>...HEAD``), so commits that
+    landed on the base branch meanwhile are not included.
+
+    Args:
+        base: Base revision, e.g. the pull request base SHA
+        root: Directory inside the work tree; paths are relative to it
+
+    Returns:
+        Changed file paths below root
+
+    Raises:
+        GitError: If the base is unknown or has no merge base with HEAD
+    """
+    return _git_paths(
+        root,
+        "diff",
+        "--name-only",
+        "-z",
+        "--relative",
+        "--diff-filter=ACMR",
+        f"{base}...HEAD",
+    )
+
+
+def is_config_file(path: str) -> bool:
+    """Check whether a path is formatter or linter configuration.
+
+    Args:
+        path: Slash-separated file path
+
+    Returns:
+        True if changing the file can change results for other files
+    """
+    name = path.rsplit("/", 1)[-1]
+    return name in CONFIG_FILES or name.startswith(CONFIG_PREFIXES)
+
+
+def filter_paths(
+    paths: Iterable[str],
+    root: str = ".",
+    ignore_files: Iterable[str] = DEFAULT_IGNORE_FILES,
+    prune_dirs: Iterable[str] = DEFAULT_PRUNE_DIRS,
+) -> List[str]:
+    """Apply the walker's pruning to a list of paths from git.
+
+    Only the ignore files at root are read, since git has already applied
+    the nested ``.gitignore`` files. Paths that are not regular files
+    (submodules, files deleted from the work tree) are dropped.
+
+    Args:
+        paths: Slash-separated paths relative to root
+        root: Directory the paths are relative to
+        ignore_files: Ignore file names read at root
+        prune_dirs: Directory names whose contents are dropped
+
+    Returns:
+        Remaining paths, in input order
+    """
+    rules = IgnoreRules()
+    for name in ignore_files:
+        rules.add_file(os.path.join(root, name))
+    prune_dirs = frozenset(prune_dirs)
+    ignored_dirs: Dict[str, bool] = {}
+
+    def dir_ignored(rel_dir: str) -> bool:
+        if rel_dir not in ignored_dirs:
+            parent, _, name = rel_dir.rpartition("/")
+            ignored_dirs[rel_dir] = (
+                name in prune_dirs
+                or (bool(parent) and dir_ignored(parent))
+                or rules.is_ignored(rel_dir, is_dir=True)
+            )
+        return ignored_dirs[rel_dir]
+
+    kept = []
+    for path in paths:
+        parent = path.rpartition("/")[0]
+        if parent and dir_ignored(parent):
+            continue
+        if rules.is_ignored(path) or not os.path.isfile(
+            os.path.join(root, path)
+        ):
+            continue
+        kept.append(path)
+    return kept
+
+
+def select_files(
+    root: str = ".",
+    mode: str = "walk",
+    base: Optional[str] = None,
+    ignore_files: Iterable[str] = DEFAULT_IGNORE_FILES,
+    prune_dirs: Iterable[str] = DEFAULT_PRUNE_DIRS,
+) -> Tuple[List[str], str]:
+    """List the files to format in the given discovery mode.
+
+    A ``changed`` run falls back to every tracked file when no base is
+    given, the base cannot be diffed (e.g. a shallow clone without it) or
+    a configuration file changed.
+
+    Args:
+        root: Directory to list files under
+        mode: One of DISCOVERY_MODES
+        base: Base revision for ``changed`` mode
+        ignore_files: Ignore file names honoured while listing
+        prune_dirs: Directory names never listed
+
+    Returns:
+        Tuple of file paths relative to root and the mode actually used
+
+    Raises:
+        ValueError: If mode is unknown
+        GitError: If a git mode is used outside a git work tree
+    """
+    if mode not in DISCOVERY_MODES:
+        raise ValueError(f"Unknown discovery mode: {mode}")
+    if mode == "walk":
+        return list(walk_files(root, ignore_files, prune_dirs)), mode
+
+    if mode == "changed":
+        changed = None
+        if not base:
+            print(
+                "⚠️  No base revision; formatting every tracked file",
+                file=sys.stderr,
+            )
+        else:
+            try:
+                changed = git_changed_files(base, root)
+            except GitError as e:
+                print(f"⚠️  {e}; formatting every tracked file", file=sys.stderr)
+        config = next(
+            (path for path in changed or [] if is_config_file(path)), None
+        )
+        if config:
+            print(
+                f"ℹ️ {config} changed; formatting every tracked file",
+                file=sys.stderr,
+            )
+        elif changed is not None:
+            return filter_paths(changed, root, ignore_files, prune_dirs), mode
+
+    tracked = git_tracked_files(root)
+    return filter_paths(tracked, root, ignore_files, prune_dirs), "tracked"
+
+
+def whole_tree_files(paths: Iterable[str]) -> List[str]:
+    """Files a sharded run must keep in shard 0 for its whole-tree tools.
+
+    Args:
+        paths: File paths
+
+    Returns:
+        Every file of WHOLE_TREE_BUCKETS and the first file (by path) of
+        each ANCHORED_BUCKETS bucket
+    """
+    buckets = bucket_files(paths, (*WHOLE_TREE_BUCKETS, *ANCHORED_BUCKETS))
+    pinned = []
+    for language, files in buckets.items():
+        if language in ANCHORED_BUCKETS:
+            files = sorted(files)[:1]
+        pinned.extend(files)
+    return list(dict.fromkeys(pinned))
+
+
+def shard_files(
+    paths: Iterable[str],
+    index: int,
+    count: int,
+    root: str = ".",
+    pinned: Iterable[str] = (),
+) -> List[str]:
+    """Select one shard of a file list, balanced by file size.
+
+    Files are assigned largest first to the shard with the least total
+    weight (size plus SHARD_FILE_WEIGHT), ties broken by path and shard
+    number, so every runner checking out the same commit computes the
+    same split without coordinating. Splitting paths before bucketing
+    keeps a file that lands in several language buckets in one shard.
+
+    Args:
+        paths: File paths relative to root
+        index: Zero-based shard to return
+        count: Number of shards
+        root: Directory the paths are relative to
+        pinned: Paths that go to shard 0 whatever their weight, e.g.
+            from whole_tree_files()
+
+    Returns:
+        The shard's paths, in input order
+
+    Raises:
+        ValueError: If index is not in range(count)
+    """
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Shard {index} is not in 0..{count - 1}")
+    paths = list(paths)
+    if count == 1:
+        return paths
+
+    weights = {}
+    for path in paths:
+        try:
+            size = os.path.getsize(os.path.join(root, path))
+        except OSError:
+            size = 0
+        weights[path] = size + SHARD_FILE_WEIGHT
+
+    pinned = set(pinned).intersection(weights)
+    loads = [(sum(weights[p] for p in pinned), 0)]
+    loads += [(0, shard) for shard in range(1, count)]
+    heapq.heapify(loads)
+    selected = set(pinned) if index == 0 else set()
+    unpinned = (p for p in weights if p not in pinned)
+    for path in sorted(unpinned, key=lambda p: (-weights[p], p)):
+        load, shard = heapq.heappop(loads)
+        if shard == index:
+            selected.add(path)
+        heapq.heappush(loads, (load + weights[path], shard))
+    return [path for path in paths if path in selected]
+
+
+def bucket_files(
+    paths: Iterable[str], languages: Optional[Iterable[str]] = None
+) -> Dict[str, List[str]]:
+    """Sort file paths into language buckets.
+
+    Args:
+        paths: File paths
+        languages: Buckets to fill, defaults to every known language
+
+    Returns:
+        Dict mapping each requested language to its file paths
+    """
+    wanted = list(LANGUAGE_SUFFIXES if languages is None else languages)
+    buckets: Dict[str, List[str]] = {language: [] for language in wanted}
+    for path in paths:
+        for language in classify(path, wanted):
+            buckets[language].append(path)
+    return buckets
+
+
+def discover_files(
+    root: str = ".",
+    languages: Optional[Iterable[str]] = None,
+    ignore_files: Iterable[str] = DEFAULT_IGNORE_FILES,
+    prune_dirs: Iterable[str] = DEFAULT_PRUNE_DIRS,
+    mode: str = "walk",
+    base: Optional[str] = None,
+) -> Dict[str, List[str]]:
+    """Sort the files under root into language buckets in one listing.
+
+    Args:
+        root: Directory to list files under
+        languages: Buckets to fill, defaults to every known language
+        ignore_files: Ignore file names honoured while listing
+        prune_dirs: Directory names never listed
+        mode: One of DISCOVERY_MODES
+        base: Base revision for ``changed`` mode
+
+    Returns:
+        Dict mapping each requested language to its relative file paths
+    """
+    paths, _mode = select_files(root, mode, base, ignore_files, prune_dirs)
+    return bucket_files(paths, languages)
+
+
+def write_file_lists(
+    buckets: Dict[str, List[str]], output_dir: str
+) -> Dict[str, str]:
+    """Write one NUL-separated list per bucket for ``xargs -0``.
+
+    Args:
+        buckets: Language buckets from discover_files
+        output_dir: Directory for the ``<language>.list`` files
+
+    Returns:
+        Dict mapping each language to its list file path
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {}
+    for language, files in buckets.items():
+        path = os.path.join(output_dir, f"{language}.list")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("".join(f"{name}\0" for name in files))
+        paths[language] = path
+    return paths
+
+
+def write_github_output(outputs: Dict[str, Any]) -> None:
+    """Expose values as step outputs.
+
+    Args:
+        outputs: Output names and values, e.g. the file count per language
+    """
+    output_path = os.getenv("GITHUB_OUTPUT")
+    if not output_path:
+        return
+    with open(output_path, "a", encoding="utf-8") as f:
+        for name, value in outputs.items():
+            f.write(f"{name}={value}\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point for the file discovery CLI.
+
+    Args:
+        argv: Command line arguments, defaults to sys.argv
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(
+        description="Single-pass file discovery for Auto Formatter"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    scan = subparsers.add_parser(
+        "scan", help="Walk the tree once and bucket files by language"
+    )
+    scan.add_argument("--root", default=".", help="Directory to walk")
+    scan.add_argument(
+        "--languages",
+        default="all",
+        help="Comma-separated buckets to fill (default: all)",
+    )
+    scan.add_argument(
+        "--ignore-file",
+        action="append",
+        dest="ignore_files",
+        help="Ignore file name honoured in every directory "
+        "(default: .gitignore and .prettierignore)",
+    )
+    scan.add_argument(
+        "--mode",
+        choices=DISCOVERY_MODES,
+        default="walk",
+        help="List files by walking the tree, from the git index, or only "
+        "those changed since --base (default: walk)",
+    )
+    scan.add_argument(
+        "--base",
+        help="Base revision for --mode changed, e.g. the PR base SHA",
+    )
+    scan.add_argument(
+        "--shard-index",
+        type=int,
+        default=0,
+        help="Zero-based shard of the files to list (default: 0)",
+    )
+    scan.add_argument(
+        "--shard-count",
+        type=int,
+        default=1,
+        help="Split the files into this many size-balanced shards (default: 1)",
+    )
+    scan.add_argument(
+        "--output-dir",
+        help="Write NUL-separated <language>.list files to this directory",
+    )
+    scan.add_argument(
+        "--json", action="store_true", help="Print the buckets as JSON"
+    )
+
+    args = parser.parse_args(argv)
+
+    languages = None
+    if args.languages != "all":
+        languages = [lang.strip() for lang in args.languages.split(",")]
+        unknown = [lang for lang in languages if lang not in LANGUAGE_SUFFIXES]
+        if unknown:
+            print(
+                f"❌ Unknown languages: {', '.join(unknown)}", file=sys.stderr
+            )
+            return 2
+
+    try:
+        paths, mode = select_files(
+            args.root,
+            args.mode,
+            args.base,
+            args.ignore_files or DEFAULT_IGNORE_FILES,
+        )
+    except GitError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    try:
+        shard = shard_files(
+            paths,
+            args.shard_index,
+            args.shard_count,
+            args.root,
+            whole_tree_files(paths),
+        )
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+    if args.shard_count > 1:
+        print(
+            f"🗂️ Shard {args.shard_index + 1}/{args.shard_count}: "
+            f"{len(shard)} of {len(paths)} files"
+        )
+    buckets = bucket_files(shard, languages)
+    counts = {language: len(files) for language, files in buckets.items()}
+
+    if args.output_dir:
+        write_file_lists(buckets, args.output_dir)
+    present = {language: count for language, count in counts.items() if count}
+    write_github_output(
+        {"mode": mode, **counts, "counts": json.dumps(present, sort_keys=True)}
+    )
+
+    if args.json:
+        print(json.dumps(buckets, indent=2))
+    else:
+        print(f"🔍 Discovery mode: {mode}")
+        for language, count in counts.items():
+            if count:
+                print(f"📁 {language}: {count} files")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
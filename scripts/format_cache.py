@@ -0,0 +1,607 @@
+#!/usr/bin/env python3
+"""# file: scripts/format_cache.py
+Content-hash formatting cache for the Auto Formatter GitHub Action
+
+Remembers which file contents are already formatted and lint-clean for a
+given toolchain, so unchanged files are not handed to clang-format,
+prettier, shfmt and friends again on every push. An entry is keyed by the
+file's content hash and a per-language fingerprint of the tool versions,
+their config files and the action settings; any change to one of those
+misses the cache and the file is processed again.
+
+The cache is a single JSON file with LRU eviction, suitable for
+``actions/cache`` save/restore between runs.
+
+Usage:
+    python scripts/format_cache.py filter --list-dir "$RUNNER_TEMP/files"
+    python scripts/format_cache.py record --list-dir "$RUNNER_TEMP/files"
+"""
+
+import argparse
+from collections import OrderedDict
+import functools
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Maximum number of remembered clean file contents; at ~35 bytes per entry
+# the default keeps the cache file around 7 MB
+MAX_ENTRIES = 200_000
+
+# Bump to invalidate every cached entry when the cache semantics change
+CACHE_FORMAT_VERSION = 1
+
+# Read size used when hashing file contents
+CHUNK_SIZE = 1024 * 1024
+
+# Config files read by prettier, shared by every prettier-formatted language
+PRETTIER_CONFIGS = (
+    ".prettierrc",
+    ".prettierrc.json",
+    ".prettierrc.yml",
+    ".prettierrc.yaml",
+    ".prettierrc.js",
+    ".prettierrc.cjs",
+    "prettier.config.js",
+    ".prettierignore",
+    ".editorconfig",
+)
+
+# Tools and config files that decide whether a clean file stays clean,
+# per file-discovery language bucket
+CACHE_LANGUAGES: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "python": (
+        ("ruff", "pylint"),
+        (".ruff.toml", "ruff.toml", "pyproject.toml", "setup.cfg"),
+    ),
+    "go": (
+        ("go", "gofumpt", "goimports", "golines", "golangci-lint"),
+        ("go.mod", ".golangci.yml"),
+    ),
+    "nodejs": (
+        ("prettier", "eslint"),
+        (
+            *PRETTIER_CONFIGS,
+            ".eslintrc.js",
+            ".eslintrc.json",
+            ".eslintrc.yml",
+            "eslint.config.js",
+        ),
+    ),
+    "cpp": (("clang-format", "cpplint"), (".clang-format", "CPPLINT.cfg")),
+    "json": (("prettier",), PRETTIER_CONFIGS),
+    "shell": (("shfmt", "shellcheck"), (".editorconfig", ".shellcheckrc")),
+    "css": (
+        ("prettier", "stylelint"),
+        (
+            *PRETTIER_CONFIGS,
+            ".stylelintrc.json",
+            ".stylelintrc.js",
+            ".stylelintrc.yml",
+        ),
+    ),
+    "markdown": (
+        ("prettier", "markdownlint"),
+        (*PRETTIER_CONFIGS, ".markdownlint.json", ".markdownlint.yaml"),
+    ),
+    "html": (("prettier",), PRETTIER_CONFIGS),
+    "yaml": (("prettier",), PRETTIER_CONFIGS),
+    "toml": (("prettier",), PRETTIER_CONFIGS),
+    "xml": (("prettier",), PRETTIER_CONFIGS),
+}
+
+# Languages cached per directory: a Go package is formatted and linted as
+# a unit, so a change to one of its files re-runs the whole package
+PACKAGE_LANGUAGES = ("go",)
+
+# Languages only formatted when the action runs with languages: all
+ALL_ONLY_LANGUAGES = ("yaml", "toml", "xml")
+
+# Action language names that enable another language's step
+LANGUAGE_ALIASES = {"typescript": "nodejs"}
+
+# File in the list directory holding the fingerprints used by "filter", so
+# "record" stores entries under the same fingerprints
+FINGERPRINTS_FILE = "format-cache-fingerprints.json"
+
+
+def file_digest(path: str) -> Optional[str]:
+    """Hash a file's contents.
+
+    Args:
+        path: File path
+
+    Returns:
+        Hex digest, or None if the file cannot be read
+    """
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def tool_version(tool: str) -> str:
+    """Identify an installed tool by its ``--version`` output.
+
+    Args:
+        tool: Executable name
+
+    Returns:
+        The version output, or "missing" if the tool is not installed
+    """
+    try:
+        result = subprocess.run(
+            [tool, "--version"],
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return "missing"
+    return (result.stdout + result.stderr).strip()
+
+
+def fingerprint(
+    language: str,
+    root: str = ".",
+    settings: Optional[Dict[str, str]] = None,
+    extra_configs: Iterable[str] = (),
+) -> str:
+    """Fingerprint everything besides file contents that decides cleanliness.
+
+    Args:
+        language: Key of CACHE_LANGUAGES
+        root: Directory config files are looked up in
+        settings: Action settings that change tool behaviour, e.g. the
+            Python line length or whether linting is enabled
+        extra_configs: More files to hash, e.g. the action definition
+
+    Returns:
+        Hex digest of the tool versions, config contents and settings
+    """
+    tools, configs = CACHE_LANGUAGES[language]
+    parts = [f"format-cache {CACHE_FORMAT_VERSION}", f"language {language}"]
+    parts += [f"tool {tool} {tool_version(tool)}" for tool in tools]
+    for config in configs:
+        digest = file_digest(os.path.join(root, config)) or "absent"
+        parts.append(f"config {config} {digest}")
+    for config in extra_configs:
+        parts.append(f"config {config} {file_digest(config) or 'absent'}")
+    for name, value in sorted((settings or {}).items()):
+        parts.append(f"setting {name}={value}")
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+class FormatCache:
+    """Persistent, size-bounded LRU set of known-clean file contents."""
+
+    def __init__(self, path: str, max_entries: int = MAX_ENTRIES):
+        """Initialize the cache, loading any previous state from disk.
+
+        Args:
+            path: JSON file the cache persists to
+            max_entries: Maximum number of remembered entries
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: Dict[str, None] = OrderedDict()
+        self._load()
+
+    def _load(self) -> None:
+        """Load entries from disk, ignoring a missing or corrupt file."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != CACHE_FORMAT_VERSION:
+            return
+        for key in data.get("entries", []):
+            self._entries[key] = None
+        self._evict()
+
+    def save(self) -> None:
+        """Write the cache to disk atomically, least recently used first."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        data = {
+            "version": CACHE_FORMAT_VERSION,
+            "entries": list(self._entries),
+        }
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(temp_path, self.path)
+
+    def key(self, fingerprint_digest: str, content_digest: str) -> str:
+        """Build the cache key for a file content under a fingerprint.
+
+        Args:
+            fingerprint_digest: Result of fingerprint()
+            content_digest: Result of file_digest()
+
+        Returns:
+            Truncated hex digest identifying the pair
+        """
+        raw = f"{fingerprint_digest}\n{content_digest}"
+        return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+    def contains(self, key: str) -> bool:
+        """Check for an entry, refreshing its recency on a hit.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            True if the content is known to be clean
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def add(self, key: str) -> None:
+        """Remember a clean content, evicting the oldest entries if full.
+
+        Args:
+            key: Cache key
+        """
+        self._entries[key] = None
+        self._entries.move_to_end(key)
+        self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries beyond max_entries."""
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        """Number of remembered entries."""
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """Cache statistics for reporting.
+
+        Returns:
+            Dict with entries, hits, misses and evictions
+        """
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def package_digest(paths: Iterable[str], root: str = ".") -> Optional[str]:
+    """Hash the names and contents of a package's files.
+
+    Args:
+        paths: Files of one directory, relative to root
+        root: Directory the paths are relative to
+
+    Returns:
+        Hex digest, or None if a file cannot be read
+    """
+    parts = []
+    for path in sorted(paths):
+        digest = file_digest(os.path.join(root, path))
+        if digest is None:
+            return None
+        parts.append(f"{os.path.basename(path)} {digest}")
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+def cache_units(
+    paths: Iterable[str], root: str = ".", per_package: bool = False
+) -> List[Tuple[Optional[str], List[str]]]:
+    """Split files into the units the cache remembers.
+
+    Args:
+        paths: File paths relative to root
+        root: Directory the paths are relative to
+        per_package: One unit per directory instead of per file
+
+    Returns:
+        (content digest, paths) per unit; the digest is None if a file
+        cannot be read
+    """
+    if not per_package:
+        return [
+            (file_digest(os.path.join(root, path)), [path]) for path in paths
+        ]
+    packages: Dict[str, List[str]] = {}
+    for path in paths:
+        packages.setdefault(os.path.dirname(path), []).append(path)
+    return [(package_digest(files, root), files) for files in packages.values()]
+
+
+def filter_clean(
+    cache: FormatCache,
+    fingerprint_digest: str,
+    paths: Iterable[str],
+    root: str = ".",
+    per_package: bool = False,
+) -> List[str]:
+    """Drop files whose current contents are known to be clean.
+
+    Args:
+        cache: Format cache
+        fingerprint_digest: Fingerprint of the language's toolchain
+        paths: File paths relative to root
+        root: Directory the paths are relative to
+        per_package: Keep or drop whole directories, see cache_units
+
+    Returns:
+        Paths that still need formatting and linting, in input order
+    """
+    paths = list(paths)
+    remaining = set()
+    for digest, files in cache_units(paths, root, per_package):
+        if digest is None or not cache.contains(
+            cache.key(fingerprint_digest, digest)
+        ):
+            remaining.update(files)
+    return [path for path in paths if path in remaining]
+
+
+def record_clean(
+    cache: FormatCache,
+    fingerprint_digest: str,
+    paths: Iterable[str],
+    root: str = ".",
+    per_package: bool = False,
+) -> int:
+    """Remember the current contents of files as clean.
+
+    Call after the formatters ran, so the formatted contents are recorded.
+
+    Args:
+        cache: Format cache
+        fingerprint_digest: Fingerprint of the language's toolchain
+        paths: File paths relative to root
+        root: Directory the paths are relative to
+        per_package: Record whole directories, see cache_units
+
+    Returns:
+        Number of files recorded
+    """
+    recorded = 0
+    for digest, files in cache_units(paths, root, per_package):
+        if digest is not None:
+            cache.add(cache.key(fingerprint_digest, digest))
+            recorded += len(files)
+    return recorded
+
+
+def selected_languages(spec: str) -> List[str]:
+    """Map the action's ``languages`` input to cached languages.
+
+    Args:
+        spec: Comma-separated action language names, or "all"
+
+    Returns:
+        Keys of CACHE_LANGUAGES whose steps run for the input
+    """
+    names = {name.strip() for name in spec.split(",") if name.strip()}
+    if "all" in names:
+        return list(CACHE_LANGUAGES)
+    names = {LANGUAGE_ALIASES.get(name, name) for name in names}
+    return [
+        language
+        for language in CACHE_LANGUAGES
+        if language in names and language not in ALL_ONLY_LANGUAGES
+    ]
+
+
+def read_list(path: str) -> List[str]:
+    """Read a NUL-separated file list.
+
+    Args:
+        path: List file written by file_discovery.py
+
+    Returns:
+        File paths, or an empty list if the file does not exist
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            return [name for name in f.read().split("\0") if name]
+    except OSError:
+        return []
+
+
+def write_list(path: str, paths: List[str]) -> None:
+    """Write a NUL-separated file list.
+
+    Args:
+        path: Destination list file
+        paths: File paths
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("".join(f"{name}\0" for name in paths))
+
+
+def _parse_settings(pairs: Optional[List[str]]) -> Dict[str, str]:
+    """Parse repeated ``--setting name=value`` arguments.
+
+    Args:
+        pairs: Raw arguments
+
+    Returns:
+        Settings by name
+
+    Raises:
+        ValueError: If an argument has no ``=``
+    """
+    settings = {}
+    for pair in pairs or []:
+        name, sep, value = pair.partition("=")
+        if not sep:
+            raise ValueError(f"Expected name=value, got {pair!r}")
+        settings[name] = value
+    return settings
+
+
+def run_filter(args: argparse.Namespace, cache: FormatCache) -> None:
+    """Rewrite each language list without its known-clean files.
+
+    Args:
+        args: Parsed CLI arguments
+        cache: Format cache
+    """
+    settings = _parse_settings(args.settings)
+    fingerprints = {}
+    for language in selected_languages(args.languages):
+        list_path = os.path.join(args.list_dir, f"{language}.list")
+        paths = read_list(list_path)
+        if not paths:
+            continue
+        digest = fingerprint(language, args.root, settings, args.extra_configs)
+        fingerprints[language] = digest
+        per_package = language in PACKAGE_LANGUAGES
+        remaining = filter_clean(cache, digest, paths, args.root, per_package)
+        write_list(list_path, remaining)
+        print(
+            f"🗄️ {language}: {len(paths) - len(remaining)} of {len(paths)} "
+            "files known clean"
+        )
+
+    with open(os.path.join(args.list_dir, FINGERPRINTS_FILE), "w") as f:
+        json.dump(fingerprints, f)
+
+
+def run_record(args: argparse.Namespace, cache: FormatCache) -> None:
+    """Remember the processed files of every language that passed linting.
+
+    Tolerated lint failures leave a ``<bucket>.lint-failed`` marker in the
+    list directory for each discovery bucket the failing files came from,
+    whichever step linted them, so an Angular eslint failure on an ``.html``
+    file is marked under ``html``. The files a marker lists are not
+    recorded so the failures are reported again next run; an empty marker
+    excludes the whole bucket.
+
+    Args:
+        args: Parsed CLI arguments
+        cache: Format cache
+    """
+    try:
+        with open(os.path.join(args.list_dir, FINGERPRINTS_FILE)) as f:
+            fingerprints = json.load(f)
+    except (OSError, ValueError):
+        fingerprints = {}
+
+    for language, digest in fingerprints.items():
+        marker = os.path.join(args.list_dir, f"{language}.lint-failed")
+        failed = set(read_list(marker))
+        if os.path.exists(marker) and not failed:
+            print(f"⚠️  {language}: lint failures, not caching")
+            continue
+        paths = read_list(os.path.join(args.list_dir, f"{language}.list"))
+        per_package = language in PACKAGE_LANGUAGES
+        if failed:
+            print(f"⚠️  {language}: {len(failed)} files with lint failures")
+            if per_package:
+                # A package is only clean if all of its files are
+                failed = {os.path.dirname(path) for path in failed}
+                paths = [p for p in paths if os.path.dirname(p) not in failed]
+            else:
+                paths = [path for path in paths if path not in failed]
+        recorded = record_clean(cache, digest, paths, args.root, per_package)
+        if recorded:
+            print(f"🗄️ {language}: cached {recorded} clean files")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point for the format cache CLI.
+
+    Args:
+        argv: Command line arguments, defaults to sys.argv
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(
+        description="Content-hash formatting cache for Auto Formatter"
+    )
+    parser.add_argument(
+        "command",
+        choices=["filter", "record"],
+        help="filter: drop known-clean files from the lists; "
+        "record: remember the listed files as clean",
+    )
+    parser.add_argument(
+        "--cache-file",
+        default=os.path.join(".cache", "auto-formatter", "format-cache.json"),
+        help="JSON file the cache persists to",
+    )
+    parser.add_argument(
+        "--list-dir",
+        required=True,
+        help="Directory of <language>.list files from file_discovery.py",
+    )
+    parser.add_argument(
+        "--languages",
+        default="all",
+        help="The action's languages input (default: all)",
+    )
+    parser.add_argument("--root", default=".", help="Repository directory")
+    parser.add_argument(
+        "--setting",
+        action="append",
+        dest="settings",
+        help="name=value setting that changes tool behaviour (repeatable)",
+    )
+    parser.add_argument(
+        "--extra-config",
+        action="append",
+        dest="extra_configs",
+        default=[],
+        help="Additional file hashed into every fingerprint (repeatable)",
+    )
+    parser.add_argument(
+        "--max-entries",
+        type=int,
+        default=MAX_ENTRIES,
+        help="Maximum number of cached entries",
+    )
+
+    args = parser.parse_args(argv)
+    cache = FormatCache(args.cache_file, args.max_entries)
+
+    try:
+        if args.command == "filter":
+            run_filter(args, cache)
+        else:
+            run_record(args, cache)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+
+    cache.save()
+    stats = cache.stats()
+    print(
+        f"📊 Format cache: {stats['entries']} entries, {stats['hits']} hits, "
+        f"{stats['misses']} misses, {stats['evictions']} evictions"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
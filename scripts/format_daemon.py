@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+"""# file: scripts/format_daemon.py
+Long-lived formatter daemon for the Auto Formatter GitHub Action
+
+Every run of the action starts Node afresh for each prettier and eslint
+batch, and loading prettier, eslint and their plugins costs far more than
+formatting a handful of files. On self-hosted runners and in pre-commit
+hooks the daemon keeps a small pool of warm Node workers
+(``daemon_worker.js``) with those modules loaded and accepts the same
+command lines over a Unix socket, one JSON object per line:
+
+    {"argv": ["prettier", "--write", "a.js"], "cwd": "/repo"}
+    {"returncode": 0, "output": ""}
+
+``format_runner.py --daemon`` (or ``$AUTO_FORMATTER_DAEMON``) sends the
+prettier and eslint tasks it can to the daemon and runs everything else,
+or anything the daemon declines, as a normal subprocess.
+
+Usage:
+    python scripts/format_daemon.py serve --socket /tmp/af.sock &
+    python scripts/format_daemon.py run -- prettier --write src/app.ts
+    python scripts/format_daemon.py bench src/*.ts --rounds 5
+    python scripts/format_daemon.py stop
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import queue
+import socket
+import socketserver
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from timing_report import run_timed
+
+# Environment variable holding the daemon socket, read by the runner
+DAEMON_ENV = "AUTO_FORMATTER_DAEMON"
+
+# Socket used when neither --socket nor $AUTO_FORMATTER_DAEMON is given
+DEFAULT_SOCKET = os.path.join(
+    tempfile.gettempdir(),
+    f"auto-formatter-{getattr(os, 'getuid', lambda: 0)()}.sock",
+)
+
+# Node worker speaking the request protocol on stdin/stdout
+WORKER_SCRIPT = os.path.join(os.path.dirname(__file__), "daemon_worker.js")
+
+# Commands the workers serve; other command lines never reach the daemon
+DAEMON_TOOLS = frozenset({"prettier", "eslint"})
+
+# Worker answers for command lines it does not emulate and for tools whose
+# package is missing; the client runs the real command instead
+UNSUPPORTED = 125
+NOT_INSTALLED = 127
+
+# Warm workers kept by default; each holds its own prettier/eslint
+DEFAULT_WORKERS = 2
+
+# Seconds a client waits for the daemon to accept a connection
+CONNECT_TIMEOUT = 2.0
+
+
+class DaemonError(Exception):
+    """Raised when the daemon cannot be reached or answers garbage."""
+
+
+class Worker:
+    """One warm Node process serving requests in order."""
+
+    def __init__(self, argv: List[str]):
+        """Start the worker.
+
+        Args:
+            argv: Command starting the worker, e.g. node daemon_worker.js
+        """
+        self.proc = subprocess.Popen(
+            argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+        )
+        self._next_id = 0
+
+    def request(self, argv: List[str], cwd: str) -> Dict[str, Any]:
+        """Send one command line and wait for its result.
+
+        Args:
+            argv: Tool command line
+            cwd: Directory the command runs in
+
+        Returns:
+            The worker's response with returncode and output
+
+        Raises:
+            DaemonError: If the worker died
+        """
+        self._next_id += 1
+        line = json.dumps({"id": self._next_id, "argv": argv, "cwd": cwd})
+        try:
+            self.proc.stdin.write(line + "\n")
+            self.proc.stdin.flush()
+            response = self.proc.stdout.readline()
+        except (OSError, ValueError) as e:
+            raise DaemonError(f"worker {self.proc.pid} failed: {e}") from e
+        if not response:
+            raise DaemonError(f"worker {self.proc.pid} exited")
+        return json.loads(response)
+
+    def close(self) -> None:
+        """Stop the worker."""
+        with contextlib.suppress(OSError):
+            self.proc.stdin.close()
+        try:
+            self.proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+
+
+class WorkerPool:
+    """Hands each request to an idle worker, restarting dead ones."""
+
+    def __init__(self, size: int, argv: Optional[List[str]] = None):
+        """Start the workers.
+
+        Args:
+            size: Number of workers
+            argv: Worker command, defaults to node daemon_worker.js
+        """
+        self.argv = argv or ["node", WORKER_SCRIPT]
+        self.size = max(1, size)
+        self._idle: queue.Queue[Worker] = queue.Queue()
+        for _ in range(self.size):
+            self._idle.put(Worker(self.argv))
+        self.requests = 0
+
+    def run(self, argv: List[str], cwd: str) -> Dict[str, Any]:
+        """Run a command line on the next idle worker.
+
+        Args:
+            argv: Tool command line
+            cwd: Directory the command runs in
+
+        Returns:
+            Response with returncode and output
+        """
+        worker = self._idle.get()
+        try:
+            response = worker.request(argv, cwd)
+        except DaemonError as e:
+            worker.close()
+            worker = Worker(self.argv)
+            response = {"returncode": UNSUPPORTED, "output": str(e)}
+        finally:
+            self._idle.put(worker)
+        self.requests += 1
+        return response
+
+    def close(self) -> None:
+        """Stop every worker."""
+        for _ in range(self.size):
+            self._idle.get().close()
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server passing requests to the worker pool."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, pool: WorkerPool):
+        """Bind the socket.
+
+        Args:
+            socket_path: Path of the Unix socket; a stale one is replaced
+            pool: Workers serving the requests
+        """
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(socket_path)
+        self.socket_path = socket_path
+        self.pool = pool
+        self.started = time.time()
+        super().__init__(socket_path, _RequestHandler)
+
+    def server_close(self) -> None:
+        """Close the socket and stop the workers."""
+        super().server_close()
+        self.pool.close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.socket_path)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Serves the JSON lines of one client connection."""
+
+    server: DaemonServer
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                self._send({"returncode": 2, "output": f"bad request: {e}"})
+                continue
+            command = request.get("command", "run")
+            if command == "ping":
+                self._send(
+                    {
+                        "pid": os.getpid(),
+                        "workers": self.server.pool.size,
+                        "requests": self.server.pool.requests,
+                        "uptime": round(time.time() - self.server.started, 1),
+                    }
+                )
+            elif command == "shutdown":
+                self._send({"stopping": True})
+                threading.Thread(target=self.server.shutdown).start()
+                return
+            else:
+                argv = request.get("argv") or []
+                cwd = request.get("cwd") or os.getcwd()
+                self._send(self.server.pool.run(argv, cwd))
+
+    def _send(self, response: Dict[str, Any]) -> None:
+        self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+        self.wfile.flush()
+
+
+class DaemonClient:
+    """Sends requests to a running daemon."""
+
+    def __init__(self, socket_path: str):
+        """Initialize the client.
+
+        Args:
+            socket_path: Path of the daemon's Unix socket
+        """
+        self.socket_path = socket_path
+
+    def _call(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Send one request on a new connection and read the answer."""
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(CONNECT_TIMEOUT)
+                sock.connect(self.socket_path)
+                # Formatting may take as long as it takes once accepted
+                sock.settimeout(None)
+                sock.sendall((json.dumps(request) + "\n").encode("utf-8"))
+                with sock.makefile("rb") as stream:
+                    line = stream.readline()
+        except OSError as e:
+            raise DaemonError(f"daemon at {self.socket_path}: {e}") from e
+        if not line:
+            raise DaemonError(f"daemon at {self.socket_path} closed")
+        return json.loads(line)
+
+    def ping(self) -> Dict[str, Any]:
+        """Daemon status: pid, workers, requests served and uptime."""
+        return self._call({"command": "ping"})
+
+    def shutdown(self) -> None:
+        """Ask the daemon to exit."""
+        self._call({"command": "shutdown"})
+
+    def run(self, argv: List[str], cwd: str = ".") -> Tuple[int, str]:
+        """Run a command line in a warm worker.
+
+        Args:
+            argv: Tool command line, e.g. ["prettier", "--write", "a.js"]
+            cwd: Directory the command runs in
+
+        Returns:
+            (returncode, output); UNSUPPORTED or NOT_INSTALLED mean the
+            command should be run normally
+
+        Raises:
+            DaemonError: If the daemon cannot be reached
+        """
+        response = self._call({"argv": argv, "cwd": os.path.abspath(cwd)})
+        return response["returncode"], response.get("output", "")
+
+
+def try_daemon(
+    client: Optional[DaemonClient], argv: List[str], cwd: str = "."
+) -> Optional[Tuple[int, str]]:
+    """Run a command line in the daemon if it can serve it.
+
+    Args:
+        client: Daemon client, None when no daemon is configured
+        argv: Tool command line
+        cwd: Directory the command runs in
+
+    Returns:
+        (returncode, output), or None if the command must be run as a
+        subprocess: no daemon, a tool it does not serve, an unreachable
+        daemon, or an answer of UNSUPPORTED or NOT_INSTALLED
+    """
+    if client is None or not argv or argv[0] not in DAEMON_TOOLS:
+        return None
+    try:
+        code, output = client.run(argv, cwd)
+    except DaemonError:
+        return None
+    if code in (UNSUPPORTED, NOT_INSTALLED):
+        return None
+    return code, output
+
+
+def benchmark(
+    files: List[str],
+    client: DaemonClient,
+    rounds: int = 5,
+    tool: str = "prettier",
+    cwd: str = ".",
+) -> Dict[str, Any]:
+    """Time cold CLI runs against warm daemon requests.
+
+    Uses the read-only check mode (``prettier --check``, ``eslint``
+    without ``--fix``), so the files are not modified.
+
+    Args:
+        files: Files to check
+        client: Client of a running daemon
+        rounds: Timed runs of each variant
+        tool: prettier or eslint
+        cwd: Directory the commands run in
+
+    Returns:
+        Median and per-round seconds of both variants and the speedup
+
+    Raises:
+        DaemonError: If the daemon is unreachable or cannot serve the tool
+    """
+    argv = [tool, "--check", *files] if tool == "prettier" else [tool, *files]
+    code, output = client.run(argv, cwd)
+    if code in (UNSUPPORTED, NOT_INSTALLED):
+        raise DaemonError(f"daemon cannot serve {tool}: {output}")
+
+    results: Dict[str, Any] = {"tool": tool, "files": len(files)}
+    for name in ("cold", "warm"):
+        samples = []
+        for _ in range(rounds):
+            start = time.monotonic()
+            if name == "cold":
+                run_timed(argv, cwd=cwd)
+            else:
+                client.run(argv, cwd)
+            samples.append(time.monotonic() - start)
+        results[name] = {
+            "median": statistics.median(samples),
+            "seconds": [round(s, 4) for s in samples],
+        }
+    warm = results["warm"]["median"]
+    results["speedup"] = results["cold"]["median"] / warm if warm else None
+    return results
+
+
+def _serve(args: argparse.Namespace) -> int:
+    """Run the daemon in the foreground until stopped."""
+    pool = WorkerPool(args.workers)
+    server = DaemonServer(args.socket, pool)
+    print(
+        f"🚀 Serving {', '.join(sorted(DAEMON_TOOLS))} on {args.socket} "
+        f"with {pool.size} workers",
+        flush=True,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    print("🛑 Daemon stopped")
+    return 0
+
+
+def _status(args: argparse.Namespace, client: DaemonClient) -> int:
+    """Print the daemon's status."""
+    status = client.ping()
+    print(
+        f"✅ Daemon {status['pid']} on {args.socket}: "
+        f"{status['workers']} workers, {status['requests']} requests, "
+        f"up {status['uptime']}s"
+    )
+    return 0
+
+
+def _stop(args: argparse.Namespace, client: DaemonClient) -> int:
+    """Stop the daemon."""
+    client.shutdown()
+    print(f"🛑 Stopped daemon on {args.socket}")
+    return 0
+
+
+def _bench(args: argparse.Namespace, client: DaemonClient) -> int:
+    """Print the cold versus warm benchmark."""
+    results = benchmark(args.files, client, args.rounds, args.tool)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    print(f"📊 {args.tool} on {results['files']} files")
+    for name in ("cold", "warm"):
+        print(f"  {name}: {results[name]['median'] * 1000:.1f} ms")
+    print(f"  speedup: {results['speedup']:.1f}x")
+    return 0
+
+
+def _run(args: argparse.Namespace, client: DaemonClient) -> int:
+    """Run a command through the daemon, or directly if it cannot."""
+    command = args.argv
+    if command and command[0] == "--":
+        command = command[1:]
+    if not command:
+        print("❌ No command given", file=sys.stderr)
+        return 2
+    served = try_daemon(client, command)
+    if served is None:
+        try:
+            return run_timed(command, capture=False)[0]
+        except OSError as e:
+            print(f"❌ {command[0]}: {e}", file=sys.stderr)
+            return 127
+    code, output = served
+    if output:
+        print(output)
+    return code
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point for the formatter daemon CLI.
+
+    Args:
+        argv: Command line arguments, defaults to sys.argv
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(
+        description="Long-lived formatter daemon for Auto Formatter"
+    )
+    parser.add_argument(
+        "--socket",
+        default=os.getenv(DAEMON_ENV) or DEFAULT_SOCKET,
+        help=f"Unix socket path (default: ${DAEMON_ENV} or {DEFAULT_SOCKET})",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve = subparsers.add_parser("serve", help="Run the daemon")
+    serve.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Warm Node workers (default: {DEFAULT_WORKERS})",
+    )
+    subparsers.add_parser("status", help="Show whether the daemon is up")
+    subparsers.add_parser("stop", help="Stop the daemon")
+    run = subparsers.add_parser(
+        "run", help="Run a command through the daemon, or directly"
+    )
+    run.add_argument("argv", nargs=argparse.REMAINDER)
+    bench = subparsers.add_parser(
+        "bench", help="Compare cold CLI runs with warm daemon requests"
+    )
+    bench.add_argument("files", nargs="+", help="Files to check")
+    bench.add_argument(
+        "--tool", choices=sorted(DAEMON_TOOLS), default="prettier"
+    )
+    bench.add_argument("--rounds", type=int, default=5, help="Runs per variant")
+    bench.add_argument("--json", action="store_true", help="Print JSON")
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        return _serve(args)
+
+    client = DaemonClient(args.socket)
+    commands = {
+        "status": _status,
+        "stop": _stop,
+        "bench": _bench,
+        "run": _run,
+    }
+    try:
+        return commands[args.command](args, client)
+    except DaemonError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
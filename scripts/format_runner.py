@@ -0,0 +1,1518 @@
+#!/usr/bin/env python3
+"""# file: scripts/format_runner.py
+Parallel formatter and linter runner for the Auto Formatter GitHub Action
+
+Builds a job graph of (language, tool, file batch) tasks and runs it on a
+worker pool, so independent languages format concurrently instead of one
+shell step after another. Tasks are only ordered when they touch the same
+files and at least one of them writes: ``ruff`` -> ``pylint`` stay in
+sequence for each batch of ``.py`` files, while Go, C++ and Markdown run
+alongside them. Linters that only read run
+in parallel with each other once the formatters are done. Prettier runs
+once for every language it formats (see ``prettier_run.py``). Per-file
+linters replay stored results for contents they already linted (see
+``lint_store.py``).
+
+File lists come from ``file_discovery.py`` (``--list-dir``) or an
+in-process discovery walk.
+
+Usage:
+    python scripts/format_runner.py --list-dir "$RUNNER_TEMP/files"
+    python scripts/format_runner.py --languages python,go --plan
+"""
+
+import argparse
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from change_set import rewritten_files, stat_snapshot
+from file_discovery import (
+    LANGUAGE_SUFFIXES,
+    GitError,
+    classify,
+    discover_files,
+)
+from format_cache import file_digest, write_list
+from format_daemon import DAEMON_ENV, DaemonClient, try_daemon
+from go_pipeline import GoPipeline, group_packages
+from lint_store import (
+    LintResult,
+    LintStore,
+    base_digests,
+    lint_fingerprint,
+    new_findings,
+    restore_path,
+    strip_path,
+)
+from prettier_run import extension_stats, prettier_argv, render_stats
+from python_pipeline import PythonPipeline
+from timing_report import TIMING_ENV, TimingReport, file_bytes, run_timed
+
+# Lint configurations shipped with the action, passed to tools by flag so
+# nothing is written into (or removed from) the repository being formatted
+CONFIGS_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "configs"
+)
+
+# Files per formatter invocation; small enough to spread a language over
+# several workers, large enough to amortize tool start-up
+DEFAULT_BATCH_SIZE = 500
+
+# Bytes kept free below ARG_MAX for late environment changes, like xargs
+ARGV_HEADROOM = 4096
+
+# Command line limit where sysconf has no ARG_MAX (Windows CreateProcess)
+FALLBACK_ARG_MAX = 32767
+
+# Bytes each argument costs besides its text: the NUL and the argv pointer
+ARG_OVERHEAD = 1 + 8
+
+# Text tools print in front of a file path in diagnostics: prettier log
+# levels, ruff's full format and shellcheck's tty format
+DIAGNOSTIC_PREFIXES = ("[error] ", "[warn] ", "--> ", "In ")
+
+# Runner languages in the order the action used to run them, with the
+# discovery buckets whose files decide whether the language runs
+RUNNER_LANGUAGES = {
+    "python": ("python",),
+    "go": ("go",),
+    "nodejs": ("nodejs",),
+    "angular": ("angular",),
+    "cpp": ("cpp",),
+    "csharp": ("csharp",),
+    "json": ("json",),
+    "shell": ("shell",),
+    "swift": ("swift",),
+    "r": ("r",),
+    "css": ("css",),
+    "markdown": ("markdown",),
+    "html": ("html",),
+    "yaml": ("yaml",),
+    "toml": ("toml",),
+    "xml": ("xml",),
+}
+
+# Task language of tools shared by several languages, e.g. prettier
+SHARED_LANGUAGE = "shared"
+
+# Languages only formatted when the action runs with languages: all
+ALL_ONLY_LANGUAGES = ("yaml", "toml", "xml")
+
+# Action language names that enable another runner language
+LANGUAGE_ALIASES = {"typescript": "nodejs"}
+
+# Project config files that enable the optional linters
+ESLINT_CONFIGS = (
+    ".eslintrc.js",
+    ".eslintrc.json",
+    ".eslintrc.yaml",
+    ".eslintrc.yml",
+    "eslint.config.js",
+)
+STYLELINT_CONFIGS = (
+    ".stylelintrc.js",
+    ".stylelintrc.json",
+    ".stylelintrc.yaml",
+    ".stylelintrc.yml",
+    "stylelint.config.js",
+)
+MARKDOWNLINT_CONFIGS = (
+    ".markdownlint.json",
+    ".markdownlint.yaml",
+    ".markdownlint.yml",
+)
+
+# Repository configs a fixing linter reads, hashed into its lint store
+# fingerprint
+FIXER_CONFIGS = {
+    "eslint": ESLINT_CONFIGS,
+    "stylelint": STYLELINT_CONFIGS,
+    "markdownlint": MARKDOWNLINT_CONFIGS,
+}
+
+
+class Tool:
+    """One formatter or linter step of a language."""
+
+    def __init__(
+        self,
+        name: str,
+        argv: List[str],
+        buckets: Iterable[str],
+        writes: bool = True,
+        tolerate_failure: bool = False,
+        pass_files: bool = True,
+        max_batch: Optional[int] = None,
+        executable: Optional[str] = None,
+        extra_files: Iterable[str] = (),
+        function: Optional[Callable[[List[str], str], Tuple[int, str]]] = None,
+        requires: Iterable[str] = (),
+        whole_packages: bool = False,
+        shared: bool = False,
+        fixes: bool = False,
+    ):
+        """Initialize the tool.
+
+        Args:
+            name: Display name
+            argv: Command; file paths are appended when pass_files is set
+            buckets: Discovery buckets whose files the tool processes
+            writes: Whether the tool modifies files
+            tolerate_failure: Report a failure without failing the run
+            pass_files: Append file paths to argv; otherwise the tool runs
+                once over the whole tree and the files only order it
+            max_batch: Cap on files per invocation, e.g. 1 for tools that
+                take a single file
+            executable: Skip the tool with a notice if this is not on PATH
+            extra_files: Files besides the buckets the tool touches
+            function: Run in-process instead of argv; called with the
+                batch and the root, returns (returncode, output)
+            requires: Further commands the tool runs, installed with it
+            whole_packages: Never split a directory across batches, e.g.
+                Go packages
+            shared: Run once over the files of every language using a
+                tool of the same name, ahead of their other tools
+            fixes: A linter that fixes what it can (``--fix``) and reports
+                the rest; the lint store keeps its findings by the contents
+                it leaves behind
+        """
+        self.name = name
+        self.argv = argv
+        self.buckets = tuple(buckets)
+        self.writes = writes
+        self.tolerate_failure = tolerate_failure
+        self.pass_files = pass_files
+        self.max_batch = max_batch
+        self.executable = executable
+        self.extra_files = tuple(extra_files)
+        self.function = function
+        self.requires = tuple(requires)
+        self.whole_packages = whole_packages
+        self.shared = shared
+        self.fixes = fixes
+
+
+class Task:
+    """A tool invocation over one batch of files."""
+
+    def __init__(
+        self,
+        task_id: int,
+        language: str,
+        tool: Tool,
+        files: List[str],
+        batch: int = 1,
+        batches: int = 1,
+    ):
+        """Initialize the task.
+
+        Args:
+            task_id: Position in the graph
+            language: Runner language
+            tool: Tool to run
+            files: Files the task touches
+            batch: 1-based batch number
+            batches: Number of batches of this tool
+        """
+        self.id = task_id
+        self.language = language
+        self.tool = tool
+        self.files = files
+        self.batch = batch
+        self.batches = batches
+        self.deps: Set[int] = set()
+        self.status = "pending"
+        self.returncode: Optional[int] = None
+        self.output = ""
+        self.duration = 0.0
+        self.file_errors: Dict[str, List[str]] = {}
+        self.max_rss: Optional[int] = None
+        self.replayed = 0
+        self.new_findings: Dict[str, List[str]] = {}
+
+    @property
+    def argv(self) -> List[str]:
+        """Command line of the task."""
+        if self.tool.pass_files:
+            return [*self.tool.argv, *self.files]
+        return list(self.tool.argv)
+
+    @property
+    def label(self) -> str:
+        """Human readable task name."""
+        suffix = f" [{self.batch}/{self.batches}]" if self.batches > 1 else ""
+        return f"{self.language}: {self.tool.name}{suffix}"
+
+
+class RunnerOptions:
+    """Action settings that shape the tool commands."""
+
+    def __init__(
+        self,
+        root: str = ".",
+        enable_linting: bool = True,
+        fail_on_lint_errors: bool = False,
+        python_line_length: int = 88,
+        configs_dir: str = CONFIGS_DIR,
+        platform: str = sys.platform,
+        prettier_cache: Optional[str] = None,
+        whole_tree: bool = True,
+    ):
+        """Initialize the options.
+
+        Args:
+            root: Repository directory the tools run in
+            enable_linting: Run linters in addition to formatters
+            fail_on_lint_errors: Fail the run when a linter fails
+            python_line_length: Line length for the Python tools
+            configs_dir: Directory of the action's lint configs
+            platform: sys.platform value; Swift only runs on macOS
+            prettier_cache: Prettier cache file, None to run without
+            whole_tree: Run tools that process the whole tree rather than
+                the listed files; only shard 0 of a sharded run does, as
+                every shard would otherwise make the same changes
+        """
+        self.root = root
+        self.enable_linting = enable_linting
+        self.fail_on_lint_errors = fail_on_lint_errors
+        self.python_line_length = python_line_length
+        self.configs_dir = configs_dir
+        self.platform = platform
+        self.prettier_cache = prettier_cache
+        self.whole_tree = whole_tree
+
+    def config(self, name: str) -> str:
+        """Path of a shipped lint config."""
+        return os.path.join(self.configs_dir, name)
+
+    def has_any(self, names: Iterable[str]) -> bool:
+        """Whether any of the files exists in the repository root."""
+        return any(os.path.isfile(os.path.join(self.root, n)) for n in names)
+
+    def prettier(self, buckets: Iterable[str]) -> Tool:
+        """The shared prettier tool over some discovery buckets."""
+        return Tool(
+            "prettier",
+            prettier_argv(self.prettier_cache),
+            buckets,
+            shared=True,
+        )
+
+
+def enabled_languages(spec: str) -> List[str]:
+    """Map the action's ``languages`` input to runner languages.
+
+    Args:
+        spec: Comma-separated action language names, or "all"
+
+    Returns:
+        Runner languages in run order
+    """
+    names = {name.strip() for name in spec.split(",") if name.strip()}
+    if "all" in names:
+        return list(RUNNER_LANGUAGES)
+    names = {LANGUAGE_ALIASES.get(name, name) for name in names}
+    return [
+        language
+        for language in RUNNER_LANGUAGES
+        if language in names and language not in ALL_ONLY_LANGUAGES
+    ]
+
+
+def argv_limit() -> int:
+    """Bytes available for a tool's arguments.
+
+    Returns:
+        ARG_MAX minus the environment passed to children and headroom
+    """
+    try:
+        limit = os.sysconf("SC_ARG_MAX")
+    except (AttributeError, OSError, ValueError):
+        limit = -1
+    if limit <= 0:
+        limit = FALLBACK_ARG_MAX
+    environment = sum(
+        len(key) + len(value) + 1 + ARG_OVERHEAD
+        for key, value in os.environ.items()
+    )
+    return max(limit - environment - ARGV_HEADROOM, ARGV_HEADROOM)
+
+
+def pack_batches(
+    argv: List[str],
+    files: List[str],
+    max_files: int,
+    max_bytes: Optional[int] = None,
+) -> List[List[str]]:
+    """Pack files into batches that fit one command line each.
+
+    Args:
+        argv: Command the files are appended to
+        files: Files to pack, kept in order
+        max_files: Maximum files per batch
+        max_bytes: Maximum bytes of the whole command line, None for no
+            limit (in-process tools)
+
+    Returns:
+        Non-empty batches; a file longer than the limit gets its own
+    """
+    used = sum(len(os.fsencode(arg)) + ARG_OVERHEAD for arg in argv)
+    batches: List[List[str]] = []
+    batch: List[str] = []
+    size = used
+    for path in files:
+        cost = len(os.fsencode(path)) + ARG_OVERHEAD
+        full = len(batch) >= max_files
+        if batch and (full or (max_bytes and size + cost > max_bytes)):
+            batches.append(batch)
+            batch, size = [], used
+        batch.append(path)
+        size += cost
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def pack_packages(
+    argv: List[str],
+    files: List[str],
+    max_files: int,
+    max_bytes: Optional[int] = None,
+) -> List[List[str]]:
+    """Pack files into batches that keep each directory together.
+
+    Args:
+        argv: Command the files are appended to
+        files: Files to pack
+        max_files: Maximum files per batch
+        max_bytes: Maximum bytes of the whole command line, None for no
+            limit (in-process tools)
+
+    Returns:
+        Non-empty batches; a directory too large for one batch is split
+        by pack_batches
+    """
+    used = sum(len(os.fsencode(arg)) + ARG_OVERHEAD for arg in argv)
+    batches: List[List[str]] = []
+    batch: List[str] = []
+    size = used
+    for package in group_packages(files).values():
+        cost = sum(len(os.fsencode(path)) + ARG_OVERHEAD for path in package)
+        full = len(batch) + len(package) > max_files
+        if not full and not (max_bytes and size + cost > max_bytes):
+            batch += package
+            size += cost
+            continue
+        if batch:
+            batches.append(batch)
+        chunks = pack_batches(argv, package, max_files, max_bytes)
+        batches += chunks[:-1]
+        batch = chunks[-1]
+        size = used + sum(
+            len(os.fsencode(path)) + ARG_OVERHEAD for path in batch
+        )
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def attribute_output(
+    files: Iterable[str], output: str, root: str = "."
+) -> Dict[str, List[str]]:
+    """Assign diagnostic lines of a batch's output to the files they name.
+
+    Tools report problems as ``path:line...`` (run with unix/gcc/concise
+    output formats where they have one); relative, ``./`` and absolute
+    spellings of the same path are matched.
+
+    Args:
+        files: Files of the batch
+        output: Combined stdout and stderr of the tool
+        root: Directory the tool ran in
+
+    Returns:
+        Diagnostic lines per file, only for files that have some
+    """
+    wanted = set(files)
+    base = os.path.abspath(root)
+    errors: Dict[str, List[str]] = {}
+    for line in output.splitlines():
+        text = line.strip()
+        for prefix in DIAGNOSTIC_PREFIXES:
+            if text.startswith(prefix):
+                text = text[len(prefix) :]
+                break
+        candidate = text.split(":", 1)[0].split(" line ", 1)[0].strip()
+        if not candidate:
+            continue
+        if os.path.isabs(candidate):
+            candidate = os.path.relpath(candidate, base)
+        candidate = os.path.normpath(candidate)
+        if candidate in wanted:
+            errors.setdefault(candidate, []).append(line.strip())
+    return errors
+
+
+def validate_json(files: List[str], root: str = ".") -> Tuple[int, str]:
+    """Check JSON syntax in-process instead of one jsonlint per file.
+
+    Args:
+        files: JSON files relative to root
+        root: Repository directory
+
+    Returns:
+        (1 if any file is invalid else 0, ``path:line:col: message`` lines)
+    """
+    problems = []
+    for path in files:
+        try:
+            with open(os.path.join(root, path), encoding="utf-8-sig") as f:
+                json.load(f)
+        except json.JSONDecodeError as e:
+            problems.append(f"{path}:{e.lineno}:{e.colno}: {e.msg}")
+        except (OSError, UnicodeDecodeError) as e:
+            problems.append(f"{path}: {e}")
+    return (1 if problems else 0), "\n".join(problems)
+
+
+def _python_tools(options: RunnerOptions) -> List[Tool]:
+    """Tools for Python files: the fused ruff pass, then pylint."""
+    pipeline = PythonPipeline(
+        options.python_line_length, options.config("pylintrc")
+    )
+    tools = [
+        Tool(
+            "ruff",
+            pipeline.check_argv,
+            ["python"],
+            tolerate_failure=(
+                options.enable_linting and not options.fail_on_lint_errors
+            ),
+            executable="ruff",
+            function=pipeline.run_ruff,
+        )
+    ]
+    if options.enable_linting:
+        tools.append(
+            Tool(
+                "pylint",
+                pipeline.pylint_argv,
+                ["python"],
+                writes=False,
+                tolerate_failure=True,
+                executable="pylint",
+                function=pipeline.run_pylint,
+            )
+        )
+    return tools
+
+
+def _go_tools(options: RunnerOptions) -> List[Tool]:
+    """Tools for Go files."""
+    pipeline = GoPipeline()
+    tools = [
+        Tool(
+            "goimports+golines",
+            pipeline.lines_argv,
+            ["go"],
+            executable="golines",
+            function=pipeline.run_format,
+            requires=pipeline.requires,
+            whole_packages=True,
+        )
+    ]
+    if options.has_any(["go.mod"]):
+        tools.append(
+            Tool(
+                "go mod tidy",
+                ["go", "mod", "tidy"],
+                ["go"],
+                pass_files=False,
+                extra_files=["go.mod", "go.sum"],
+            )
+        )
+    if options.enable_linting:
+        tools.append(
+            Tool(
+                "golangci-lint",
+                [
+                    "golangci-lint",
+                    "run",
+                    "--config",
+                    options.config("golangci.yml"),
+                ],
+                ["go"],
+                writes=False,
+                tolerate_failure=not options.fail_on_lint_errors,
+                pass_files=False,
+            )
+        )
+    return tools
+
+
+def _nodejs_tools(options: RunnerOptions) -> List[Tool]:
+    """Tools for JavaScript/TypeScript files."""
+    tools = [options.prettier(["nodejs", "json"])]
+    if options.enable_linting:
+        tools.append(
+            Tool(
+                "eslint",
+                [
+                    "eslint",
+                    "--no-eslintrc",
+                    "--config",
+                    options.config("eslintrc.json"),
+                    "--format",
+                    "unix",
+                    "--fix",
+                ],
+                ["nodejs"],
+                tolerate_failure=not options.fail_on_lint_errors,
+                fixes=True,
+            )
+        )
+    elif options.has_any(ESLINT_CONFIGS):
+        tools.append(
+            Tool(
+                "eslint",
+                ["eslint", "--format", "unix", "--fix"],
+                ["nodejs"],
+                tolerate_failure=True,
+                fixes=True,
+            )
+        )
+    return tools
+
+
+def _angular_tools(options: RunnerOptions) -> List[Tool]:
+    """Tools for Angular projects."""
+    tools = [options.prettier(["typescript", "html", "css"])]
+    if options.enable_linting:
+        tools.append(
+            Tool(
+                "eslint (angular)",
+                [
+                    "eslint",
+                    "--no-eslintrc",
+                    "--config",
+                    options.config("eslintrc.angular.json"),
+                    "--format",
+                    "unix",
+                    "--fix",
+                ],
+                ["typescript", "html"],
+                tolerate_failure=not options.fail_on_lint_errors,
+                fixes=True,
+            )
+        )
+    return tools
+
+
+def _cpp_tools(options: RunnerOptions) -> List[Tool]:
+    """Tools for C++ files."""
+    tools = [
+        Tool(
+            "clang-format",
+            ["clang-format", "-i"],
+            ["cpp"],
+            executable="clang-format",
+        )
+    ]
+    if options.enable_linting:
+        tools.append(
+            Tool(
+                "cpplint",
+                ["cpplint", "--filter=-whitespace/tab"],
+                ["cpp"],
+                writes=False,
+                tolerate_failure=not options.fail_on_lint_errors,
+            )
+        )
+    return tools
+
+
+def _csharp_tools(options: RunnerOptions) -> List[Tool]:
+    """Tools for C# projects; dotnet format needs a solution or project."""
+    argv = ["dotnet", "format"]
+    if options.fail_on_lint_errors:
+        argv.append("--verify-no-changes")
+    return [
+        Tool(
+            "dotnet format",
+            argv,
+            ["csharp"],
+            tolerate_failure=not options.fail_on_lint_errors,
+            pass_files=False,
+            executable="dotnet",
+        )
+    ]
+
+
+def _json_tools(options: RunnerOptions) -> List[Tool]:
+    """Tools for JSON files."""
+    tools = [options.prettier(["json"])]
+    if options.enable_linting:
+        tools.append(
+            Tool(
+                "json syntax",
+                [],
+                ["json"],
+                writes=False,
+                tolerate_failure=not options.fail_on_lint_errors,
+                function=validate_json,
+            )
+        )
+    return tools
+
+
+def _shell_tools(options: RunnerOptions) -> List[Tool]:
+    """Tools for shell scripts."""
+    tools = [
+        Tool(
+            "shfmt",
+            ["shfmt", "-w", "-i", "2", "-ci", "-bn"],
+            ["shell"],
+            executable="shfmt",
+        )
+    ]
+    if options.enable_linting:
+        tools.append(
+            Tool(
+                "shellcheck",
+                ["shellcheck", "--format=gcc"],
+                ["shell"],
+                writes=False,
+                tolerate_failure=not options.fail_on_lint_errors,
+                executable="shellcheck",
+            )
+        )
+    return tools
+
+
+def _swift_tools(options: RunnerOptions) -> List[Tool]:
+    """Tools for Swift files (macOS runners only)."""
+    if options.platform != "darwin" or not options.enable_linting:
+        return []
+    config = ["--config", options.config("swiftlint.yml")]
+    lint = ["swiftlint", "lint", *config]
+    if options.fail_on_lint_errors:
+        lint.append("--strict")
+    return [
+        Tool(
+            "swiftlint",
+            lint,
+            ["swift"],
+            writes=False,
+            tolerate_failure=not options.fail_on_lint_errors,
+            pass_files=False,
+            executable="swiftlint",
+        ),
+        Tool(
+            "swiftlint autocorrect",
+            ["swiftlint", "autocorrect", *config],
+            ["swift"],
+            tolerate_failure=True,
+            pass_files=False,
+            executable="swiftlint",
+        ),
+    ]
+
+
+def _r_tools(options: RunnerOptions) -> List[Tool]:
+    """Tools for R files."""
+    tools = [
+        Tool(
+            "styler",
+            [
+                "Rscript",
+                "-e",
+                "styler::style_dir('.', filetype = c('R', 'Rmd'))",
+            ],
+            ["r"],
+            tolerate_failure=True,
+            pass_files=False,
+            executable="Rscript",
+        )
+    ]
+    if options.enable_linting:
+        lintr_file = options.config("lintr").replace("'", "\\'")
+        tools.append(
+            Tool(
+                "lintr",
+                [
+                    "Rscript",
+                    "-e",
+                    (
+                        f"options(lintr.linter_file = '{lintr_file}'); "
+                        "lintr::lint_dir('.')"
+                    ),
+                ],
+                ["r"],
+                writes=False,
+                tolerate_failure=not options.fail_on_lint_errors,
+                pass_files=False,
+                executable="Rscript",
+            )
+        )
+    return tools
+
+
+def _prettier_tools(
+    options: RunnerOptions, bucket: str, linter: Optional[Tool] = None
+) -> List[Tool]:
+    """Prettier over one bucket, optionally followed by a fixing linter."""
+    tools = [options.prettier([bucket])]
+    if linter is not None:
+        tools.append(linter)
+    return tools
+
+
+def language_tools(language: str, options: RunnerOptions) -> List[Tool]:
+    """Build the ordered tool chain for a runner language.
+
+    Args:
+        language: Key of RUNNER_LANGUAGES
+        options: Runner options
+
+    Returns:
+        Tools in the order they must run over the same files
+    """
+    if language == "css":
+        linter = None
+        if options.has_any(STYLELINT_CONFIGS):
+            linter = Tool(
+                "stylelint",
+                ["stylelint", "--formatter", "unix", "--fix"],
+                ["css"],
+                tolerate_failure=True,
+                fixes=True,
+            )
+        return _prettier_tools(options, "css", linter)
+    if language == "markdown":
+        linter = None
+        if options.has_any(MARKDOWNLINT_CONFIGS):
+            linter = Tool(
+                "markdownlint",
+                ["markdownlint", "--fix"],
+                ["markdown"],
+                tolerate_failure=True,
+                fixes=True,
+            )
+        return _prettier_tools(options, "markdown", linter)
+    if language in ("html", "yaml", "toml", "xml"):
+        return _prettier_tools(options, language)
+
+    builders = {
+        "python": _python_tools,
+        "go": _go_tools,
+        "nodejs": _nodejs_tools,
+        "angular": _angular_tools,
+        "cpp": _cpp_tools,
+        "csharp": _csharp_tools,
+        "json": _json_tools,
+        "shell": _shell_tools,
+        "swift": _swift_tools,
+        "r": _r_tools,
+    }
+    return builders[language](options)
+
+
+def _language_present(
+    language: str, buckets: Dict[str, List[str]], options: RunnerOptions
+) -> bool:
+    """Whether a language has files (or project markers) to format."""
+    if any(buckets.get(b) for b in RUNNER_LANGUAGES[language]):
+        if language == "csharp":
+            # dotnet format needs a solution or project file
+            return bool(buckets.get("dotnet"))
+        return True
+    return language == "angular" and options.has_any(["angular.json"])
+
+
+def _shard_tools(language: str, options: RunnerOptions) -> List[Tool]:
+    """A language's tools, without whole-tree tools unless enabled."""
+    tools = language_tools(language, options)
+    return [t for t in tools if t.pass_files or options.whole_tree]
+
+
+def build_tasks(
+    languages: Iterable[str],
+    buckets: Dict[str, List[str]],
+    options: RunnerOptions,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_bytes: Optional[int] = None,
+) -> List[Task]:
+    """Build the job graph for the given languages.
+
+    Every tool is split into batches of at most batch_size files whose
+    command line fits ARG_MAX; whole-tree tools get a single task, or none
+    when options.whole_tree is off. Shared tools (prettier) run once over
+    the files of all their languages and come first, as they head every
+    chain they are part of. Dependencies follow file access: a task waits
+    for the last earlier task that wrote any of its files, and a writing
+    task also waits for the earlier readers of those files.
+
+    Args:
+        languages: Runner languages to format
+        buckets: Discovery buckets (language -> files)
+        options: Runner options
+        batch_size: Files per invocation
+        max_bytes: Command line limit, defaults to argv_limit()
+
+    Returns:
+        Tasks in declaration order with their dependencies set
+    """
+    limit = max_bytes or argv_limit()
+    plans: List[Tuple[str, Tool, List[str]]] = []
+    shared: Dict[str, Tuple[Tool, List[str]]] = {}
+    for language in languages:
+        if not _language_present(language, buckets, options):
+            continue
+        for tool in _shard_tools(language, options):
+            files = [f for b in tool.buckets for f in buckets.get(b, [])]
+            if tool.shared:
+                shared.setdefault(tool.name, (tool, []))[1].extend(files)
+            elif files:
+                plans.append((language, tool, files))
+    plans[:0] = [
+        (SHARED_LANGUAGE, tool, files) for tool, files in shared.values()
+    ]
+
+    tasks: List[Task] = []
+    for language, tool, all_files in plans:
+        files = list(dict.fromkeys(all_files))
+        if not files:
+            continue
+        size = min(batch_size, tool.max_batch or batch_size)
+        if not tool.pass_files:
+            chunks = [files + list(tool.extra_files)]
+        else:
+            # In-process tools without a command are not limited
+            argv_bytes = limit if tool.argv else None
+            pack = pack_packages if tool.whole_packages else pack_batches
+            chunks = pack(tool.argv, files, size, argv_bytes)
+        for number, chunk in enumerate(chunks, 1):
+            tasks.append(
+                Task(len(tasks), language, tool, chunk, number, len(chunks))
+            )
+
+    _link_dependencies(tasks)
+    return tasks
+
+
+def _link_dependencies(tasks: List[Task]) -> None:
+    """Order tasks that touch the same files.
+
+    Args:
+        tasks: Tasks in declaration order; their deps are filled in
+    """
+    last_writer: Dict[str, int] = {}
+    readers: Dict[str, List[int]] = {}
+    for task in tasks:
+        for path in task.files:
+            if path in last_writer:
+                task.deps.add(last_writer[path])
+            if task.tool.writes:
+                task.deps.update(readers.pop(path, []))
+                last_writer[path] = task.id
+            else:
+                readers.setdefault(path, []).append(task.id)
+        task.deps.discard(task.id)
+
+
+class FormatRunner:
+    """Runs a task graph on a thread pool of subprocess workers."""
+
+    def __init__(
+        self,
+        tasks: List[Task],
+        jobs: Optional[int] = None,
+        root: str = ".",
+        list_dir: Optional[str] = None,
+        report: Optional[TimingReport] = None,
+        daemon: Optional[DaemonClient] = None,
+        lint_store: Optional[LintStore] = None,
+        base: Optional[str] = None,
+    ):
+        """Initialize the runner.
+
+        Args:
+            tasks: Tasks from build_tasks
+            jobs: Maximum concurrent tool processes, defaults to CPU count
+            root: Directory the tools run in
+            list_dir: Discovery list directory; tolerated failures add
+                the files they concern to the ``<bucket>.lint-failed``
+                marker of each discovery bucket holding them, for the
+                format cache
+            report: Timing report receiving one record per task
+            daemon: Formatter daemon serving prettier and eslint tasks;
+                tasks it cannot serve run as subprocesses
+            lint_store: Stored lint results; per-file linters replay them
+                and only lint contents the store does not know
+            base: Base revision; with a lint store, failing linters whose
+                findings all exist on the base do not fail the run
+        """
+        self.tasks = tasks
+        self.jobs = max(1, jobs or os.cpu_count() or 1)
+        self.root = root
+        self.list_dir = list_dir
+        self.report = report
+        self.daemon = daemon
+        self.lint_store = lint_store
+        self.base = base
+        self._print_lock = threading.Lock()
+        self._marker_lock = threading.Lock()
+        self._fingerprint_lock = threading.Lock()
+        self._fingerprints: Dict[Tuple[str, str], str] = {}
+
+    def run(self) -> bool:
+        """Run every task, respecting dependencies.
+
+        A task whose dependency failed or was skipped is skipped too, so a
+        formatter crash does not run the rest of its chain on half-written
+        files; other languages carry on.
+
+        Returns:
+            True if no task failed without tolerance
+        """
+        dependents: Dict[int, List[int]] = {t.id: [] for t in self.tasks}
+        waiting = {t.id: len(t.deps) for t in self.tasks}
+        for task in self.tasks:
+            for dep in task.deps:
+                dependents[dep].append(task.id)
+
+        ready = [t.id for t in self.tasks if not t.deps]
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            while ready or running:
+                while ready:
+                    task = self.tasks[ready.pop(0)]
+                    if any(
+                        self.tasks[d].status in ("failed", "skipped")
+                        for d in task.deps
+                    ):
+                        task.status = "skipped"
+                        self._report(task)
+                        ready.extend(self._release(task, dependents, waiting))
+                        continue
+                    running[executor.submit(self._execute, task)] = task
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    future.result()
+                    self._report(task)
+                    ready.extend(self._release(task, dependents, waiting))
+
+        return not any(t.status == "failed" for t in self.tasks)
+
+    def _release(
+        self,
+        task: Task,
+        dependents: Dict[int, List[int]],
+        waiting: Dict[int, int],
+    ) -> List[int]:
+        """Mark a task finished and return dependents that became ready."""
+        released = []
+        for dependent in dependents[task.id]:
+            waiting[dependent] -= 1
+            if waiting[dependent] == 0:
+                released.append(dependent)
+        return released
+
+    def _execute(self, task: Task) -> None:
+        """Run one task in a worker thread."""
+        executable = task.tool.executable
+        if executable and shutil.which(executable) is None:
+            task.status = "unavailable"
+            task.output = f"{executable} not available, skipping"
+            return
+
+        stored = self._stored_results(task)
+        files = [path for path in task.files if path not in stored]
+        if files:
+            self._run(task, files)
+            if self._uses_store(task):
+                # A fixing linter's findings hold for what it left behind
+                keys = self._store_keys(task, files)
+                self._store_results(task, files, keys)
+        else:
+            task.returncode, task.output = 0, ""
+        if stored:
+            self._replay(task, stored)
+        self._record(task)
+
+        if task.returncode == 0:
+            task.status = "ok"
+            return
+        task.file_errors = attribute_output(task.files, task.output, self.root)
+        if task.tool.tolerate_failure or self._known_on_base(task):
+            task.status = "tolerated"
+            # Without attribution the whole batch is suspect
+            self._mark_lint_failed(list(task.file_errors) or task.files)
+        else:
+            task.status = "failed"
+
+    def _run(self, task: Task, files: List[str]) -> None:
+        """Run a task's tool over some or all of its files."""
+        if task.tool.function is not None:
+            start = time.monotonic()
+            task.returncode, task.output = task.tool.function(files, self.root)
+            task.duration = time.monotonic() - start
+            return
+        argv = task.argv if files == task.files else [*task.tool.argv, *files]
+        start = time.monotonic()
+        served = try_daemon(self.daemon, argv, self.root)
+        if served is not None:
+            task.returncode, task.output = served
+            task.duration = time.monotonic() - start
+            return
+        try:
+            (
+                task.returncode,
+                task.output,
+                task.duration,
+                task.max_rss,
+            ) = run_timed(argv, cwd=self.root)
+        except OSError as e:
+            task.returncode = 127
+            task.output = str(e)
+
+    def _uses_store(self, task: Task) -> bool:
+        """Whether a task is a per-file linter the lint store can serve.
+
+        Fixing linters are served too: a file whose contents they already
+        left behind once would not be changed again.
+        """
+        return (
+            self.lint_store is not None
+            and (task.tool.fixes or not task.tool.writes)
+            and task.tool.pass_files
+        )
+
+    def _fingerprint(self, task: Task) -> str:
+        """Lint store fingerprint of a task's tool, computed once."""
+        name = (task.language, task.tool.name)
+        with self._fingerprint_lock:
+            if name not in self._fingerprints:
+                self._fingerprints[name] = lint_fingerprint(
+                    task.language,
+                    task.tool.name,
+                    task.tool.argv,
+                    self.root,
+                    FIXER_CONFIGS.get(task.tool.name, ()),
+                )
+            return self._fingerprints[name]
+
+    def _store_keys(self, task: Task, files: List[str]) -> Dict[str, str]:
+        """Lint store keys of some of a task's files as they are now."""
+        fingerprint = self._fingerprint(task)
+        keys = {}
+        for path in files:
+            digest = file_digest(os.path.join(self.root, path))
+            if digest is not None:
+                keys[path] = LintStore.key(fingerprint, digest)
+        return keys
+
+    def _stored_results(self, task: Task) -> Dict[str, LintResult]:
+        """Results the lint store holds for a task's files as they are."""
+        if not self._uses_store(task):
+            return {}
+        stored = {}
+        for path, key in self._store_keys(task, task.files).items():
+            result = self.lint_store.get(key)
+            if result is not None:
+                stored[path] = result
+        return stored
+
+    def _store_results(
+        self, task: Task, files: List[str], keys: Dict[str, str]
+    ) -> None:
+        """Remember what a linter reported for each file it just linted.
+
+        A failure that names none of the files (a crash, a bad config)
+        says nothing about them, so nothing is stored.
+        """
+        errors = attribute_output(files, task.output, self.root)
+        if task.returncode not in (0, None) and not errors:
+            return
+        failed = task.returncode != 0
+        for path in files:
+            if path in keys:
+                lines = strip_path(errors.get(path, []), path, self.root)
+                result = LintResult(lines, failed and bool(lines))
+                self.lint_store.put(keys[path], result)
+
+    def _replay(self, task: Task, stored: Dict[str, LintResult]) -> None:
+        """Add stored results to a task's output and exit code."""
+        lines = [
+            line
+            for path, result in stored.items()
+            for line in restore_path(result.lines, path)
+        ]
+        task.output = "\n".join(line for line in [*lines, task.output] if line)
+        if any(result.failed for result in stored.values()):
+            task.returncode = max(task.returncode or 0, 1)
+        task.replayed = len(stored)
+
+    def _known_on_base(self, task: Task) -> bool:
+        """Whether every finding of a failed linter also exists on the base.
+
+        A file identical to its base version has no new findings; a
+        changed file is compared with the stored results of its base
+        contents. Without those, or with findings not attributed to
+        files, every finding counts as new.
+
+        Returns:
+            True if the failure only repeats the base's findings
+        """
+        if not (self.base and self._uses_store(task) and task.file_errors):
+            return False
+        fingerprint = self._fingerprint(task)
+        try:
+            bases = base_digests(self.root, self.base, task.file_errors)
+        except GitError:
+            return False
+        for path, lines in task.file_errors.items():
+            base = bases.get(path)
+            if base is not None and base == file_digest(
+                os.path.join(self.root, path)
+            ):
+                continue
+            found = strip_path(lines, path, self.root)
+            if base is not None:
+                previous = self.lint_store.peek(
+                    LintStore.key(fingerprint, base)
+                )
+                if previous is not None:
+                    found = new_findings(found, previous.lines)
+            if found:
+                task.new_findings[path] = restore_path(found, path)
+        return not task.new_findings
+
+    def _record(self, task: Task) -> None:
+        """Add a finished task to the timing report."""
+        if self.report is None:
+            return
+        self.report.add(
+            "tool",
+            task.label,
+            task.duration,
+            task.returncode,
+            task.max_rss,
+            language=task.language,
+            tool=task.tool.name,
+            batch=task.batch,
+            files=len(task.files),
+            bytes=file_bytes(task.files, self.root),
+        )
+
+    def _mark_lint_failed(self, files: List[str]) -> None:
+        """Add files to the format cache's markers for tolerated failures.
+
+        The cache keeps one list per discovery bucket, so a file goes into
+        the marker of every bucket it belongs to, not the runner
+        language's: an Angular ``.html`` file is marked under ``html``.
+        """
+        if not self.list_dir:
+            return
+        by_bucket: Dict[str, List[str]] = {}
+        for path in files:
+            for bucket in classify(path):
+                by_bucket.setdefault(bucket, []).append(path)
+        with self._marker_lock:
+            for bucket, paths in by_bucket.items():
+                marker = os.path.join(self.list_dir, f"{bucket}.lint-failed")
+                with open(marker, "a", encoding="utf-8") as f:
+                    f.write("".join(f"{path}\0" for path in paths))
+
+    def _report(self, task: Task) -> None:
+        """Print a finished task's output as one collapsible log group."""
+        icons = {
+            "ok": "✅",
+            "tolerated": "⚠️ ",
+            "failed": "❌",
+            "skipped": "⏭️ ",
+            "unavailable": "ℹ️ ",
+        }
+        stored = f", {task.replayed} from lint store" if task.replayed else ""
+        header = (
+            f"{icons.get(task.status, '')} {task.label} "
+            f"({len(task.files)} files{stored}, {task.duration:.1f}s)"
+        )
+        with self._print_lock:
+            print(f"::group::{header}")
+            if task.output:
+                print(task.output)
+            for path, lines in sorted(task.file_errors.items()):
+                print(f"   {path}: {len(lines)} problem(s)")
+            if (
+                task.status == "tolerated"
+                and not task.tool.tolerate_failure
+                and task.file_errors
+            ):
+                print(f"   ℹ️ no findings new since {self.base}")
+            for path, lines in sorted(task.new_findings.items()):
+                print(f"   🆕 {path}: {len(lines)} new since {self.base}")
+            print("::endgroup::", flush=True)
+
+    def summary(self) -> str:
+        """Summarize task outcomes per language and tool.
+
+        Returns:
+            Plain-text table, one row per (language, tool)
+        """
+        rows: Dict[tuple, Dict[str, float]] = {}
+        for task in self.tasks:
+            row = rows.setdefault(
+                (task.language, task.tool.name),
+                {"files": 0, "problems": 0, "seconds": 0.0, "status": "ok"},
+            )
+            row["files"] += len(task.files)
+            row["problems"] += len(task.file_errors)
+            row["seconds"] += task.duration
+            if task.status != "ok":
+                row["status"] = task.status
+
+        header = (
+            f"{'Language':<10} {'Tool':<24} {'Files':>6} {'Issues':>6} "
+            f"{'Time':>7}  Status"
+        )
+        lines = [header]
+        for (language, tool), row in rows.items():
+            lines.append(
+                f"{language:<10} {tool:<24} {row['files']:>6} "
+                f"{row['problems']:>6} {row['seconds']:>6.1f}s  {row['status']}"
+            )
+        return "\n".join(lines)
+
+    def file_statuses(self) -> Dict[str, Dict[str, str]]:
+        """Per-file outcome of every tool that processed the file.
+
+        A failed batch marks the files its output names; when the output
+        names none of them, every file of the batch gets the status.
+
+        Returns:
+            ``{path: {"language: tool": status}}`` for files that did not
+            pass cleanly
+        """
+        statuses: Dict[str, Dict[str, str]] = {}
+        for task in self.tasks:
+            if task.status not in ("failed", "tolerated"):
+                continue
+            name = f"{task.language}: {task.tool.name}"
+            for path in task.file_errors or task.files:
+                statuses.setdefault(path, {})[name] = task.status
+        return statuses
+
+
+def load_buckets(list_dir: str) -> Dict[str, List[str]]:
+    """Read the NUL-separated lists written by file_discovery.py.
+
+    Args:
+        list_dir: Directory of ``<language>.list`` files
+
+    Returns:
+        Buckets by language; missing lists are empty
+    """
+    buckets = {}
+    for language in LANGUAGE_SUFFIXES:
+        path = os.path.join(list_dir, f"{language}.list")
+        try:
+            with open(path, encoding="utf-8") as f:
+                buckets[language] = [n for n in f.read().split("\0") if n]
+        except OSError:
+            buckets[language] = []
+    return buckets
+
+
+def _report_prettier(tasks: List[Task], report: Optional[TimingReport]) -> None:
+    """Print and record per-extension results of the shared prettier run."""
+    runs = [t for t in tasks if t.tool.shared and t.tool.name == "prettier"]
+    if not runs:
+        return
+    stats = extension_stats(
+        [path for task in runs for path in task.files],
+        [task.output for task in runs],
+    )
+    print(f"\n🎨 prettier by extension:\n{render_stats(stats)}")
+    if report is not None:
+        for name, row in stats.items():
+            report.add(
+                "extension",
+                name,
+                row["seconds"],
+                tool="prettier",
+                files=row["files"],
+                changed=row["changed"],
+                cached=row["cached"],
+            )
+
+
+def _flag(value: str) -> bool:
+    """Parse an action boolean input."""
+    return value.strip().lower() == "true"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point for the format runner CLI.
+
+    Args:
+        argv: Command line arguments, defaults to sys.argv
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(
+        description="Parallel formatter and linter runner for Auto Formatter"
+    )
+    parser.add_argument("--root", default=".", help="Repository directory")
+    parser.add_argument(
+        "--list-dir",
+        help="Directory of <language>.list files from file_discovery.py; "
+        "discovers files itself when omitted",
+    )
+    parser.add_argument(
+        "--languages",
+        default="all",
+        help="The action's languages input (default: all)",
+    )
+    parser.add_argument("--enable-linting", default="true", type=_flag)
+    parser.add_argument("--fail-on-lint-errors", default="false", type=_flag)
+    parser.add_argument("--python-line-length", type=int, default=88)
+    parser.add_argument(
+        "--whole-tree-tools",
+        default="true",
+        type=_flag,
+        help="Run tools that process the whole tree (go mod tidy, "
+        "golangci-lint, dotnet format, styler, ...); off in every shard "
+        "but the first",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="Maximum concurrent tool processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="Files per formatter invocation",
+    )
+    parser.add_argument(
+        "--timing-report",
+        default=os.getenv(TIMING_ENV),
+        help="NDJSON file to append per-task timing records to "
+        f"(default: ${TIMING_ENV})",
+    )
+    parser.add_argument(
+        "--daemon",
+        default=os.getenv(DAEMON_ENV),
+        help="Socket of a running format_daemon.py to send prettier and "
+        f"eslint tasks to (default: ${DAEMON_ENV})",
+    )
+    parser.add_argument(
+        "--changes",
+        help="Write the files the tools rewrote (size or mtime changed) to "
+        "this NUL-separated list for change_set.py",
+    )
+    parser.add_argument(
+        "--lint-store",
+        help="JSON file of stored lint results; per-file linters only lint "
+        "contents it does not know",
+    )
+    parser.add_argument(
+        "--base-ref",
+        help="Base revision; with --lint-store, failing linters only fail "
+        "the run for findings the base does not have",
+    )
+    parser.add_argument(
+        "--prettier-cache",
+        help="Prettier cache file; prettier runs with --cache when given",
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Print the job graph without running it",
+    )
+
+    args = parser.parse_args(argv)
+    options = RunnerOptions(
+        root=args.root,
+        enable_linting=args.enable_linting,
+        fail_on_lint_errors=args.fail_on_lint_errors,
+        python_line_length=args.python_line_length,
+        prettier_cache=args.prettier_cache,
+        whole_tree=args.whole_tree_tools,
+    )
+
+    if args.list_dir:
+        buckets = load_buckets(args.list_dir)
+    else:
+        buckets = discover_files(args.root)
+
+    languages = enabled_languages(args.languages)
+    tasks = build_tasks(languages, buckets, options, args.batch_size)
+
+    if args.plan:
+        for task in tasks:
+            deps = ", ".join(str(d) for d in sorted(task.deps)) or "-"
+            print(
+                f"{task.id:>4} {task.label} ({len(task.files)} files) <- {deps}"
+            )
+        return 0
+
+    if not tasks:
+        print("ℹ️ No files to format")
+        return 0
+
+    report = TimingReport(args.timing_report) if args.timing_report else None
+    daemon = DaemonClient(args.daemon) if args.daemon else None
+    lint_store = LintStore(args.lint_store) if args.lint_store else None
+    runner = FormatRunner(
+        tasks,
+        args.jobs,
+        args.root,
+        args.list_dir,
+        report,
+        daemon,
+        lint_store,
+        args.base_ref or None,
+    )
+    print(f"🚀 Running {len(tasks)} tasks on {runner.jobs} workers")
+    before = None
+    if args.changes:
+        before = stat_snapshot({p for t in tasks for p in t.files}, args.root)
+    success = runner.run()
+    if before is not None:
+        rewritten = rewritten_files(before, args.root)
+        write_list(args.changes, rewritten)
+        print(f"📝 {len(rewritten)} files rewritten")
+    print(runner.summary())
+    _report_prettier(tasks, report)
+    if lint_store is not None:
+        lint_store.save()
+        stats = lint_store.stats()
+        print(
+            f"🗄️ Lint store: {stats['hits']} results replayed, "
+            f"{stats['misses']} linted, {stats['entries']} entries"
+        )
+    statuses = runner.file_statuses()
+    if statuses:
+        print(f"\n🔍 {len(statuses)} files with problems:")
+        for path, tools in sorted(statuses.items()):
+            details = ", ".join(f"{t} ({s})" for t, s in sorted(tools.items()))
+            print(f"  {path}: {details}")
+    return 0 if success else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""# file: scripts/format_state.py
+Formatted-state trailers for the Auto Formatter GitHub Action
+
+The action used to skip a run only when the last commit message contained
+``style: auto-format``, so a custom ``commit-message`` made it re-format
+its own commit, reinstall every toolchain and burn a full job. Instead,
+every auto-format commit now ends with two trailers:
+
+    Auto-Formatter-Tree: <id of the formatted tree>
+    Auto-Formatter-Config: <fingerprint of the action and its settings>
+
+The tree is the working directory's subtree, so changes elsewhere in a
+monorepo do not count. The fingerprint covers the action's own files
+(``action.yml``, the scripts, the pinned tool manifest and the lint
+configs) and the inputs that change the output. Repository config files
+such as ``.ruff.toml`` are part of the tree already. A run whose ``HEAD``
+carries trailers matching its current tree and fingerprint has nothing to
+do and stops after two git calls. Commits from older versions carry no
+trailers and run once more.
+
+Usage:
+    python scripts/format_state.py --action-path . check \
+        --setting languages=all
+    python scripts/format_state.py trailers --fingerprint <digest>
+"""
+
+import argparse
+import glob
+import hashlib
+import os
+import re
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from file_discovery import GitError, run_git, write_github_output
+from format_cache import file_digest
+
+# Trailer naming the tree an auto-format commit left behind
+TREE_TRAILER = "Auto-Formatter-Tree"
+
+# Trailer naming the fingerprint of the action and its settings
+CONFIG_TRAILER = "Auto-Formatter-Config"
+
+# Files of the action, relative to its path, that decide the output
+ACTION_FILES = (
+    "action.yml",
+    "scripts/*.py",
+    "scripts/*.js",
+    "scripts/tools.json",
+    "scripts/configs/*",
+)
+
+# Bump to invalidate every recorded state when the fingerprint changes
+STATE_VERSION = 1
+
+
+def _git(root: str, *args: str) -> str:
+    """Run git and return its decoded, stripped stdout."""
+    return run_git(root, *args).decode("utf-8", "replace").strip()
+
+
+def config_fingerprint(
+    action_path: str, settings: Optional[Dict[str, str]] = None
+) -> str:
+    """Fingerprint the action's files and the settings it runs with.
+
+    Args:
+        action_path: Directory of the action
+        settings: Inputs that change the output, e.g. languages
+
+    Returns:
+        Hex digest
+    """
+    parts = [f"format-state {STATE_VERSION}"]
+    for pattern in ACTION_FILES:
+        for path in sorted(glob.glob(os.path.join(action_path, pattern))):
+            if os.path.isfile(path):
+                name = os.path.relpath(path, action_path).replace(os.sep, "/")
+                parts.append(f"file {name} {file_digest(path)}")
+    for name, value in sorted((settings or {}).items()):
+        parts.append(f"setting {name}={value}")
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+def parse_trailers(message: str) -> Dict[str, str]:
+    """Read the formatted-state trailers of a commit message.
+
+    Args:
+        message: Commit message, or a raw commit object
+
+    Returns:
+        Trailer values by key; only the last paragraph is searched, like
+        ``git interpret-trailers``
+    """
+    paragraphs = [p for p in re.split(r"\n\s*\n", message.strip()) if p]
+    if not paragraphs:
+        return {}
+    trailers = {}
+    for line in paragraphs[-1].splitlines():
+        key, sep, value = line.partition(":")
+        if sep and key in (TREE_TRAILER, CONFIG_TRAILER):
+            trailers[key] = value.strip()
+    return trailers
+
+
+def format_trailers(tree: str, fingerprint: str) -> str:
+    """Render the trailers for an auto-format commit.
+
+    Args:
+        tree: Id of the formatted tree of the working directory
+        fingerprint: Result of config_fingerprint
+
+    Returns:
+        Trailer lines
+    """
+    return f"{TREE_TRAILER}: {tree}\n{CONFIG_TRAILER}: {fingerprint}"
+
+
+def recorded_state(root: str, rev: str = "HEAD") -> Tuple[Dict[str, str], str]:
+    """Read a commit's trailers and its current tree.
+
+    Args:
+        root: Working directory of the action
+        rev: Commit to read
+
+    Returns:
+        (trailers, id of root's subtree in the commit)
+
+    Raises:
+        GitError: If the commit or the directory does not exist in it
+    """
+    message = _git(root, "cat-file", "commit", rev)
+    return parse_trailers(message), _git(root, "rev-parse", f"{rev}:./")
+
+
+def is_formatted(
+    root: str, fingerprint: str, rev: str = "HEAD"
+) -> Tuple[bool, str]:
+    """Whether a commit is a formatted state of the same configuration.
+
+    Args:
+        root: Working directory of the action
+        fingerprint: Result of config_fingerprint for this run
+        rev: Commit to check
+
+    Returns:
+        (formatted, reason)
+    """
+    try:
+        trailers, tree = recorded_state(root, rev)
+    except GitError as e:
+        return False, str(e)
+    if TREE_TRAILER not in trailers:
+        return False, f"{rev} has no {TREE_TRAILER} trailer"
+    if trailers[TREE_TRAILER] != tree:
+        return False, "the tree changed since the last formatted state"
+    if trailers.get(CONFIG_TRAILER) != fingerprint:
+        return False, "the action or its settings changed"
+    return True, f"{rev} is already formatted with this configuration"
+
+
+def staged_tree(root: str) -> str:
+    """Id of the staged tree of the working directory.
+
+    Args:
+        root: Working directory of the action
+
+    Returns:
+        Tree id of root's subtree in the index
+
+    Raises:
+        GitError: If the index cannot be written as a tree
+    """
+    tree = _git(root, "write-tree")
+    prefix = _git(root, "rev-parse", "--show-prefix")
+    return _git(root, "rev-parse", f"{tree}:{prefix}")
+
+
+def _parse_settings(pairs: Optional[List[str]]) -> Dict[str, str]:
+    """Turn repeated ``name=value`` arguments into a dict."""
+    settings = {}
+    for pair in pairs or []:
+        name, sep, value = pair.partition("=")
+        if not sep:
+            raise ValueError(f"Expected name=value, got {pair!r}")
+        settings[name] = value
+    return settings
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point for the formatted-state CLI.
+
+    Args:
+        argv: Command line arguments, defaults to sys.argv
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(
+        description="Formatted-state trailers for Auto Formatter"
+    )
+    parser.add_argument("--root", default=".", help="Working directory")
+    parser.add_argument(
+        "--action-path",
+        default=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        help="Directory of the action (default: this checkout)",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    check = subparsers.add_parser(
+        "check", help="Set skip=true if HEAD is already formatted"
+    )
+    check.add_argument(
+        "--setting",
+        action="append",
+        dest="settings",
+        help="name=value input that changes the output (repeatable)",
+    )
+
+    trailers = subparsers.add_parser(
+        "trailers", help="Print the trailers for the staged tree"
+    )
+    trailers.add_argument(
+        "--fingerprint",
+        required=True,
+        help="Fingerprint printed by check (its fingerprint output)",
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.command == "trailers":
+        try:
+            tree = staged_tree(args.root)
+        except GitError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 1
+        print(format_trailers(tree, args.fingerprint))
+        return 0
+
+    try:
+        settings = _parse_settings(args.settings)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+    fingerprint = config_fingerprint(args.action_path, settings)
+    formatted, reason = is_formatted(args.root, fingerprint)
+    write_github_output(
+        {"skip": "true" if formatted else "false", "fingerprint": fingerprint}
+    )
+    if formatted:
+        print(f"⏭️  Skipping: {reason}")
+    else:
+        print(f"🔍 Proceeding with format check: {reason}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
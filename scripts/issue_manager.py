@@ -16,27 +16,494 @@ Usage:
 """
 
 import argparse
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import hashlib
+import io
 import json
 import os
+import random
+import re
 import sys
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+import zlib
 
 import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
 
+from file_discovery import DISCOVERY_MODES, discover_files
 
-class GitHubAPI:
-    """GitHub API client for issue management operations."""
+try:
+    import aiohttp
+except ImportError:  # Optional: only needed by AsyncGitHubAPI
+    aiohttp = None
 
-    def __init__(self, token: str, repo: str):
-        """Initialize GitHub API client.
+# Timeout in seconds applied to every GitHub API request
+REQUEST_TIMEOUT = 10
+
+# Page size requested from paginated endpoints (GitHub's maximum)
+PER_PAGE = 100
+
+# Upper bound on concurrent issue update workers; GitHub's secondary rate
+# limits penalise bursts of concurrent requests
+MAX_UPDATE_WORKERS = 8
+
+# Content-creating requests allowed per minute by GitHub's secondary limits
+MUTATIONS_PER_MINUTE = 80
+
+# Search API requests allowed per minute for authenticated users
+SEARCH_PER_MINUTE = 30
+
+# Secondary-limit points per minute for REST endpoints; reads cost one
+# point and mutations cost MUTATION_POINTS
+CORE_POINTS_PER_MINUTE = 900
+MUTATION_POINTS = 5
+
+# Methods GitHub counts as content-creating requests
+MUTATING_METHODS = frozenset({"POST", "PATCH", "PUT", "DELETE"})
+
+# Marker embedded in Copilot review issue bodies
+COPILOT_MARKER_RE = re.compile(r"<!--\s*copilot-data:\s*(\S+?)\s*-->")
+
+# MinHash signature length for near-duplicate detection; more permutations
+# give tighter similarity estimates at linear extra cost
+MINHASH_PERMUTATIONS = 128
+
+# Leading body characters shingled for near-duplicate detection, so long
+# logs pasted into issues do not dominate the signature or the run time
+MINHASH_BODY_CHARS = 2000
+
+# Modulus for the MinHash hash function (the Mersenne prime 2**61 - 1)
+MINHASH_PRIME = (1 << 61) - 1
+
+# Status codes retried with exponential backoff by the session adapter.
+# 403/429 rate limits are handled by RateLimitScheduler instead.
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+
+
+class RateLimitError(Exception):
+    """Raised when GitHub keeps rate limiting a request.
+
+    Callers must treat this as "unknown", never as an empty result.
+    """
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        """Initialize the error.
+
+        Args:
+            message: Human readable description
+            retry_after: Seconds until GitHub expects to accept requests
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Thread-safe token bucket that hands out reservations.
+
+    Tokens may go negative: each caller reserves its slot and is told how
+    long to wait for it, so concurrent callers queue fairly.
+    """
+
+    def __init__(
+        self, rate_per_minute: float, capacity: Optional[float] = None
+    ):
+        """Initialize a full bucket.
+
+        Args:
+            rate_per_minute: Tokens refilled per minute
+            capacity: Maximum burst size (defaults to one minute of tokens)
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take tokens from the bucket.
+
+        Args:
+            tokens: Number of tokens the request costs
+
+        Returns:
+            Seconds the caller must wait before sending
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self.tokens -= tokens
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+class RateLimitScheduler:
+    """Central pacing for every request sent to the GitHub API.
+
+    Requests are paced by separate token buckets for the search API, the
+    REST core API and content-creating requests. Responses feed back
+    ``X-RateLimit-Remaining``/``X-RateLimit-Reset`` and ``Retry-After`` so
+    an exhausted resource blocks all callers until it resets.
+    """
+
+    def __init__(
+        self,
+        search_per_minute: float = SEARCH_PER_MINUTE,
+        core_points_per_minute: float = CORE_POINTS_PER_MINUTE,
+        mutations_per_minute: float = MUTATIONS_PER_MINUTE,
+        max_retries: int = 3,
+        max_wait: float = 300.0,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            search_per_minute: Search API requests per minute
+            core_points_per_minute: Secondary-limit points per minute
+            mutations_per_minute: Content-creating requests per minute
+            max_retries: Retries of a rate-limited request before giving up
+            max_wait: Longest single wait, in seconds, before giving up
+        """
+        self.buckets = {
+            "search": TokenBucket(search_per_minute),
+            "core": TokenBucket(core_points_per_minute),
+            "mutation": TokenBucket(mutations_per_minute),
+        }
+        self.max_retries = max_retries
+        self.max_wait = max_wait
+        self.throttled_seconds = 0.0
+        self.rate_limited_responses = 0
+        self._blocked_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def resource_for(self, path: str) -> str:
+        """Classify a request path into its rate limit resource.
+
+        Args:
+            path: API path or absolute URL
+
+        Returns:
+            "search" for the search API, "graphql" for GraphQL, otherwise
+            "core"
+        """
+        if "/search/" in path:
+            return "search"
+        return "graphql" if path.endswith("/graphql") else "core"
+
+    def acquire(self, method: str, path: str, weight: int = 1) -> float:
+        """Reserve capacity for a request.
+
+        Args:
+            method: HTTP method
+            path: API path or absolute URL
+            weight: Content-creating operations the request carries, e.g.
+                the number of mutations in a batched GraphQL document
+
+        Returns:
+            Seconds to wait before sending the request
+        """
+        resource = self.resource_for(path)
+        if resource == "search":
+            delay = self.buckets["search"].reserve()
+        else:
+            mutating = method.upper() in MUTATING_METHODS
+            cost = MUTATION_POINTS if mutating else 1
+            delay = self.buckets["core"].reserve(cost)
+            if mutating:
+                delay = max(delay, self.buckets["mutation"].reserve(weight))
+
+        with self._lock:
+            blocked = self._blocked_until.get(resource, 0.0)
+            delay = max(delay, blocked - time.monotonic())
+            if delay > 0:
+                self.throttled_seconds += delay
+        return max(delay, 0.0)
+
+    def record_response(
+        self, path: str, status: int, headers: Any, body: str = ""
+    ) -> Optional[float]:
+        """Update limits from a response and detect rate limiting.
+
+        Args:
+            path: API path or absolute URL of the request
+            status: HTTP status code
+            headers: Response headers (case-insensitive mapping)
+            body: Response text, used to spot secondary limits without
+                headers
+
+        Returns:
+            Seconds to wait before retrying if the response was rate
+            limited, otherwise None
+        """
+        resource = headers.get("X-RateLimit-Resource") or self.resource_for(
+            path
+        )
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        until_reset = None
+        if reset is not None:
+            until_reset = max(float(reset) - time.time(), 0.0) + 1.0
+
+        if remaining == "0" and until_reset is not None:
+            self._block(resource, until_reset)
+
+        if status not in (403, 429):
+            return None
+
+        retry_after = headers.get("Retry-After")
+        if retry_after is not None:
+            wait = float(retry_after)
+        elif remaining == "0" and until_reset is not None:
+            wait = until_reset
+        elif status == 429 or "rate limit" in body.lower():
+            # GitHub asks for at least a minute when no header is sent
+            wait = 60.0
+        else:
+            return None  # Plain permission error
+
+        self._block(resource, wait)
+        with self._lock:
+            self.rate_limited_responses += 1
+        return wait
+
+    def _block(self, resource: str, seconds: float) -> None:
+        """Hold back every request for a resource.
+
+        Args:
+            resource: Rate limit resource name
+            seconds: How long to hold requests back
+        """
+        with self._lock:
+            until = time.monotonic() + seconds
+            self._blocked_until[resource] = max(
+                self._blocked_until.get(resource, 0.0), until
+            )
+
+
+class ResponseCache:
+    """Persistent, size-bounded LRU cache of conditional GET responses.
+
+    Entries are keyed by URL, query parameters and a hash of the auth token,
+    and store the ``ETag``/``Last-Modified`` validators GitHub returned.
+    Revalidated requests come back as 304, which GitHub does not count
+    against the primary rate limit, and are served from the cache.
+    """
+
+    # Response headers kept with each entry
+    KEPT_HEADERS = ("ETag", "Last-Modified", "Link", "Content-Type")
+
+    def __init__(self, path: str, max_bytes: int = 50 * 1024 * 1024):
+        """Initialize the cache, loading any previous state from disk.
+
+        Args:
+            path: JSON file the cache persists to
+            max_bytes: Maximum total size of cached bodies
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size = 0
+        self._entries: Dict[str, Dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        """Load entries from disk, ignoring a missing or corrupt file."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        for key, entry in data.get("entries", []):
+            self._entries[key] = entry
+            self._size += len(entry.get("body", ""))
+        self._evict()
+
+    def save(self) -> None:
+        """Write the cache to disk atomically."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            data = {"version": 1, "entries": list(self._entries.items())}
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(temp_path, self.path)
+
+    def key(
+        self, url: str, params: Optional[Dict[str, Any]], token: str
+    ) -> str:
+        """Build the cache key for a request.
+
+        Args:
+            url: Absolute request URL
+            params: Query parameters, if any
+            token: Auth token; only a hash of it enters the key
+
+        Returns:
+            Hex digest identifying the request and its auth scope
+        """
+        scope = hashlib.sha256(token.encode()).hexdigest()
+        query = json.dumps(sorted((params or {}).items()), default=str)
+        raw = f"{scope}\n{url}\n{query}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up an entry without touching the statistics.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached entry, or None
+        """
+        with self._lock:
+            return self._entries.get(key)
+
+    def validators(self, entry: Dict[str, Any]) -> Dict[str, str]:
+        """Conditional request headers for a cached entry.
+
+        Args:
+            entry: Cached entry
+
+        Returns:
+            ``If-None-Match``/``If-Modified-Since`` headers
+        """
+        headers = {}
+        if entry["headers"].get("ETag"):
+            headers["If-None-Match"] = entry["headers"]["ETag"]
+        if entry["headers"].get("Last-Modified"):
+            headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+        return headers
+
+    def mark_hit(self, key: str) -> None:
+        """Record a 304 revalidation and refresh the entry's LRU position.
+
+        Args:
+            key: Cache key
+        """
+        with self._lock:
+            self.hits += 1
+            if key in self._entries:
+                self._entries.move_to_end(key)
+
+    def store(self, key: str, headers: Any, body: str) -> None:
+        """Record a fresh 200 response (a miss) if it has validators.
+
+        Args:
+            key: Cache key
+            headers: Response headers
+            body: Response text
+        """
+        kept = {
+            name: headers[name]
+            for name in self.KEPT_HEADERS
+            if headers.get(name)
+        }
+        with self._lock:
+            self.misses += 1
+            if "ETag" not in kept and "Last-Modified" not in kept:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous["body"])
+            self._entries[key] = {"headers": kept, "body": body}
+            self._size += len(body)
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until under the size bound."""
+        while self._entries and self._size > self.max_bytes:
+            _, entry = self._entries.popitem(last=False)
+            self._size -= len(entry["body"])
+            self.evictions += 1
+
+    def to_response(
+        self, entry: Dict[str, Any], original: requests.Response
+    ) -> requests.Response:
+        """Rebuild a 200 response from a cached entry.
+
+        Args:
+            entry: Cached entry
+            original: The 304 response being answered from cache
+
+        Returns:
+            A response carrying the cached body and headers
+        """
+        response = requests.Response()
+        response.status_code = 200
+        response.raw = io.BytesIO(entry["body"].encode("utf-8"))
+        response.encoding = "utf-8"
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.url = original.url
+        response.request = original.request
+        return response
+
+    def stats(self) -> Dict[str, int]:
+        """Report cache statistics.
+
+        Returns:
+            Dict with hits, misses, evictions, entries and cached bytes
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._size,
+            }
+
+
+class _GitHubAPIBase:
+    """State and helpers shared by the sync and async GitHub clients."""
+
+    def __init__(
+        self,
+        token: str,
+        repo: str,
+        scheduler: Optional[RateLimitScheduler] = None,
+        cache: Optional[ResponseCache] = None,
+    ):
+        """Initialize shared client state.
 
         Args:
             token: GitHub token (PAT or classic)
             repo: Repository in format 'owner/repo'
+            scheduler: Rate limit scheduler, shared between clients to pace
+                them together; a new one is created when omitted
+            cache: Conditional-request cache for GET requests, if any
         """
         self.token = token
         self.repo = repo
         self.base_url = "https://api.github.com"
+        self.requests_sent = 0
+        self.scheduler = scheduler or RateLimitScheduler()
+        self.cache = cache
 
         # Set appropriate auth header based on token type
         if token.startswith("github_pat_"):
@@ -52,15 +519,246 @@ class GitHubAPI:
                 "Content-Type": "application/json",
             }
 
+    def _url(self, path: str) -> str:
+        """Resolve an API path, passing absolute URLs through unchanged.
+
+        Args:
+            path: API path relative to the base URL, or an absolute URL
+
+        Returns:
+            Absolute request URL
+        """
+        return path if path.startswith("http") else f"{self.base_url}{path}"
+
+    def _cache_lookup(
+        self, method: str, url: str, kwargs: Dict[str, Any]
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """Find a cached entry for a GET and add its validators to kwargs.
+
+        Args:
+            method: HTTP method
+            url: Absolute request URL
+            kwargs: Request keyword arguments, updated in place
+
+        Returns:
+            Tuple of cache key (None when not cacheable) and cached entry
+        """
+        if method != "GET" or self.cache is None:
+            return None, None
+
+        key = self.cache.key(url, kwargs.get("params"), self.token)
+        entry = self.cache.get(key)
+        if entry is not None:
+            kwargs["headers"] = {
+                **kwargs.get("headers", {}),
+                **self.cache.validators(entry),
+            }
+        return key, entry
+
+    def _rate_limit_delay(
+        self, attempt: int, path: str, status: int, headers: Any, body: str
+    ) -> Optional[float]:
+        """Decide whether a response needs a rate-limit retry.
+
+        Args:
+            attempt: Zero-based attempt number of the request
+            path: API path or absolute URL of the request
+            status: HTTP status code
+            headers: Response headers
+            body: Response text
+
+        Returns:
+            Seconds to wait before retrying, or None if not rate limited
+
+        Raises:
+            RateLimitError: If retries are exhausted or the wait is too long
+        """
+        wait = self.scheduler.record_response(path, status, headers, body)
+        if wait is None:
+            return None
+        if (
+            attempt >= self.scheduler.max_retries
+            or wait > self.scheduler.max_wait
+        ):
+            raise RateLimitError(
+                f"GitHub rate limit hit for {path} (retry in {wait:.0f}s)",
+                retry_after=wait,
+            )
+        return wait
+
+
+class GitHubAPI(_GitHubAPIBase):
+    """GitHub API client for issue management operations.
+
+    All requests go through a single pooled ``requests.Session`` so that
+    every manager sharing this client reuses the same keep-alive
+    connections instead of paying a TCP+TLS handshake per call.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        repo: str,
+        pool_size: int = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        scheduler: Optional[RateLimitScheduler] = None,
+        cache: Optional[ResponseCache] = None,
+    ):
+        """Initialize GitHub API client.
+
+        Args:
+            token: GitHub token (PAT or classic)
+            repo: Repository in format 'owner/repo'
+            pool_size: Maximum number of pooled connections kept alive
+            max_retries: Retries for connection errors and retryable statuses
+            backoff_factor: Exponential backoff factor between retries
+            scheduler: Rate limit scheduler shared with other clients
+            cache: Conditional-request cache for GET requests, if any
+        """
+        super().__init__(token, repo, scheduler, cache)
+        self._stats_lock = threading.Lock()
+
+        self.session = self._build_session(
+            pool_size, max_retries, backoff_factor
+        )
+
+    def _build_session(
+        self, pool_size: int, max_retries: int, backoff_factor: float
+    ) -> requests.Session:
+        """Build the pooled HTTP session used for all API calls.
+
+        Args:
+            pool_size: Maximum number of pooled connections kept alive
+            max_retries: Retries for connection errors and retryable statuses
+            backoff_factor: Exponential backoff factor between retries
+
+        Returns:
+            Configured requests session
+        """
+        # POST is not idempotent (issue creation), so only connection
+        # errors are retried for it; status retries apply to the rest.
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(
+                {"GET", "HEAD", "PATCH", "PUT", "DELETE"}
+            ),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry,
+        )
+
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update(self.headers)
+        session.headers.update(
+            {"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+        )
+        return session
+
+    def _request(
+        self, method: str, path: str, weight: int = 1, **kwargs
+    ) -> requests.Response:
+        """Send a paced request through the pooled session.
+
+        Args:
+            method: HTTP method
+            path: API path relative to the base URL, or an absolute URL
+            weight: Content-creating operations the request carries
+            **kwargs: Extra arguments passed to ``requests.Session.request``
+
+        Returns:
+            The HTTP response
+
+        Raises:
+            RateLimitError: If GitHub keeps rate limiting the request
+        """
+        kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+        url = self._url(path)
+        cache_key, cached = self._cache_lookup(method, url, kwargs)
+        attempt = 0
+        while True:
+            delay = self.scheduler.acquire(method, path, weight)
+            if delay > 0:
+                time.sleep(delay)
+
+            with self._stats_lock:
+                self.requests_sent += 1
+            response = self.session.request(method, url, **kwargs)
+
+            body = response.text if response.status_code in (403, 429) else ""
+            wait = self._rate_limit_delay(
+                attempt, path, response.status_code, response.headers, body
+            )
+            if wait is None:
+                break
+            time.sleep(wait)
+            attempt += 1
+
+        if cache_key is not None:
+            if response.status_code == 304 and cached is not None:
+                self.cache.mark_hit(cache_key)
+                return self.cache.to_response(cached, response)
+            if response.status_code == 200:
+                self.cache.store(cache_key, response.headers, response.text)
+        return response
+
+    def connection_stats(self) -> Dict[str, int]:
+        """Report request and connection reuse counters.
+
+        Returns:
+            Dict with requests sent, connections opened and reused, and the
+            time spent throttled by the rate limit scheduler
+        """
+        opened = 0
+        pool_requests = 0
+        for adapter in self.session.adapters.values():
+            pools = getattr(adapter, "poolmanager", None)
+            if pools is None:
+                continue
+            for key in list(pools.pools.keys()):
+                pool = pools.pools.get(key)
+                if pool is None:
+                    continue
+                opened += pool.num_connections
+                pool_requests += pool.num_requests
+
+        return {
+            "requests_sent": self.requests_sent,
+            "connections_opened": opened,
+            "connections_reused": max(pool_requests - opened, 0),
+            "throttled_seconds": round(self.scheduler.throttled_seconds, 1),
+            "rate_limited_responses": self.scheduler.rate_limited_responses,
+        }
+
+    def close(self) -> None:
+        """Close the pooled session and persist the response cache."""
+        self.session.close()
+        if self.cache is not None:
+            self.cache.save()
+
+    def __enter__(self) -> "GitHubAPI":
+        """Enter a context that closes the session on exit."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the session when leaving the context."""
+        self.close()
+
     def test_access(self) -> bool:
         """Test API access with current token."""
         try:
-            response = requests.get(
-                f"{self.base_url}/repos/{self.repo}",
-                headers=self.headers,
-                timeout=10,
-            )
+            response = self._request("GET", f"/repos/{self.repo}")
             return response.status_code == 200
+        except RateLimitError:
+            raise
         except Exception:
             return False
 
@@ -80,14 +778,13 @@ class GitHubAPI:
         try:
             data = {"title": title, "body": body, "labels": labels or []}
 
-            response = requests.post(
-                f"{self.base_url}/repos/{self.repo}/issues",
-                headers=self.headers,
-                json=data,
-                timeout=10,
+            response = self._request(
+                "POST", f"/repos/{self.repo}/issues", json=data
             )
             response.raise_for_status()
             return response.json()
+        except RateLimitError:
+            raise
         except Exception:
             return None
 
@@ -101,16 +798,32 @@ class GitHubAPI:
             List of issue data dicts
         """
         try:
-            response = requests.get(
-                f"{self.base_url}/search/issues?q={query}+repo:{self.repo}",
-                headers=self.headers,
-                timeout=10,
-            )
-            response.raise_for_status()
-            return response.json().get("items", [])
+            return list(self.iter_search_issues(query))
+        except RateLimitError:
+            raise
         except Exception:
             return []
 
+    def iter_search_issues(self, query: str) -> Iterator[Dict]:
+        """Stream every search result for the repository, page by page.
+
+        The search API stops paginating after 1000 results.
+
+        Args:
+            query: Search query
+
+        Yields:
+            Issue data dicts as each page arrives
+
+        Raises:
+            requests.RequestException: If a page cannot be fetched
+        """
+        yield from self._paginate(
+            "/search/issues",
+            {"q": f"{query} repo:{self.repo}"},
+            items_key="items",
+        )
+
     def close_issue(self, issue_number: int, reason: str = "completed") -> bool:
         """Close an issue.
 
@@ -122,15 +835,14 @@ class GitHubAPI:
             True if successful
         """
         try:
-            data = {"state": "closed"}
-            response = requests.patch(
-                f"{self.base_url}/repos/{self.repo}/issues/{issue_number}",
-                headers=self.headers,
-                json=data,
-                timeout=10,
+            data = {"state": "closed", "state_reason": reason}
+            response = self._request(
+                "PATCH", f"/repos/{self.repo}/issues/{issue_number}", json=data
             )
             response.raise_for_status()
             return True
+        except RateLimitError:
+            raise
         except Exception:
             return False
 
@@ -146,48 +858,1168 @@ class GitHubAPI:
         """
         try:
             data = {"body": comment}
-            response = requests.post(
-                f"{self.base_url}/repos/{self.repo}/issues/{issue_number}/comments",
-                headers=self.headers,
+            response = self._request(
+                "POST",
+                f"/repos/{self.repo}/issues/{issue_number}/comments",
                 json=data,
-                timeout=10,
             )
             response.raise_for_status()
             return True
+        except RateLimitError:
+            raise
         except Exception:
             return False
 
-    def get_all_issues(self, state: str = "open") -> List[Dict]:
-        """Get all issues in the repository.
+    def graphql(
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]] = None,
+        weight: int = 1,
+    ) -> Dict[str, Any]:
+        """Run a GraphQL query or mutation document.
+
+        Args:
+            query: GraphQL document
+            variables: Variables referenced by the document
+            weight: Number of mutations in the document, for pacing
+
+        Returns:
+            The decoded payload with ``data`` and optional ``errors``
+
+        Raises:
+            RateLimitError: If GitHub rate limits the request
+            requests.RequestException: If the request fails
+        """
+        response = self._request(
+            "POST",
+            "/graphql",
+            weight=weight,
+            json={"query": query, "variables": variables or {}},
+        )
+        response.raise_for_status()
+        payload = response.json()
+        for error in payload.get("errors") or []:
+            if error.get("type") == "RATE_LIMITED":
+                raise RateLimitError(error.get("message", "GraphQL rate limit"))
+        return payload
+
+    def get_all_issues(self, state: str = "open") -> List[Dict]:
+        """Get all issues in the repository.
+
+        Args:
+            state: Issue state (open, closed, all)
+
+        Returns:
+            List of issue data dicts
+        """
+        try:
+            return list(self.iter_issues(state))
+        except RateLimitError:
+            raise
+        except Exception:
+            return []
+
+    def iter_issues(self, state: str = "open") -> Iterator[Dict]:
+        """Stream every issue in the repository, page by page.
+
+        Pull requests returned by the issues endpoint are skipped.
+
+        Args:
+            state: Issue state (open, closed, all)
+
+        Yields:
+            Issue data dicts as each page arrives
+
+        Raises:
+            requests.RequestException: If a page cannot be fetched
+        """
+        for issue in self._paginate(
+            f"/repos/{self.repo}/issues", {"state": state}
+        ):
+            if "pull_request" not in issue:
+                yield issue
+
+    def _paginate(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        items_key: Optional[str] = None,
+    ) -> Iterator[Dict]:
+        """Follow ``Link: rel="next"`` headers and yield every item.
+
+        Args:
+            path: API path of the first page
+            params: Query parameters for the first page
+            items_key: Key holding the item list, or None for list responses
+
+        Yields:
+            Items from each page in order
+
+        Raises:
+            requests.RequestException: If a page cannot be fetched
+        """
+        url: Optional[str] = path
+        page_params: Optional[Dict[str, Any]] = {
+            "per_page": PER_PAGE,
+            **params,
+        }
+        while url:
+            response = self._request("GET", url, params=page_params)
+            response.raise_for_status()
+            data = response.json()
+            yield from data.get(items_key, []) if items_key else data
+
+            # The next link already carries the full query string
+            url = response.links.get("next", {}).get("url")
+            page_params = None
+
+
+class AsyncGitHubAPI(_GitHubAPIBase):
+    """asyncio GitHub API client with the same surface as GitHubAPI.
+
+    Built on aiohttp. Every request acquires a shared semaphore, so callers
+    can ``asyncio.gather`` hundreds of operations while at most
+    ``max_concurrency`` are in flight at once.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        repo: str,
+        max_concurrency: int = 20,
+        pool_size: int = 100,
+        scheduler: Optional[RateLimitScheduler] = None,
+        cache: Optional[ResponseCache] = None,
+    ):
+        """Initialize async GitHub API client.
+
+        Args:
+            token: GitHub token (PAT or classic)
+            repo: Repository in format 'owner/repo'
+            max_concurrency: Maximum number of requests in flight at once
+            pool_size: Maximum number of pooled connections kept alive
+            scheduler: Rate limit scheduler shared with other clients
+            cache: Conditional-request cache for GET requests, if any
+        """
+        super().__init__(token, repo, scheduler, cache)
+        self.max_concurrency = max_concurrency
+        self.pool_size = pool_size
+        self._session = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_session(self):
+        """Create the aiohttp session on first use inside the event loop.
+
+        Returns:
+            The shared aiohttp client session
+
+        Raises:
+            RuntimeError: If aiohttp is not installed
+        """
+        if self._session is None:
+            if aiohttp is None:
+                raise RuntimeError(
+                    "AsyncGitHubAPI requires aiohttp: pip install aiohttp"
+                )
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+            )
+        return self._session
+
+    async def _request_json(
+        self, method: str, path: str, **kwargs
+    ) -> Tuple[int, Any, Optional[str]]:
+        """Send a request under the concurrency semaphore.
+
+        Args:
+            method: HTTP method
+            path: API path relative to the base URL, or an absolute URL
+            **kwargs: Extra arguments passed to ``ClientSession.request``
+
+        Returns:
+            Tuple of status code, decoded JSON body and next page URL
+
+        Raises:
+            aiohttp.ClientError: On transport errors or error statuses
+            RateLimitError: If GitHub keeps rate limiting the request
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        session = self._get_session()
+        url = self._url(path)
+        cache_key, cached = self._cache_lookup(method, url, kwargs)
+        attempt = 0
+        while True:
+            delay = self.scheduler.acquire(method, path)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            async with self._semaphore:
+                self.requests_sent += 1
+                async with session.request(method, url, **kwargs) as response:
+                    body = ""
+                    if response.status in (403, 429):
+                        body = await response.text()
+                    wait = self._rate_limit_delay(
+                        attempt, path, response.status, response.headers, body
+                    )
+                    if wait is None:
+                        return await self._read_response(
+                            response, cache_key, cached
+                        )
+
+            await asyncio.sleep(wait)
+            attempt += 1
+
+    async def _read_response(
+        self,
+        response: Any,
+        cache_key: Optional[str],
+        cached: Optional[Dict[str, Any]],
+    ) -> Tuple[int, Any, Optional[str]]:
+        """Decode a response, answering 304s from the cache.
+
+        Args:
+            response: aiohttp response
+            cache_key: Cache key for cacheable GETs, else None
+            cached: Cached entry sent for revalidation, if any
+
+        Returns:
+            Tuple of status code, decoded JSON body and next page URL
+        """
+        if cache_key is not None and response.status == 304 and cached:
+            self.cache.mark_hit(cache_key)
+            links = requests.utils.parse_header_links(
+                cached["headers"].get("Link", "")
+            )
+            next_url = next(
+                (link["url"] for link in links if link.get("rel") == "next"),
+                None,
+            )
+            return 200, json.loads(cached["body"]), next_url
+
+        response.raise_for_status()
+        data = None
+        if response.status != 204:
+            text = await response.text()
+            data = json.loads(text) if text else None
+            if cache_key is not None and response.status == 200:
+                self.cache.store(cache_key, response.headers, text)
+        next_link = response.links.get("next")
+        next_url = str(next_link["url"]) if next_link else None
+        return response.status, data, next_url
+
+    async def close(self) -> None:
+        """Close the aiohttp session and persist the response cache."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self.cache is not None:
+            self.cache.save()
+
+    async def __aenter__(self) -> "AsyncGitHubAPI":
+        """Enter a context that closes the session on exit."""
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        """Close the session when leaving the context."""
+        await self.close()
+
+    async def test_access(self) -> bool:
+        """Test API access with current token."""
+        try:
+            status, _, _ = await self._request_json(
+                "GET", f"/repos/{self.repo}"
+            )
+            return status == 200
+        except RateLimitError:
+            raise
+        except Exception:
+            return False
+
+    async def create_issue(
+        self, title: str, body: str, labels: Optional[List[str]] = None
+    ) -> Optional[Dict]:
+        """Create a new GitHub issue.
+
+        Args:
+            title: Issue title
+            body: Issue body
+            labels: List of labels to add
+
+        Returns:
+            Issue data dict or None if failed
+        """
+        try:
+            data = {"title": title, "body": body, "labels": labels or []}
+            _, issue, _ = await self._request_json(
+                "POST", f"/repos/{self.repo}/issues", json=data
+            )
+            return issue
+        except RateLimitError:
+            raise
+        except Exception:
+            return None
+
+    async def search_issues(self, query: str) -> List[Dict]:
+        """Search for issues in the repository.
+
+        Args:
+            query: Search query
+
+        Returns:
+            List of issue data dicts
+        """
+        try:
+            return [issue async for issue in self.iter_search_issues(query)]
+        except RateLimitError:
+            raise
+        except Exception:
+            return []
+
+    def iter_search_issues(self, query: str) -> AsyncIterator[Dict]:
+        """Stream every search result for the repository, page by page.
+
+        Args:
+            query: Search query
+
+        Returns:
+            Async iterator of issue data dicts
+        """
+        return self._paginate(
+            "/search/issues",
+            {"q": f"{query} repo:{self.repo}"},
+            items_key="items",
+        )
+
+    async def close_issue(
+        self, issue_number: int, reason: str = "completed"
+    ) -> bool:
+        """Close an issue.
+
+        Args:
+            issue_number: Issue number to close
+            reason: Reason for closing
+
+        Returns:
+            True if successful
+        """
+        try:
+            await self._request_json(
+                "PATCH",
+                f"/repos/{self.repo}/issues/{issue_number}",
+                json={"state": "closed", "state_reason": reason},
+            )
+            return True
+        except RateLimitError:
+            raise
+        except Exception:
+            return False
+
+    async def add_comment(self, issue_number: int, comment: str) -> bool:
+        """Add a comment to an issue.
+
+        Args:
+            issue_number: Issue number
+            comment: Comment text
+
+        Returns:
+            True if successful
+        """
+        try:
+            await self._request_json(
+                "POST",
+                f"/repos/{self.repo}/issues/{issue_number}/comments",
+                json={"body": comment},
+            )
+            return True
+        except RateLimitError:
+            raise
+        except Exception:
+            return False
+
+    async def get_all_issues(self, state: str = "open") -> List[Dict]:
+        """Get all issues in the repository.
+
+        Args:
+            state: Issue state (open, closed, all)
+
+        Returns:
+            List of issue data dicts
+        """
+        try:
+            return [issue async for issue in self.iter_issues(state)]
+        except RateLimitError:
+            raise
+        except Exception:
+            return []
+
+    async def iter_issues(self, state: str = "open") -> AsyncIterator[Dict]:
+        """Stream every issue in the repository, page by page.
+
+        Pull requests returned by the issues endpoint are skipped.
+
+        Args:
+            state: Issue state (open, closed, all)
+
+        Yields:
+            Issue data dicts as each page arrives
+        """
+        async for issue in self._paginate(
+            f"/repos/{self.repo}/issues", {"state": state}
+        ):
+            if "pull_request" not in issue:
+                yield issue
+
+    async def _paginate(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        items_key: Optional[str] = None,
+    ) -> AsyncIterator[Dict]:
+        """Follow ``Link: rel="next"`` headers and yield every item.
+
+        Args:
+            path: API path of the first page
+            params: Query parameters for the first page
+            items_key: Key holding the item list, or None for list responses
+
+        Yields:
+            Items from each page in order
+        """
+        url: Optional[str] = path
+        page_params: Optional[Dict[str, Any]] = {
+            "per_page": PER_PAGE,
+            **params,
+        }
+        while url:
+            _, data, url = await self._request_json(
+                "GET", url, params=page_params
+            )
+            for item in data.get(items_key, []) if items_key else data:
+                yield item
+            page_params = None
+
+
+def normalize_title(title: str) -> str:
+    """Normalize an issue title for fuzzy existence checks.
+
+    Args:
+        title: Issue title
+
+    Returns:
+        Lowercased title with punctuation and repeated whitespace collapsed
+    """
+    return " ".join(re.sub(r"[^\w]+", " ", title.lower()).split())
+
+
+class IssueIndex:
+    """In-memory index of repository issues for O(1) existence checks.
+
+    Built once per run from the paginated issue listing and kept current
+    as issues are created or closed, so managers no longer spend a search
+    API call (capped at 30/min) on every "does this already exist" check.
+    Issues are indexed by exact title, normalized title, label and the
+    ``<!-- copilot-data: id -->`` marker embedded in their body.
+    """
+
+    def __init__(self, api: GitHubAPI, state: str = "all"):
+        """Initialize an empty index; it loads on first use.
+
+        Args:
+            api: GitHub API client used to list issues
+            state: Issue state to index (open, closed, all)
+        """
+        self.api = api
+        self.state = state
+        self._loaded = False
+        self._issues: Dict[int, Dict[str, Any]] = {}
+        self._by_title: Dict[str, Set[int]] = {}
+        self._by_normalized: Dict[str, Set[int]] = {}
+        self._by_label: Dict[str, Set[int]] = {}
+        self._by_copilot_id: Dict[str, Set[int]] = {}
+        self._lock = threading.RLock()
+
+    def ensure_loaded(self) -> "IssueIndex":
+        """Load every issue from the API once.
+
+        Returns:
+            The index itself, for chaining
+        """
+        with self._lock:
+            if not self._loaded:
+                for issue in self.api.iter_issues(self.state):
+                    self.add(issue)
+                self._loaded = True
+        return self
+
+    def add(self, issue: Dict[str, Any]) -> None:
+        """Add or refresh an issue in every lookup table.
+
+        Args:
+            issue: Issue data dict
+        """
+        number = issue.get("number")
+        if number is None:
+            return
+
+        with self._lock:
+            self.remove(number)
+            self._issues[number] = issue
+            title = issue.get("title", "")
+            self._by_title.setdefault(title, set()).add(number)
+            self._by_normalized.setdefault(normalize_title(title), set()).add(
+                number
+            )
+            for label in issue.get("labels", []):
+                name = label.get("name") if isinstance(label, dict) else label
+                self._by_label.setdefault(name, set()).add(number)
+            for copilot_id in COPILOT_MARKER_RE.findall(
+                issue.get("body") or ""
+            ):
+                self._by_copilot_id.setdefault(copilot_id, set()).add(number)
+
+    def remove(self, number: int) -> None:
+        """Drop an issue from every lookup table.
+
+        Args:
+            number: Issue number
+        """
+        with self._lock:
+            if self._issues.pop(number, None) is None:
+                return
+            for table in (
+                self._by_title,
+                self._by_normalized,
+                self._by_label,
+                self._by_copilot_id,
+            ):
+                for key in [
+                    k for k, numbers in table.items() if number in numbers
+                ]:
+                    table[key].discard(number)
+                    if not table[key]:
+                        del table[key]
+
+    def mark_closed(self, number: int) -> None:
+        """Record that an issue was closed.
+
+        Args:
+            number: Issue number
+        """
+        self.ensure_loaded()
+        with self._lock:
+            issue = self._issues.get(number)
+            if issue is not None:
+                issue["state"] = "closed"
+
+    def find_by_title(
+        self,
+        title: str,
+        normalized: bool = False,
+        state: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Find issues by title.
+
+        Args:
+            title: Issue title
+            normalized: Match on the normalized title instead of exactly
+            state: Only return issues in this state (open, closed)
+
+        Returns:
+            Matching issues ordered by number
+        """
+        if normalized:
+            return self._lookup(
+                self._by_normalized, normalize_title(title), state
+            )
+        return self._lookup(self._by_title, title, state)
+
+    def find_by_label(
+        self, label: str, state: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Find issues carrying a label.
+
+        Args:
+            label: Label name
+            state: Only return issues in this state (open, closed)
+
+        Returns:
+            Matching issues ordered by number
+        """
+        return self._lookup(self._by_label, label, state)
+
+    def find_by_copilot_id(self, copilot_id: Any) -> List[Dict[str, Any]]:
+        """Find issues whose body embeds a copilot-data marker.
+
+        Args:
+            copilot_id: Copilot comment id from the marker
+
+        Returns:
+            Matching issues ordered by number
+        """
+        return self._lookup(self._by_copilot_id, str(copilot_id), None)
+
+    def _lookup(
+        self, table: Dict[str, Set[int]], key: str, state: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """Resolve a lookup table entry to issues.
+
+        Args:
+            table: Lookup table to read
+            key: Table key
+            state: Only return issues in this state, if given
+
+        Returns:
+            Matching issues ordered by number
+        """
+        self.ensure_loaded()
+        with self._lock:
+            issues = [self._issues[n] for n in sorted(table.get(key, ()))]
+        if state is None:
+            return issues
+        return [issue for issue in issues if issue.get("state") == state]
+
+    def __len__(self) -> int:
+        """Number of indexed issues."""
+        with self._lock:
+            return len(self._issues)
+
+
+def issue_shingles(issue: Dict[str, Any]) -> Set[str]:
+    """Build the shingle set used to compare issues.
+
+    Titles contribute character trigrams, which tolerate typos and small
+    rewordings; bodies contribute word bigrams of their leading
+    ``MINHASH_BODY_CHARS`` characters.
+
+    Args:
+        issue: Issue data dict
+
+    Returns:
+        Set of title and body shingles
+    """
+    title = normalize_title(issue.get("title") or "")
+    shingles = {f"t:{title[i : i + 3]}" for i in range(max(1, len(title) - 2))}
+    words = normalize_title((issue.get("body") or "")[:MINHASH_BODY_CHARS])
+    words = words.split()
+    shingles.update(
+        f"b:{first} {second}" for first, second in zip(words, words[1:])
+    )
+    return shingles
+
+
+class MinHashLSH:
+    """MinHash signatures with a banded locality-sensitive hashing index.
+
+    Each item is reduced to a fixed-length MinHash signature whose
+    per-position agreement estimates the Jaccard similarity of the
+    shingle sets. Signatures are split into bands; items sharing any
+    band bucket become candidate pairs, so near-duplicates are found
+    without comparing every pair. The band/row split is chosen so the
+    LSH collision curve turns at ``threshold``.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        num_perm: int = MINHASH_PERMUTATIONS,
+        seed: int = 1,
+    ):
+        """Initialize the index.
+
+        Args:
+            threshold: Estimated Jaccard similarity for a candidate pair
+                to count as a near-duplicate (0-1)
+            num_perm: Maximum signature length
+            seed: Seed for the hash function coefficients
+
+        Raises:
+            ValueError: If threshold is outside (0, 1]
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.bands, self.rows = self._band_layout(threshold, num_perm)
+        self.num_perm = self.bands * self.rows
+        rng = random.Random(seed)
+        self._a = rng.randrange(1, MINHASH_PRIME)
+        self._b = rng.randrange(MINHASH_PRIME)
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[Any]] = {}
+        self._signatures: Dict[Any, Tuple[int, ...]] = {}
+
+    @staticmethod
+    def _band_layout(threshold: float, num_perm: int) -> Tuple[int, int]:
+        """Pick bands and rows whose threshold (1/b)^(1/r) is closest.
+
+        Args:
+            threshold: Target similarity threshold
+            num_perm: Maximum signature length
+
+        Returns:
+            Tuple of (bands, rows)
+        """
+        return min(
+            ((num_perm // rows, rows) for rows in range(1, num_perm + 1)),
+            key=lambda layout: abs(
+                (1 / layout[0]) ** (1 / layout[1]) - threshold
+            ),
+        )
+
+    def signature(self, shingles: Iterable[str]) -> Tuple[int, ...]:
+        """Compute the MinHash signature of a shingle set.
+
+        Uses one-permutation hashing: each shingle is hashed once and the
+        hash picks a bin and a value, keeping the minimum per bin, so the
+        cost is linear in the shingles rather than shingles x signature
+        length. Empty bins borrow the next non-empty bin's value
+        (rotation densification), offset by the distance so borrowed
+        values only agree when the same bin was borrowed.
+
+        Args:
+            shingles: Shingles of one item
+
+        Returns:
+            Signature of ``num_perm`` minimum hash values
+        """
+        bins = self.num_perm
+        mins: List[Optional[int]] = [None] * bins
+        for shingle in shingles:
+            crc = zlib.crc32(shingle.encode("utf-8"))
+            value = (self._a * crc + self._b) % MINHASH_PRIME
+            slot, value = value % bins, value // bins
+            if mins[slot] is None or value < mins[slot]:
+                mins[slot] = value
+        if all(value is None for value in mins):
+            return (0,) * bins
+
+        signature = []
+        for i, value in enumerate(mins):
+            distance = 0
+            while value is None:
+                distance += 1
+                value = mins[(i + distance) % bins]
+            signature.append(value + distance * MINHASH_PRIME)
+        return tuple(signature)
+
+    def add(self, key: Any, shingles: Iterable[str]) -> None:
+        """Index an item.
+
+        Args:
+            key: Hashable item identifier
+            shingles: Shingles of the item
+        """
+        signature = self.signature(shingles)
+        self._signatures[key] = signature
+        for band in range(self.bands):
+            start = band * self.rows
+            bucket = (band, signature[start : start + self.rows])
+            self._buckets.setdefault(bucket, []).append(key)
+
+    def similarity(self, first: Any, second: Any) -> float:
+        """Estimate the Jaccard similarity of two indexed items.
+
+        Args:
+            first: Key of the first item
+            second: Key of the second item
+
+        Returns:
+            Fraction of agreeing signature positions
+        """
+        a = self._signatures[first]
+        b = self._signatures[second]
+        return sum(1 for x, y in zip(a, b) if x == y) / self.num_perm
+
+    def candidate_pairs(self) -> Set[Tuple[Any, Any]]:
+        """Collect pairs of items sharing at least one band bucket.
+
+        Returns:
+            Set of (key, key) pairs in insertion order
+        """
+        order = {key: i for i, key in enumerate(self._signatures)}
+        pairs = set()
+        for keys in self._buckets.values():
+            for i, first in enumerate(keys):
+                for second in keys[i + 1 :]:
+                    if first != second:
+                        pair = sorted((first, second), key=order.__getitem__)
+                        pairs.add(tuple(pair))
+        return pairs
+
+    def near_duplicate_pairs(self) -> List[Tuple[Any, Any, float]]:
+        """Verify candidate pairs against the threshold.
+
+        Returns:
+            List of (key, key, estimated similarity) at or above threshold
+        """
+        scored = (
+            (first, second, self.similarity(first, second))
+            for first, second in self.candidate_pairs()
+        )
+        return [pair for pair in scored if pair[2] >= self.threshold]
+
+
+# GraphQL input type and selection for each supported mutation
+GRAPHQL_MUTATIONS = {
+    "closeIssue": ("CloseIssueInput", "issue { number }"),
+    "addComment": ("AddCommentInput", "clientMutationId"),
+    "createIssue": ("CreateIssueInput", "issue { number title url }"),
+}
+
+# REST close reasons mapped to IssueClosedStateReason values
+GRAPHQL_STATE_REASONS = {
+    "completed": "COMPLETED",
+    "not_planned": "NOT_PLANNED",
+    "duplicate": "DUPLICATE",
+}
+
+
+class GraphQLBatcher:
+    """Packs issue mutations into aliased GraphQL documents.
+
+    Each batch sends up to ``batch_size`` ``closeIssue``/``addComment``/
+    ``createIssue`` mutations in one request, and the per-alias ``data``
+    and ``errors`` entries are mapped back to a result per mutation.
+    Mutations GraphQL cannot run (a failed batch, or an item without a
+    node id) fall back to the REST methods of GitHubAPI.
+    """
+
+    def __init__(
+        self, api: GitHubAPI, batch_size: int = 50, rest_fallback: bool = True
+    ):
+        """Initialize the batcher.
+
+        Args:
+            api: GitHub API client
+            batch_size: Maximum mutations per GraphQL request
+            rest_fallback: Retry mutations GraphQL could not run over REST
+        """
+        self.api = api
+        self.batch_size = max(1, batch_size)
+        self.rest_fallback = rest_fallback
+        self._repository: Optional[Dict[str, Any]] = None
+
+    def close_issues(
+        self, issues: List[Dict[str, Any]], reason: str = "completed"
+    ) -> List[Dict[str, Any]]:
+        """Close many issues.
+
+        Args:
+            issues: Issue data dicts (with ``number`` and ``node_id``)
+            reason: REST close reason (completed, not_planned, duplicate)
+
+        Returns:
+            One result dict per issue
+        """
+        return self.run(
+            [self.close_mutation(issue, reason) for issue in issues]
+        )
+
+    def add_comments(
+        self, comments: List[Tuple[Dict[str, Any], str]]
+    ) -> List[Dict[str, Any]]:
+        """Comment on many issues.
+
+        Args:
+            comments: (issue data dict, comment body) pairs
+
+        Returns:
+            One result dict per comment
+        """
+        return self.run(
+            [self.comment_mutation(issue, body) for issue, body in comments]
+        )
+
+    def create_issues(
+        self, issues: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Create many issues.
+
+        Args:
+            issues: Dicts with ``title`` and optional ``body`` and ``labels``
+
+        Returns:
+            One result dict per issue, with the created issue as ``data``
+        """
+        return self.run([self.create_mutation(issue) for issue in issues])
+
+    def close_mutation(
+        self, issue: Dict[str, Any], reason: str = "completed"
+    ) -> Dict[str, Any]:
+        """Describe a closeIssue mutation.
+
+        Args:
+            issue: Issue data dict
+            reason: REST close reason
+
+        Returns:
+            Mutation description for run()
+        """
+        number = issue.get("number")
+        return {
+            "key": f"close #{number}",
+            "name": "closeIssue",
+            "input": {
+                "issueId": issue["node_id"],
+                "stateReason": GRAPHQL_STATE_REASONS.get(reason, "COMPLETED"),
+            }
+            if issue.get("node_id")
+            else None,
+            "fallback": lambda: self.api.close_issue(number, reason),
+        }
+
+    def comment_mutation(
+        self, issue: Dict[str, Any], body: str
+    ) -> Dict[str, Any]:
+        """Describe an addComment mutation.
+
+        Args:
+            issue: Issue data dict
+            body: Comment text
+
+        Returns:
+            Mutation description for run()
+        """
+        number = issue.get("number")
+        return {
+            "key": f"comment #{number}",
+            "name": "addComment",
+            "input": {"subjectId": issue["node_id"], "body": body}
+            if issue.get("node_id")
+            else None,
+            "fallback": lambda: self.api.add_comment(number, body),
+        }
+
+    def create_mutation(self, issue: Dict[str, Any]) -> Dict[str, Any]:
+        """Describe a createIssue mutation.
+
+        Labels are resolved to node ids; an unknown label sends the
+        mutation down the REST path, which creates labels as needed.
+
+        Args:
+            issue: Dict with ``title`` and optional ``body`` and ``labels``
+
+        Returns:
+            Mutation description for run()
+        """
+        title = issue["title"]
+        body = issue.get("body", "")
+        labels = issue.get("labels") or []
+        mutation_input = None
+
+        repository = self._repository_ids()
+        label_ids = [repository["labels"].get(name) for name in labels]
+        if repository["id"] and all(label_ids):
+            mutation_input = {
+                "repositoryId": repository["id"],
+                "title": title,
+                "body": body,
+                "labelIds": label_ids,
+            }
+
+        return {
+            "key": f"create {title}",
+            "name": "createIssue",
+            "input": mutation_input,
+            "fallback": lambda: self.api.create_issue(title, body, labels),
+        }
+
+    def _repository_ids(self) -> Dict[str, Any]:
+        """Fetch (once) the repository node id and its label node ids.
+
+        Returns:
+            Dict with ``id`` (None if unavailable) and ``labels`` by name
+        """
+        if self._repository is None:
+            owner, _, name = self.api.repo.partition("/")
+            query = (
+                "query($owner: String!, $name: String!) {"
+                " repository(owner: $owner, name: $name) {"
+                " id labels(first: 100) { nodes { id name } } } }"
+            )
+            try:
+                payload = self.api.graphql(
+                    query, {"owner": owner, "name": name}
+                )
+                repository = (payload.get("data") or {}).get("repository") or {}
+            except RateLimitError:
+                raise
+            except Exception:
+                repository = {}
+            nodes = (repository.get("labels") or {}).get("nodes") or []
+            self._repository = {
+                "id": repository.get("id"),
+                "labels": {node["name"]: node["id"] for node in nodes},
+            }
+        return self._repository
+
+    def run(self, mutations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Execute mutations in batches, in order.
+
+        Args:
+            mutations: Mutation descriptions built by the ``*_mutation``
+                helpers
+
+        Returns:
+            One result dict per mutation with ``key``, ``operation``,
+            ``success``, ``via`` and ``data`` or ``error``
+        """
+        results: List[Dict[str, Any]] = []
+        for start in range(0, len(mutations), self.batch_size):
+            results.extend(
+                self._run_batch(mutations[start : start + self.batch_size])
+            )
+        return results
+
+    def _run_batch(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send one aliased mutation document and map the results back.
+
+        Args:
+            batch: Mutation descriptions
+
+        Returns:
+            One result dict per mutation
+        """
+        sendable = [m for m in batch if m["input"]]
+        payload: Dict[str, Any] = {}
+        batch_error = None
+        if sendable:
+            query, variables = self._build_document(sendable)
+            try:
+                payload = self.api.graphql(
+                    query, variables, weight=len(sendable)
+                )
+            except RateLimitError:
+                raise
+            except Exception as e:
+                batch_error = str(e)
+
+        data = payload.get("data") or {}
+        errors: Dict[str, str] = {}
+        for error in payload.get("errors") or []:
+            alias = (error.get("path") or [None])[0]
+            errors[alias] = error.get("message", "unknown error")
+        if not data and payload.get("errors") and batch_error is None:
+            # Document-level failure (e.g. validation): no alias ran
+            batch_error = "; ".join(
+                e.get("message", "") for e in payload["errors"]
+            )
+
+        results = []
+        aliases = {id(m): f"m{i}" for i, m in enumerate(sendable)}
+        for mutation in batch:
+            result = {"key": mutation["key"], "operation": mutation["name"]}
+            alias = aliases.get(id(mutation))
+            if alias is not None and batch_error is None:
+                result.update(
+                    {
+                        "via": "graphql",
+                        "success": data.get(alias) is not None
+                        and alias not in errors,
+                        "data": data.get(alias),
+                        "error": errors.get(alias),
+                    }
+                )
+            elif self.rest_fallback:
+                outcome = mutation["fallback"]()
+                result.update(
+                    {
+                        "via": "rest",
+                        "success": bool(outcome),
+                        "data": outcome if isinstance(outcome, dict) else None,
+                        "error": batch_error,
+                    }
+                )
+            else:
+                result.update(
+                    {
+                        "via": "graphql",
+                        "success": False,
+                        "data": None,
+                        "error": batch_error or "missing node id",
+                    }
+                )
+            results.append(result)
+        return results
+
+    def _build_document(
+        self, mutations: List[Dict[str, Any]]
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build an aliased mutation document with one variable per input.
 
         Args:
-            state: Issue state (open, closed, all)
+            mutations: Mutation descriptions with inputs
 
         Returns:
-            List of issue data dicts
+            Tuple of GraphQL document and its variables
         """
-        try:
-            response = requests.get(
-                f"{self.base_url}/repos/{self.repo}/issues?state={state}",
-                headers=self.headers,
-                timeout=10,
+        declarations = []
+        fields = []
+        variables = {}
+        for i, mutation in enumerate(mutations):
+            input_type, selection = GRAPHQL_MUTATIONS[mutation["name"]]
+            declarations.append(f"$i{i}: {input_type}!")
+            fields.append(
+                f"m{i}: {mutation['name']}(input: $i{i}) {{ {selection} }}"
             )
-            response.raise_for_status()
-            return response.json()
-        except Exception:
-            return []
+            variables[f"i{i}"] = mutation["input"]
+
+        query = (
+            f"mutation({', '.join(declarations)}) {{\n  "
+            + "\n  ".join(fields)
+            + "\n}"
+        )
+        return query, variables
 
 
 class FormattingManager:
     """Manages code formatting issue detection and reporting."""
 
-    def __init__(self, api: GitHubAPI):
+    def __init__(
+        self,
+        api: GitHubAPI,
+        root: str = ".",
+        mode: str = "walk",
+        base: Optional[str] = None,
+    ):
         """Initialize formatting manager.
 
         Args:
             api: GitHub API client
+            root: Repository directory to check
+            mode: File discovery mode: walk the tree, list tracked files,
+                or list files changed since ``base``
+            base: Base revision for the ``changed`` mode
         """
         self.api = api
+        self.root = root
+        self.mode = mode
+        self.base = base
+        self._buckets: Optional[Dict[str, List[str]]] = None
+
+    def _language_files(self, language: str) -> List[str]:
+        """Return the files of one language bucket.
+
+        Files are listed once, on first use, and every language check
+        reads from the same buckets.
+
+        Args:
+            language: Bucket name from file_discovery.LANGUAGE_SUFFIXES
+
+        Returns:
+            File paths relative to the root
+        """
+        if self._buckets is None:
+            self._buckets = discover_files(
+                self.root,
+                ["python", "go", "nodejs"],
+                mode=self.mode,
+                base=self.base,
+            )
+        return self._buckets.get(language, [])
 
     def check_formatting_issues(self) -> Dict[str, Any]:
         """Check for formatting issues in the repository.
@@ -210,9 +2042,7 @@ class FormattingManager:
         Returns:
             Dict with formatting check results for Python files
         """
-        import glob
-
-        python_files = glob.glob("**/*.py", recursive=True)
+        python_files = self._language_files("python")
 
         if not python_files:
             return {
@@ -236,9 +2066,7 @@ class FormattingManager:
         Returns:
             Dict with formatting check results for Go files
         """
-        import glob
-
-        go_files = glob.glob("**/*.go", recursive=True)
+        go_files = self._language_files("go")
 
         if not go_files:
             return {
@@ -259,13 +2087,10 @@ class FormattingManager:
         """Check JavaScript file formatting.
 
         Returns:
-            Dict with formatting check results for JavaScript files
+            Dict with formatting check results for JavaScript/TypeScript
+            files
         """
-        import glob
-
-        js_files = glob.glob("**/*.js", recursive=True) + glob.glob(
-            "**/*.ts", recursive=True
-        )
+        js_files = self._language_files("nodejs")
 
         if not js_files:
             return {
@@ -315,13 +2140,21 @@ class FormattingManager:
 class CopilotTicketManager:
     """Manages GitHub Copilot review comment tickets."""
 
-    def __init__(self, api: GitHubAPI):
+    def __init__(
+        self,
+        api: Union[GitHubAPI, AsyncGitHubAPI],
+        index: Optional[IssueIndex] = None,
+    ):
         """Initialize copilot ticket manager.
 
         Args:
-            api: GitHub API client
+            api: GitHub API client; the ``*_async`` methods need an
+                AsyncGitHubAPI
+            index: Issue index for existence checks; without one each
+                check costs a search API call
         """
         self.api = api
+        self.index = index
 
     def handle_pull_request_review_comment(
         self, event_data: Dict[str, Any]
@@ -349,15 +2182,21 @@ class CopilotTicketManager:
 
         # Only process Copilot comments
         if user.get("login") == "github-copilot[bot]":
+            title = f"Copilot Review: {comment.get('path', 'unknown')}"
+
             # Check if issue already exists
-            existing_issues = self.api.search_issues(
-                f"Copilot Review: {comment.get('path', 'unknown')}"
-            )
+            if self.index is not None:
+                existing_issues = self.index.find_by_copilot_id(
+                    comment.get("id", "unknown")
+                ) or self.index.find_by_title(title, normalized=True)
+            else:
+                existing_issues = self.api.search_issues(title)
 
             if not existing_issues:
-                title = f"Copilot Review: {comment.get('path', 'unknown')}"
                 body = self._build_comment_body(comment)
-                self.api.create_issue(title, body, ["copilot-review"])
+                issue = self.api.create_issue(title, body, ["copilot-review"])
+                if issue is not None and self.index is not None:
+                    self.index.add(issue)
 
     def _handle_pr_closed(self, event_data: Dict[str, Any]) -> None:
         """Handle PR closed events.
@@ -368,11 +2207,40 @@ class CopilotTicketManager:
         pr = event_data.get("pull_request", {})
         if pr.get("merged"):
             # Find related copilot issues and close them
-            search_query = "label:copilot-review state:open"
-            issues = self.api.search_issues(search_query)
+            if self.index is not None:
+                issues = self.index.find_by_label("copilot-review", "open")
+            else:
+                search_query = "label:copilot-review state:open"
+                issues = self.api.search_issues(search_query)
 
             for issue in issues:
+                if (
+                    self.api.close_issue(issue["number"], "PR merged")
+                    and self.index is not None
+                ):
+                    self.index.mark_closed(issue["number"])
+
+    async def handle_pr_closed_async(self, event_data: Dict[str, Any]) -> int:
+        """Close copilot review issues for a merged PR concurrently.
+
+        Args:
+            event_data: GitHub webhook event data
+
+        Returns:
+            Number of issues closed
+        """
+        pr = event_data.get("pull_request", {})
+        if not pr.get("merged"):
+            return 0
+
+        issues = await self.api.search_issues("label:copilot-review state:open")
+        results = await asyncio.gather(
+            *(
                 self.api.close_issue(issue["number"], "PR merged")
+                for issue in issues
+            )
+        )
+        return sum(1 for closed in results if closed)
 
     def _build_comment_body(self, comment: Dict[str, Any]) -> str:
         """Build issue body from comment data.
@@ -435,13 +2303,27 @@ class CopilotTicketManager:
 class DuplicateIssueManager:
     """Manages duplicate issue detection and cleanup."""
 
-    def __init__(self, api: GitHubAPI):
+    def __init__(
+        self,
+        api: Union[GitHubAPI, AsyncGitHubAPI],
+        batcher: Optional[GraphQLBatcher] = None,
+        similarity_threshold: Optional[float] = None,
+    ):
         """Initialize duplicate issue manager.
 
         Args:
-            api: GitHub API client
+            api: GitHub API client; the ``*_async`` methods need an
+                AsyncGitHubAPI
+            batcher: GraphQL batcher; when given, duplicates are commented
+                on and closed in batched mutations instead of one REST
+                call each
+            similarity_threshold: Estimated Jaccard similarity of title
+                and body shingles above which issues are near-duplicates;
+                None groups exact title matches only
         """
         self.api = api
+        self.batcher = batcher
+        self.similarity_threshold = similarity_threshold
 
     def close_duplicates(self, dry_run: bool = False) -> int:
         """Close duplicate issues.
@@ -454,11 +2336,11 @@ class DuplicateIssueManager:
         """
         print(f"🔍 Checking for duplicate issues (dry_run={dry_run})")
 
-        # Get all open issues
-        all_issues = self.api.search_issues("state:open")
+        # Stream all open issues and group them as pages arrive
+        groups = self._group(self.api.iter_issues("open"), dry_run)
 
-        # Group by title
-        groups = self._group_by_title(all_issues)
+        if self.batcher is not None and not dry_run:
+            return self._close_duplicates_batched(groups)
 
         total_closed = 0
         for _title, issues in groups.items():
@@ -468,22 +2350,269 @@ class DuplicateIssueManager:
 
         return total_closed
 
-    def group_by_title(self, issues: List[Dict]) -> Dict[str, List[Dict]]:
+    async def close_duplicates_async(self, dry_run: bool = False) -> int:
+        """Close duplicate issues, fanning the closes out concurrently.
+
+        Args:
+            dry_run: If True, only identify duplicates without closing
+
+        Returns:
+            Number of duplicates found/closed
+        """
+        print(f"🔍 Checking for duplicate issues (dry_run={dry_run})")
+
+        issues = [issue async for issue in self.api.iter_issues("open")]
+        groups = self._group(issues, dry_run)
+
+        to_close = [
+            (issue, self._duplicate_comment(issues))
+            for issues in groups.values()
+            for issue in self._duplicates_to_close(issues)
+        ]
+        if dry_run:
+            return len(to_close)
+
+        results = await asyncio.gather(
+            *(
+                self._close_duplicate_async(issue, comment_body)
+                for issue, comment_body in to_close
+            )
+        )
+        return sum(1 for closed in results if closed)
+
+    async def _close_duplicate_async(
+        self, issue: Dict, comment_body: str
+    ) -> bool:
+        """Comment on and close one duplicate through the async client.
+
+        Args:
+            issue: Duplicate issue
+            comment_body: Comment naming the issue that is kept open
+
+        Returns:
+            True if the issue was closed
+        """
+        await self.api.add_comment(issue["number"], comment_body)
+        return await self.api.close_issue(issue["number"], "duplicate")
+
+    def _close_duplicates_batched(self, groups: Dict[str, List[Dict]]) -> int:
+        """Comment on and close every duplicate through the batcher.
+
+        Args:
+            groups: Issues grouped by title
+
+        Returns:
+            Number of issues closed
+        """
+        mutations = []
+        for issues in groups.values():
+            duplicates = self._duplicates_to_close(issues)
+            if not duplicates:
+                continue
+            comment_body = self._duplicate_comment(issues)
+            for issue in duplicates:
+                mutations.append(
+                    self.batcher.comment_mutation(issue, comment_body)
+                )
+                mutations.append(
+                    self.batcher.close_mutation(issue, "duplicate")
+                )
+
+        results = self.batcher.run(mutations)
+        failed = [r for r in results if not r["success"]]
+        for result in failed:
+            print(f"⚠️  {result['key']} failed: {result['error']}")
+        return sum(
+            1
+            for r in results
+            if r["operation"] == "closeIssue" and r["success"]
+        )
+
+    def _group(
+        self, issues: Iterable[Dict], report: bool = False
+    ) -> Dict[str, List[Dict]]:
+        """Group issues by exact title or, with a threshold, by similarity.
+
+        Args:
+            issues: Issue data, as a list or a streaming iterator
+            report: Print the near-duplicate groups and their scores
+
+        Returns:
+            Dict mapping a group key to the issues in the group
+        """
+        if self.similarity_threshold is None:
+            return self._group_by_title(issues)
+
+        near_groups = self.find_near_duplicates(issues)
+        if report:
+            print(self.format_near_duplicate_report(near_groups))
+        return {
+            f"#{group['original']['number']}": [group["original"]]
+            + [match["issue"] for match in group["duplicates"]]
+            for group in near_groups
+        }
+
+    def find_near_duplicates(self, issues: Iterable[Dict]) -> List[Dict]:
+        """Find near-duplicate issue groups with MinHash/LSH.
+
+        Every issue is signed once and bucketed by band, so only issues
+        sharing a bucket are compared. Issues with identical normalized
+        titles are always grouped, as in exact-title mode. The matching
+        pairs are joined into connected components, which are then split
+        into groups whose members all match their original directly.
+
+        Args:
+            issues: Issue data, as a list or a streaming iterator
+
+        Returns:
+            Groups with the oldest issue as ``original`` and the others as
+            ``duplicates`` entries of ``{"issue", "score"}``, where score
+            is the estimated similarity to the original
+        """
+        lsh = MinHashLSH(self.similarity_threshold or 1.0)
+        by_number: Dict[int, Dict] = {}
+        by_title: Dict[str, int] = {}
+        titles: Dict[int, str] = {}
+        pairs: List[Tuple[int, int]] = []
+        for issue in issues:
+            number = issue["number"]
+            by_number[number] = issue
+            lsh.add(number, issue_shingles(issue))
+            title = normalize_title(issue.get("title") or "")
+            titles[number] = title
+            if title in by_title:
+                pairs.append((by_title[title], number))
+            else:
+                by_title[title] = number
+
+        pairs.extend(
+            (first, second) for first, second, _ in lsh.near_duplicate_pairs()
+        )
+        members = self._connected_components(by_number, pairs)
+
+        groups = []
+        for numbers in members.values():
+            for root, duplicates in self._star_groups(
+                sorted(numbers), titles, lsh
+            ):
+                groups.append(
+                    {
+                        "original": by_number[root],
+                        "duplicates": [
+                            {"issue": by_number[number], "score": score}
+                            for number, score in duplicates
+                        ],
+                    }
+                )
+        return sorted(groups, key=lambda g: g["original"]["number"])
+
+    def _star_groups(
+        self, numbers: List[int], titles: Dict[int, str], lsh: MinHashLSH
+    ) -> List[Tuple[int, List[Tuple[int, float]]]]:
+        """Split a connected component into groups around an original.
+
+        Matching pairs chain: if A matches B and B matches C, C shares A's
+        component even when it is nothing like A. The lowest remaining
+        number becomes an original and keeps only the issues that match
+        it directly, by normalized title or by a score at or above the
+        threshold; the others are grouped again among themselves.
+
+        Args:
+            numbers: Issue numbers of one component, ascending
+            titles: Normalized title by issue number
+            lsh: Index the issues were signed into
+
+        Returns:
+            (original, [(duplicate, score), ...]) pairs
+        """
+        threshold = self.similarity_threshold or 1.0
+        groups = []
+        remaining = numbers
+        while len(remaining) > 1:
+            root, others = remaining[0], remaining[1:]
+            duplicates, remaining = [], []
+            for number in others:
+                score = lsh.similarity(root, number)
+                if titles[number] == titles[root] or score >= threshold:
+                    duplicates.append((number, round(score, 3)))
+                else:
+                    remaining.append(number)
+            if duplicates:
+                groups.append((root, duplicates))
+        return groups
+
+    def _connected_components(
+        self, numbers: Iterable[int], pairs: List[Tuple[int, int]]
+    ) -> Dict[int, List[int]]:
+        """Union issue numbers joined by pairs.
+
+        Args:
+            numbers: Every issue number
+            pairs: Pairs of issue numbers to join
+
+        Returns:
+            Dict mapping each component's lowest issue number to its members
+        """
+        parents = {number: number for number in numbers}
+
+        def find(number: int) -> int:
+            while parents[number] != number:
+                parents[number] = parents[parents[number]]
+                number = parents[number]
+            return number
+
+        for first, second in pairs:
+            root_a, root_b = find(first), find(second)
+            if root_a != root_b:
+                parents[max(root_a, root_b)] = min(root_a, root_b)
+
+        members: Dict[int, List[int]] = {}
+        for number in parents:
+            members.setdefault(find(number), []).append(number)
+        return members
+
+    def format_near_duplicate_report(self, groups: List[Dict]) -> str:
+        """Format near-duplicate groups for a dry-run report.
+
+        Args:
+            groups: Groups returned by find_near_duplicates
+
+        Returns:
+            Human readable report
+        """
+        if not groups:
+            return "No near-duplicate issues found"
+
+        lines = [
+            f"Near-duplicate groups (threshold {self.similarity_threshold}):"
+        ]
+        for group in groups:
+            original = group["original"]
+            lines.append(f"#{original['number']} {original.get('title', '')}")
+            for match in group["duplicates"]:
+                issue = match["issue"]
+                lines.append(
+                    f"  {match['score']:.2f}  #{issue['number']} "
+                    f"{issue.get('title', '')}"
+                )
+        return "\n".join(lines)
+
+    def group_by_title(self, issues: Iterable[Dict]) -> Dict[str, List[Dict]]:
         """Group issues by title similarity.
 
         Args:
-            issues: List of issue data
+            issues: Issue data, as a list or a streaming iterator
 
         Returns:
             Dict mapping titles to lists of similar issues
         """
         return self._group_by_title(issues)
 
-    def _group_by_title(self, issues: List[Dict]) -> Dict[str, List[Dict]]:
+    def _group_by_title(self, issues: Iterable[Dict]) -> Dict[str, List[Dict]]:
         """Group issues by title similarity.
 
         Args:
-            issues: List of issue data
+            issues: Issue data, as a list or a streaming iterator
 
         Returns:
             Dict mapping titles to lists of similar issues
@@ -508,22 +2637,12 @@ class DuplicateIssueManager:
         Returns:
             Number of issues closed
         """
-        if len(issues) <= 1:
-            return 0
-
-        # Sort by issue number to keep the oldest (lowest number)
-        sorted_issues = sorted(issues, key=lambda x: x.get("number", 0))
-
-        # Keep the first (oldest) issue, close the rest
-        to_close = sorted_issues[1:]
-
         closed_count = 0
-        for issue in to_close:
+        comment_body = self._duplicate_comment(issues)
+        for issue in self._duplicates_to_close(issues):
             if not dry_run:
                 # Add a comment explaining the closure
-                # comment_body = (
-                #     f"Closing as duplicate of #{sorted_issues[0]['number']}"
-                # )
+                self.api.add_comment(issue["number"], comment_body)
 
                 # Close the issue
                 if self.api.close_issue(issue["number"], "duplicate"):
@@ -533,17 +2652,53 @@ class DuplicateIssueManager:
 
         return closed_count
 
+    def _duplicate_comment(self, issues: List[Dict]) -> str:
+        """Build the comment posted on each duplicate in a group.
+
+        Args:
+            issues: List of issues sharing a title
+
+        Returns:
+            Comment naming the issue that is kept open
+        """
+        original = min(issues, key=lambda x: x.get("number", 0))
+        return f"Closing as duplicate of #{original['number']}"
+
+    def _duplicates_to_close(self, issues: List[Dict]) -> List[Dict]:
+        """Select the issues to close in a group, keeping the oldest.
+
+        Args:
+            issues: List of issues sharing a title
+
+        Returns:
+            Every issue except the one with the lowest number
+        """
+        if len(issues) <= 1:
+            return []
+
+        # Sort by issue number to keep the oldest (lowest number)
+        sorted_issues = sorted(issues, key=lambda x: x.get("number", 0))
+        return sorted_issues[1:]
+
 
 class CodeQLAlertManager:
     """Manages CodeQL security alert tickets."""
 
-    def __init__(self, api: GitHubAPI):
+    def __init__(
+        self,
+        api: Union[GitHubAPI, AsyncGitHubAPI],
+        index: Optional[IssueIndex] = None,
+    ):
         """Initialize CodeQL alert manager.
 
         Args:
-            api: GitHub API client
+            api: GitHub API client; the ``*_async`` methods need an
+                AsyncGitHubAPI
+            index: Issue index for existence checks; without one each
+                check costs a search API call
         """
         self.api = api
+        self.index = index
 
     def should_create_ticket(self, alert: Dict[str, Any]) -> bool:
         """Check if a ticket should be created for this alert.
@@ -566,12 +2721,43 @@ class CodeQLAlertManager:
             True if ticket should be created
         """
         # Check if ticket already exists
-        alert_id = alert.get("number", "unknown")
-        existing_issues = self.api.search_issues(
-            f"CodeQL Security Alert #{alert_id}"
-        )
+        title = self._alert_title(alert)
+        if self.index is not None:
+            existing_issues = self.index.find_by_title(title, normalized=True)
+        else:
+            existing_issues = self.api.search_issues(title)
         return len(existing_issues) == 0
 
+    async def filter_new_alerts_async(
+        self, alerts: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Check many alerts for existing tickets concurrently.
+
+        Args:
+            alerts: CodeQL alert data
+
+        Returns:
+            Alerts that have no ticket yet, in input order
+        """
+        existing = await asyncio.gather(
+            *(
+                self.api.search_issues(self._alert_title(alert))
+                for alert in alerts
+            )
+        )
+        return [alert for alert, issues in zip(alerts, existing) if not issues]
+
+    def _alert_title(self, alert: Dict[str, Any]) -> str:
+        """Build the issue title used for an alert's ticket.
+
+        Args:
+            alert: CodeQL alert data
+
+        Returns:
+            Ticket title containing the alert number
+        """
+        return f"CodeQL Security Alert #{alert.get('number', 'unknown')}"
+
     def _build_alert_body(self, alert: Dict[str, Any]) -> str:
         """Build issue body from alert data.
 
@@ -605,21 +2791,40 @@ class CodeQLAlertManager:
 
 
 class IssueUpdateProcessor:
-    """Processes issue update requests from files."""
-
-    def __init__(self, api: GitHubAPI):
+    """Processes issue update requests from files.
+
+    Updates can be processed serially (the default) or on a bounded thread
+    pool. In concurrent mode updates are grouped by the issue they target,
+    so a create followed by a comment on the same issue still runs in file
+    order, while unrelated issues proceed in parallel.
+    """
+
+    def __init__(
+        self,
+        api: GitHubAPI,
+        max_workers: int = 1,
+        index: Optional[IssueIndex] = None,
+    ):
         """Initialize issue update processor.
 
         Args:
             api: GitHub API client
+            max_workers: Number of worker threads, capped at
+                MAX_UPDATE_WORKERS; 1 processes updates serially
+            index: Issue index for existence checks; without one each
+                create costs a search API call
         """
         self.api = api
+        self.index = index
+        self.max_workers = max(1, min(max_workers, MAX_UPDATE_WORKERS))
+        self.results: List[Dict[str, Any]] = []
 
     def process_updates(self, file_path: str) -> bool:
-        """Process issue updates from a JSON file.
+        """Process issue updates from a JSON file or directory.
 
         Args:
-            file_path: Path to JSON file containing updates
+            file_path: Path to a JSON file containing updates, or a directory
+                of JSON files each holding one update or a list of them
 
         Returns:
             True if processing was successful
@@ -628,35 +2833,172 @@ class IssueUpdateProcessor:
             return False
 
         try:
-            with open(file_path) as f:
-                updates = json.load(f)
+            updates = self._load_updates(file_path)
 
             if not updates:
                 return False
 
-            for update in updates:
-                self._process_single_update(update)
+            if self.max_workers == 1:
+                # A single group keeps strict file order
+                self.results = self._process_group(list(enumerate(updates)))
+            else:
+                self.results = self._process_concurrently(updates)
 
             return True
         except Exception:
             return False
 
-    def _process_single_update(self, update: Dict[str, Any]) -> None:
+    def _load_updates(self, path: str) -> List[Dict[str, Any]]:
+        """Load update operations from a file or a directory of files.
+
+        Args:
+            path: JSON file or directory of JSON files
+
+        Returns:
+            List of update operations in file (then name) order
+        """
+        if os.path.isdir(path):
+            files = sorted(
+                os.path.join(path, name)
+                for name in os.listdir(path)
+                if name.endswith(".json")
+            )
+        else:
+            files = [path]
+
+        updates: List[Dict[str, Any]] = []
+        for update_file in files:
+            with open(update_file) as f:
+                data = json.load(f)
+            if isinstance(data, list):
+                updates.extend(data)
+            elif data:
+                updates.append(data)
+        return updates
+
+    def _process_concurrently(
+        self, updates: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Process independent update groups on a bounded thread pool.
+
+        Args:
+            updates: Update operations in file order
+
+        Returns:
+            Per-item results ordered by their position in the input
+        """
+        groups: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+        for index, update in enumerate(updates):
+            groups.setdefault(self._group_key(update), []).append(
+                (index, update)
+            )
+
+        results: List[Dict[str, Any]] = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self._process_group, group)
+                for group in groups.values()
+            ]
+            for future in as_completed(futures):
+                results.extend(future.result())
+
+        return sorted(results, key=lambda result: result["index"])
+
+    def _group_key(self, update: Dict[str, Any]) -> str:
+        """Key that keeps updates for the same issue in one ordered group.
+
+        Args:
+            update: Update operation data
+
+        Returns:
+            Issue number when given, otherwise the issue title
+        """
+        number = update.get("number") or update.get("issue_number")
+        if number:
+            return f"#{number}"
+        # Titles that normalize alike must not race to create two issues
+        return f"title:{normalize_title(update.get('title', ''))}"
+
+    def _process_group(
+        self, items: List[Tuple[int, Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """Process one group of updates strictly in order.
+
+        Issues created (or found) earlier in the group are remembered by
+        title so that later comments or closes can target them.
+
+        Args:
+            items: (index, update) pairs in file order
+
+        Returns:
+            Per-item results for the group
+        """
+        known_numbers: Dict[str, int] = {}
+        results = []
+        for index, update in items:
+            try:
+                result = self._process_single_update(update, known_numbers)
+            except RateLimitError as e:
+                # Never guess: the issue may or may not exist yet
+                result = {"status": "rate_limited", "detail": str(e)}
+            except Exception as e:
+                result = {"status": "failed", "detail": str(e)}
+
+            number = update.get("number") or update.get("issue_number")
+            result.update(
+                {
+                    "index": index,
+                    "action": update.get("action", "unknown"),
+                    "target": f"#{number}" if number else update.get("title"),
+                }
+            )
+            results.append(result)
+        return results
+
+    def _process_single_update(
+        self,
+        update: Dict[str, Any],
+        known_numbers: Optional[Dict[str, int]] = None,
+    ) -> Dict[str, Any]:
         """Process a single update operation.
 
         Args:
             update: Update operation data
+            known_numbers: Issue numbers resolved earlier, keyed by title
+
+        Returns:
+            Result dict with a status and optional issue number and detail
         """
         action = update.get("action")
+        known_numbers = {} if known_numbers is None else known_numbers
 
         if action == "create":
-            self._create_issue(update)
-        elif action == "update":
-            # Handle update logic
-            pass
-        elif action == "close":
-            # Handle close logic
-            pass
+            result = self._create(update)
+            if result.get("number") is not None:
+                known_numbers[update["title"]] = result["number"]
+            return result
+
+        if action in ("comment", "close"):
+            number = (
+                update.get("number")
+                or update.get("issue_number")
+                or known_numbers.get(update.get("title", ""))
+            )
+            if not number:
+                return {"status": "failed", "detail": "unknown issue number"}
+
+            if action == "comment":
+                ok = self.api.add_comment(number, update.get("body", ""))
+                status = "commented"
+            else:
+                reason = update.get("state_reason", "completed")
+                ok = self.api.close_issue(number, reason)
+                status = "closed"
+                if ok and self.index is not None:
+                    self.index.mark_closed(number)
+            return {"status": status if ok else "failed", "number": number}
+
+        return {"status": "skipped", "detail": f"unsupported action {action}"}
 
     def _create_issue(self, update: Dict[str, Any]) -> bool:
         """Create an issue from update data.
@@ -667,20 +3009,90 @@ class IssueUpdateProcessor:
         Returns:
             True if successful
         """
+        return self._create(update)["status"] == "created"
+
+    def _create(self, update: Dict[str, Any]) -> Dict[str, Any]:
+        """Create an issue unless one with the same title already exists.
+
+        Args:
+            update: Issue creation data
+
+        Returns:
+            Result dict with a status and the issue number when known
+        """
         title = update.get("title")
         body = update.get("body", "")
         labels = update.get("labels", [])
 
         if not title:
-            return False
+            return {"status": "failed", "detail": "missing title"}
 
         # Check for existing issues
-        existing_issues = self.api.search_issues(title)
+        if self.index is not None:
+            existing_issues = self.index.find_by_title(title, normalized=True)
+        else:
+            existing_issues = self.api.search_issues(title)
         if existing_issues:
-            return False  # Issue already exists
+            return {
+                "status": "exists",
+                "number": existing_issues[0].get("number"),
+            }
 
         result = self.api.create_issue(title, body, labels)
-        return result is not None
+        if result is None:
+            return {"status": "failed", "detail": "create request failed"}
+        if self.index is not None:
+            self.index.add(result)
+        return {"status": "created", "number": result.get("number")}
+
+    def format_results_table(self) -> str:
+        """Render the results of the last run as a Markdown table.
+
+        Returns:
+            Markdown table with one row per processed update
+        """
+        lines = [
+            "| # | Action | Target | Status | Issue | Detail |",
+            "| - | ------ | ------ | ------ | ----- | ------ |",
+        ]
+        for result in self.results:
+            number = result.get("number")
+            lines.append(
+                f"| {result['index'] + 1} | {result['action']} "
+                f"| {result['target']} | {result['status']} "
+                f"| {'#' + str(number) if number else ''} "
+                f"| {result.get('detail', '')} |"
+            )
+        return "\n".join(lines)
+
+
+async def close_duplicates_async(
+    token: str,
+    repo: str,
+    dry_run: bool,
+    max_concurrency: int,
+    cache: Optional[ResponseCache] = None,
+    similarity_threshold: Optional[float] = None,
+) -> int:
+    """Close duplicate issues using the asyncio client.
+
+    Args:
+        token: GitHub token
+        repo: Repository in format 'owner/repo'
+        dry_run: If True, only identify duplicates without closing
+        max_concurrency: Maximum number of requests in flight at once
+        cache: Conditional-request cache shared with the sync client
+        similarity_threshold: Near-duplicate threshold, None for exact
+            title matches
+
+    Returns:
+        Number of duplicates found/closed
+    """
+    async with AsyncGitHubAPI(token, repo, max_concurrency, cache=cache) as api:
+        manager = DuplicateIssueManager(
+            api, similarity_threshold=similarity_threshold
+        )
+        return await manager.close_duplicates_async(dry_run)
 
 
 def main():
@@ -700,6 +3112,70 @@ def main():
     parser.add_argument(
         "--dry-run", action="store_true", help="Run in dry-run mode"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Concurrent workers for update-issues (1 = serial)",
+    )
+    parser.add_argument(
+        "--updates-path",
+        default="issue_updates.json",
+        help="Issue updates JSON file or directory of JSON files",
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Use the asyncio client for close-duplicates",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=20,
+        help="Maximum in-flight requests for the asyncio client",
+    )
+    parser.add_argument(
+        "--cache-path",
+        default=os.getenv("ISSUE_MANAGER_CACHE"),
+        help="JSON file for the conditional-request response cache "
+        "(default: $ISSUE_MANAGER_CACHE, disabled when unset)",
+    )
+    parser.add_argument(
+        "--graphql",
+        action="store_true",
+        help="Batch close-duplicates mutations through the GraphQL API",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=50,
+        help="Maximum mutations per GraphQL request",
+    )
+    parser.add_argument(
+        "--similarity-threshold",
+        type=float,
+        default=None,
+        help="Group close-duplicates candidates by MinHash similarity of "
+        "title and body (0-1) instead of exact titles",
+    )
+    parser.add_argument(
+        "--files",
+        choices=DISCOVERY_MODES,
+        default="walk",
+        help="How format-check lists files: walk the tree, git tracked "
+        "files, or files changed since --base-ref",
+    )
+    parser.add_argument(
+        "--base-ref",
+        help="Base revision for --files changed, e.g. the PR base SHA",
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=10,
+        help="Maximum number of pooled keep-alive connections to GitHub",
+    )
 
     args = parser.parse_args()
 
@@ -715,25 +3191,36 @@ def main():
         sys.exit(1)
 
     # Initialize API client
-    api = GitHubAPI(token, repo)
+    cache = ResponseCache(args.cache_path) if args.cache_path else None
+    api = GitHubAPI(token, repo, pool_size=args.pool_size, cache=cache)
 
     # Test API access
-    if not api.test_access():
+    try:
+        accessible = api.test_access()
+    except RateLimitError as e:
+        print(f"❌ GitHub API rate limited: {e}", file=sys.stderr)
+        sys.exit(1)
+    if not accessible:
         print("❌ Failed to access GitHub API", file=sys.stderr)
         sys.exit(1)
 
     try:
         if args.command == "format-check":
             print("🔍 Running format check...")
-            manager = FormattingManager(api)
+            manager = FormattingManager(
+                api, mode=args.files, base=args.base_ref
+            )
             manager.check_formatting_issues()
             print("✅ Format check completed")
 
         elif args.command == "update-issues":
             print("📝 Processing issue updates...")
-            processor = IssueUpdateProcessor(api)
-            success = processor.process_updates("issue_updates.json")
+            processor = IssueUpdateProcessor(
+                api, max_workers=args.workers, index=IssueIndex(api)
+            )
+            success = processor.process_updates(args.updates_path)
             if success:
+                print(processor.format_results_table())
                 print("✅ Issue updates processed")
             else:
                 print("ℹ️ No issue updates to process")
@@ -748,17 +3235,49 @@ def main():
 
                 # Handle different event types
                 if "pull_request" in event_data:
-                    manager = CopilotTicketManager(api)
+                    manager = CopilotTicketManager(api, IssueIndex(api))
                     manager.handle_pull_request_review_comment(event_data)
 
             print("✅ Event handling completed")
 
         elif args.command == "close-duplicates":
             print("🧹 Checking for duplicate issues...")
-            manager = DuplicateIssueManager(api)
-            count = manager.close_duplicates(dry_run=args.dry_run)
+            if args.use_async:
+                count = asyncio.run(
+                    close_duplicates_async(
+                        token,
+                        repo,
+                        args.dry_run,
+                        args.max_concurrency,
+                        cache,
+                        args.similarity_threshold,
+                    )
+                )
+            else:
+                batcher = (
+                    GraphQLBatcher(api, batch_size=args.batch_size)
+                    if args.graphql
+                    else None
+                )
+                manager = DuplicateIssueManager(
+                    api, batcher, args.similarity_threshold
+                )
+                count = manager.close_duplicates(dry_run=args.dry_run)
             print(f"✅ Found {count} duplicate issues")
 
+        stats = api.connection_stats()
+        print(
+            f"📊 API requests: {stats['requests_sent']}, "
+            f"connections reused: {stats['connections_reused']}, "
+            f"throttled: {stats['throttled_seconds']}s"
+        )
+        if cache is not None:
+            cache_stats = cache.stats()
+            print(
+                f"🗄️ Response cache: {cache_stats['hits']} hits, "
+                f"{cache_stats['misses']} misses"
+            )
+        api.close()
         sys.exit(0)
 
     except Exception as e:
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""# file: scripts/lint_store.py
+Incremental lint results store for the Auto Formatter GitHub Action
+
+The format cache only remembers files that came out lint-clean, so every
+file with a finding was linted again on every run. The lint store keeps
+the diagnostics themselves, keyed by (file content hash, linter
+fingerprint). The fingerprint covers the linter's command line, its
+version, the config files it is pointed at and the language's repository
+configs. The format runner replays stored diagnostics and only hands new
+or changed files to per-file linters. Linters that fix what they can
+(eslint, stylelint and markdownlint with ``--fix``) are stored by the
+contents they leave behind, which they would not change again.
+Whole-tree linters such as golangci-lint and lintr analyse packages or
+directories, not files, and always run.
+
+Stored lines keep the file's path as a placeholder, so replayed output
+looks like the linter's own. With a base revision the runner can also
+tell findings the change introduced from ones the base already had: a
+file identical to its base version has no new findings, and a changed
+file is compared with the stored diagnostics of its base contents,
+ignoring line and column numbers.
+
+The store is a single JSON file with LRU eviction, saved with the format
+cache.
+"""
+
+from collections import Counter, OrderedDict
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from file_discovery import run_git
+from format_cache import CACHE_LANGUAGES, file_digest, tool_version
+
+# Maximum number of remembered (file, linter) results
+MAX_ENTRIES = 100_000
+
+# Bump to drop every stored result when the entry format changes
+STORE_FORMAT_VERSION = 1
+
+# Stands in for the file's path inside stored diagnostic lines
+PATH_TOKEN = "<path>"
+
+# Line and column numbers after a path ("a.py:12:4:") or before a message
+# ("a.sh line 3"), dropped when findings are compared with the base
+POSITION = re.compile(r"^(<path>)(?::\d+)+|\bline \d+")
+
+
+class LintResult(NamedTuple):
+    """A linter's diagnostics for one file content."""
+
+    lines: List[str]
+    failed: bool
+
+
+def lint_fingerprint(
+    language: str,
+    name: str,
+    argv: List[str],
+    root: str = ".",
+    configs: Iterable[str] = (),
+) -> str:
+    """Fingerprint everything besides a file's contents that decides lints.
+
+    Args:
+        language: Runner language the linter runs for
+        name: Tool name
+        argv: Command without file paths; arguments naming files (the
+            shipped configs) are hashed by content
+        root: Repository directory
+        configs: Further repository configs the linter reads
+
+    Returns:
+        Hex digest
+    """
+    parts = [f"lint-store {STORE_FORMAT_VERSION}", f"tool {language} {name}"]
+    if argv:
+        parts.append(f"version {tool_version(argv[0])}")
+    for arg in argv:
+        parts.append(f"arg {arg}")
+        value = arg.split("=", 1)[-1]
+        if os.path.isfile(value):
+            parts.append(f"config {value} {file_digest(value)}")
+    repo_configs = CACHE_LANGUAGES.get(language, ((), ()))[1]
+    for config in dict.fromkeys((*repo_configs, *configs)):
+        digest = file_digest(os.path.join(root, config)) or "absent"
+        parts.append(f"config {config} {digest}")
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+def _spellings(path: str, root: str) -> List[str]:
+    """Ways a linter may print a path, longest first."""
+    return [
+        os.path.join(os.path.abspath(root), path),
+        f".{os.sep}{path}",
+        path,
+    ]
+
+
+def strip_path(lines: Iterable[str], path: str, root: str = ".") -> List[str]:
+    """Replace a file's path in its diagnostic lines with PATH_TOKEN.
+
+    Args:
+        lines: Lines attributed to the file
+        path: File path relative to root
+        root: Directory the linter ran in
+
+    Returns:
+        Lines with the first spelling of the path replaced
+    """
+    stripped = []
+    for line in lines:
+        for spelling in _spellings(path, root):
+            if spelling in line:
+                line = line.replace(spelling, PATH_TOKEN, 1)
+                break
+        stripped.append(line)
+    return stripped
+
+
+def restore_path(lines: Iterable[str], path: str) -> List[str]:
+    """Put a file's path back into stored diagnostic lines."""
+    return [line.replace(PATH_TOKEN, path, 1) for line in lines]
+
+
+def new_findings(lines: List[str], base_lines: List[str]) -> List[str]:
+    """Findings of a file that its base version did not have.
+
+    Findings are compared without their line and column numbers, so
+    findings that only moved are not new; a finding reported more often
+    than on the base counts once per extra report.
+
+    Args:
+        lines: Current diagnostics, path replaced by PATH_TOKEN
+        base_lines: Diagnostics of the base contents, same form
+
+    Returns:
+        The current lines that are new
+    """
+    remaining = Counter(POSITION.sub(r"\1", line) for line in base_lines)
+    new = []
+    for line in lines:
+        key = POSITION.sub(r"\1", line)
+        if remaining[key]:
+            remaining[key] -= 1
+        else:
+            new.append(line)
+    return new
+
+
+class LintStore:
+    """Persistent, size-bounded LRU map of lint results by content."""
+
+    def __init__(self, path: str, max_entries: int = MAX_ENTRIES):
+        """Initialize the store and load it from disk.
+
+        Args:
+            path: JSON file the store persists to
+            max_entries: Maximum number of remembered results
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: Dict[str, LintResult] = OrderedDict()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        """Load entries from disk, ignoring a missing or corrupt file."""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != STORE_FORMAT_VERSION:
+            return
+        for key, lines, failed in data.get("entries", []):
+            self._entries[key] = LintResult(lines, failed)
+        self._evict()
+
+    def save(self) -> None:
+        """Write the store to disk atomically, least recently used first."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            entries = [[key, *result] for key, result in self._entries.items()]
+        data = {"version": STORE_FORMAT_VERSION, "entries": entries}
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(temp_path, self.path)
+
+    @staticmethod
+    def key(fingerprint: str, content_digest: str) -> str:
+        """Build the key of a file content under a linter fingerprint.
+
+        Args:
+            fingerprint: Result of lint_fingerprint()
+            content_digest: Result of file_digest()
+
+        Returns:
+            Truncated hex digest identifying the pair
+        """
+        raw = f"{fingerprint}\n{content_digest}"
+        return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+    def get(self, key: str) -> Optional[LintResult]:
+        """Look up a result, refreshing its recency on a hit.
+
+        Args:
+            key: Store key
+
+        Returns:
+            The stored result, or None
+        """
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def peek(self, key: str) -> Optional[LintResult]:
+        """Look up a result without counting or refreshing it."""
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: str, result: LintResult) -> None:
+        """Remember a result, evicting the oldest entries if full.
+
+        Args:
+            key: Store key
+            result: Diagnostics with the path replaced by PATH_TOKEN
+        """
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries beyond max_entries."""
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        """Number of remembered results."""
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """Store statistics for reporting.
+
+        Returns:
+            Dict with entries, hits, misses and evictions
+        """
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def base_digests(
+    root: str, base: str, paths: Iterable[str]
+) -> Dict[str, Optional[str]]:
+    """Hash the base revision's contents of files.
+
+    Args:
+        root: Directory inside the work tree; paths are relative to it
+        base: Base revision, e.g. the pull request's base commit
+        paths: Files to look up
+
+    Returns:
+        Content digest per path (as file_digest computes it), None for
+        files the base does not have
+
+    Raises:
+        GitError: If git cannot read the base revision
+    """
+    paths = list(paths)
+    run_git(root, "rev-parse", "--verify", "--quiet", f"{base}^{{commit}}")
+    prefix = run_git(root, "rev-parse", "--show-prefix").decode().strip()
+    output = run_git(
+        root,
+        "cat-file",
+        "--batch",
+        stdin="".join(f"{base}:{prefix}{p}\n" for p in paths).encode(
+            "utf-8", "surrogateescape"
+        ),
+    )
+
+    digests: Dict[str, Optional[str]] = {}
+    offset = 0
+    for path in paths:
+        end = output.index(b"\n", offset)
+        header = output[offset:end].split()
+        offset = end + 1
+        if len(header) != 3 or header[1] != b"blob":
+            digests[path] = None
+            continue
+        size = int(header[2])
+        data = output[offset : offset + size]
+        offset += size + 1
+        digests[path] = hashlib.sha256(data).hexdigest()
+    return digests
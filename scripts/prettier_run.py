@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""# file: scripts/prettier_run.py
+Shared prettier run for the Auto Formatter GitHub Action
+
+Prettier used to be started once per language (JavaScript/TypeScript,
+Angular, CSS, Markdown, HTML, JSON, YAML, TOML and XML), each start paying
+for Node and plugin loading, and ``.json`` files were formatted twice
+because the JavaScript run included them. The format runner now hands the
+files of every prettier-formatted language to one prettier command line,
+split into as few batches as the command line allows, and runs it with
+``--cache`` so contents prettier already formatted with the same options
+are skipped. The cache is keyed by file contents rather than mtimes, as a
+fresh checkout touches every file.
+
+Prettier's ``--write`` prints every file with the time it took, which is
+turned into per-extension file counts and timings for the run summary and
+the timing report.
+"""
+
+import os
+import re
+from typing import Dict, Iterable, List, Optional
+
+# Prettier's --cache-strategy; mtimes change on every checkout
+CACHE_STRATEGY = "content"
+
+# A --write log line: "path 12ms", optionally "(unchanged)" and "(cached)"
+TIMING_LINE = re.compile(
+    r"^(?P<path>.+?) (?P<ms>\d+)ms(?P<states>( \(\w+\))*)$"
+)
+
+
+def prettier_argv(cache_location: Optional[str] = None) -> List[str]:
+    """Build the shared prettier command, file paths not appended.
+
+    Args:
+        cache_location: Prettier cache file, None to run without a cache
+
+    Returns:
+        Command line
+    """
+    argv = ["prettier", "--write"]
+    if cache_location:
+        argv += [
+            "--cache",
+            f"--cache-location={cache_location}",
+            f"--cache-strategy={CACHE_STRATEGY}",
+        ]
+    return argv
+
+
+def extension(path: str) -> str:
+    """Extension a file is reported under, e.g. ``.ts`` or ``Dockerfile``."""
+    name = os.path.basename(path)
+    suffix = os.path.splitext(name)[1]
+    return suffix.lower() if suffix else name
+
+
+def extension_stats(
+    files: Iterable[str], outputs: Iterable[str]
+) -> Dict[str, Dict[str, float]]:
+    """Summarize prettier runs per file extension.
+
+    Args:
+        files: Files handed to prettier
+        outputs: Output of every prettier batch
+
+    Returns:
+        ``{extension: {"files", "seconds", "changed", "cached"}}``, sorted
+        by extension; files prettier did not log (ignored files, failed
+        batches) are counted without time
+    """
+    logged = {}
+    for output in outputs:
+        for line in output.splitlines():
+            match = TIMING_LINE.match(line.strip())
+            if match:
+                logged[os.path.normpath(match["path"])] = match
+    stats: Dict[str, Dict[str, float]] = {}
+    for path in files:
+        row = stats.setdefault(
+            extension(path),
+            {"files": 0, "seconds": 0.0, "changed": 0, "cached": 0},
+        )
+        row["files"] += 1
+        match = logged.get(os.path.normpath(path))
+        if match is None:
+            continue
+        row["seconds"] += int(match["ms"]) / 1000
+        if "(cached)" in match["states"]:
+            row["cached"] += 1
+        elif "(unchanged)" not in match["states"]:
+            row["changed"] += 1
+    return dict(sorted(stats.items()))
+
+
+def render_stats(stats: Dict[str, Dict[str, float]]) -> str:
+    """Render extension statistics as a plain-text table.
+
+    Args:
+        stats: Result of extension_stats
+
+    Returns:
+        Table with one row per extension
+    """
+    header = (
+        f"{'Extension':<12} {'Files':>6} {'Changed':>8} {'Cached':>7} "
+        f"{'Time':>7}"
+    )
+    lines = [header]
+    for name, row in stats.items():
+        lines.append(
+            f"{name:<12} {row['files']:>6} {row['changed']:>8} "
+            f"{row['cached']:>7} {row['seconds']:>6.1f}s"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""# file: scripts/python_pipeline.py
+Fused Python formatting pipeline for the Auto Formatter GitHub Action
+
+The Python chain used to read and parse every ``.py`` file five times:
+``ruff format``, ``ruff check --fix``, ``isort --profile google``,
+``pylint`` over every file and a reporting-only ``ruff check``. The fused
+pipeline runs one ``ruff check --fix`` that also sorts imports (rule
+``I`` with isort's Google profile settings) and writes the remaining
+diagnostics as JSON, then ``ruff format``. Ruff keeps formatting and
+linting in separate commands, so two passes is the floor. Files ruff
+rewrote or still flags are remembered, and pylint runs with parallel jobs
+on just those files.
+
+Usage:
+    python scripts/python_pipeline.py bench --root . --rounds 3
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from change_set import rewritten_files, stat_snapshot
+from file_discovery import discover_files
+from timing_report import run_tool
+
+# ruff settings reproducing isort's google profile, passed as --config
+# overrides so ruff's import sorting replaces the isort pass
+GOOGLE_ISORT_SETTINGS = (
+    "lint.isort.force-single-line = true",
+    "lint.isort.force-sort-within-sections = true",
+    "lint.isort.single-line-exclusions = ['typing']",
+    "lint.isort.order-by-type = false",
+)
+
+# Config files copied next to the sample files by the benchmark
+BENCH_CONFIGS = (
+    ".ruff.toml",
+    "ruff.toml",
+    "pyproject.toml",
+    "setup.cfg",
+    ".isort.cfg",
+    ".pylintrc",
+)
+
+# Files per command in the benchmark's legacy path
+BENCH_BATCH_SIZE = 500
+
+
+def parse_ruff_json(text: str, root: str = ".") -> List[Dict[str, Any]]:
+    """Read ``ruff check --output-format=json`` diagnostics.
+
+    Args:
+        text: JSON written by ruff
+        root: Directory the file names are made relative to
+
+    Returns:
+        Diagnostics with ``path`` (relative to root), ``row``, ``column``,
+        ``code`` and ``message``; empty if the text is not ruff JSON
+    """
+    try:
+        records = json.loads(text or "[]")
+    except ValueError:
+        return []
+    root = os.path.abspath(root)
+    diagnostics = []
+    for record in records:
+        location = record.get("location") or {}
+        diagnostics.append(
+            {
+                "path": os.path.relpath(record.get("filename", ""), root),
+                "row": location.get("row", 0),
+                "column": location.get("column", 0),
+                "code": record.get("code") or "syntax-error",
+                "message": record.get("message", ""),
+            }
+        )
+    return diagnostics
+
+
+class PythonPipeline:
+    """One fused ruff pass per batch, then pylint on what ruff saw change.
+
+    The runner builds one pipeline per run; its two tools share the set
+    of selected files, which the task graph fills before any pylint batch
+    starts because pylint reads files that the ruff batches write.
+    """
+
+    def __init__(self, line_length: int, pylint_rcfile: str, jobs: int = 0):
+        """Initialize the pipeline.
+
+        Args:
+            line_length: Maximum line length for ruff and pylint
+            pylint_rcfile: pylint configuration file
+            jobs: pylint worker processes, 0 for one per CPU
+        """
+        self.line_length = line_length
+        self.pylint_rcfile = pylint_rcfile
+        self.jobs = jobs
+        self.selected: Set[str] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def check_argv(self) -> List[str]:
+        """Command fixing, sorting imports and reporting with ruff check."""
+        overrides = [f"--config={setting}" for setting in GOOGLE_ISORT_SETTINGS]
+        return [
+            "ruff",
+            "check",
+            "--fix",
+            "--force-exclude",
+            "--extend-select",
+            "I",
+            *overrides,
+            "--line-length",
+            str(self.line_length),
+            "--output-format=json",
+        ]
+
+    @property
+    def format_argv(self) -> List[str]:
+        """Command formatting with ruff format."""
+        return [
+            "ruff",
+            "format",
+            "--force-exclude",
+            "--line-length",
+            str(self.line_length),
+        ]
+
+    @property
+    def pylint_argv(self) -> List[str]:
+        """Command linting with pylint in parallel jobs."""
+        return [
+            "pylint",
+            f"--rcfile={self.pylint_rcfile}",
+            f"--max-line-length={self.line_length}",
+            f"--jobs={self.jobs}",
+        ]
+
+    def run_ruff(self, files: List[str], root: str = ".") -> Tuple[int, str]:
+        """Fix, sort imports, report and format one batch.
+
+        Args:
+            files: Batch of Python files relative to root
+            root: Repository directory
+
+        Returns:
+            (returncode, output) with one ``path:row:col: CODE message``
+            line per remaining diagnostic
+        """
+        before = stat_snapshot(files, root)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            report = os.path.join(tmpdir, "ruff.json")
+            code, output = run_tool(
+                [*self.check_argv, f"--output-file={report}", *files], root
+            )
+            text = ""
+            with contextlib.suppress(OSError), open(report) as f:
+                text = f.read()
+        diagnostics = parse_ruff_json(text, root)
+        format_code, format_output = run_tool([*self.format_argv, *files], root)
+
+        with self._lock:
+            self.selected.update(rewritten_files(before, root))
+            self.selected.update(d["path"] for d in diagnostics)
+
+        lines = [
+            f"{d['path']}:{d['row']}:{d['column']}: {d['code']} {d['message']}"
+            for d in diagnostics
+        ]
+        lines += [line for line in (output, format_output) if line]
+        return max(code, format_code), "\n".join(lines)
+
+    def run_pylint(self, files: List[str], root: str = ".") -> Tuple[int, str]:
+        """Lint the files of a batch that ruff rewrote or flagged.
+
+        Args:
+            files: Batch of Python files relative to root
+            root: Repository directory
+
+        Returns:
+            (returncode, output) of pylint, or (0, note) if ruff left
+            every file of the batch untouched and clean
+        """
+        with self._lock:
+            chosen = [path for path in files if path in self.selected]
+        if not chosen:
+            return 0, f"ruff left all {len(files)} files untouched and clean"
+        return run_tool([*self.pylint_argv, *chosen], root)
+
+
+def legacy_commands(line_length: int, pylint_rcfile: str) -> List[List[str]]:
+    """The five-pass Python chain the fused pipeline replaced.
+
+    Args:
+        line_length: Maximum line length
+        pylint_rcfile: pylint configuration file
+
+    Returns:
+        Commands in the order they ran, files not appended
+    """
+    length = ["--line-length", str(line_length)]
+    return [
+        ["ruff", "format", "--force-exclude", *length],
+        ["ruff", "check", "--fix", "--force-exclude", *length],
+        ["isort", "--profile", "google", "--filter-files", *length],
+        [
+            "pylint",
+            f"--rcfile={pylint_rcfile}",
+            f"--max-line-length={line_length}",
+        ],
+        [
+            "ruff",
+            "check",
+            "--force-exclude",
+            "--output-format=concise",
+            *length,
+        ],
+    ]
+
+
+def _copy_sample(files: Iterable[str], root: str, destination: str) -> None:
+    """Copy Python files and the configs that affect them."""
+    for path in [*files, *BENCH_CONFIGS]:
+        source = os.path.join(root, path)
+        if not os.path.isfile(source):
+            continue
+        target = os.path.join(destination, path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(source, target)
+
+
+def _run_legacy(
+    files: List[str], root: str, line_length: int, rcfile: str
+) -> Dict[str, int]:
+    """Run the legacy chain over the files in batches."""
+    codes = {}
+    for argv in legacy_commands(line_length, rcfile):
+        for start in range(0, len(files), BENCH_BATCH_SIZE):
+            batch = files[start : start + BENCH_BATCH_SIZE]
+            code, _ = run_tool([*argv, *batch], root)
+            codes[argv[0]] = max(codes.get(argv[0], 0), code)
+    return codes
+
+
+def _run_fused(
+    files: List[str], root: str, line_length: int, rcfile: str
+) -> Dict[str, int]:
+    """Run the fused pipeline over the files in batches."""
+    pipeline = PythonPipeline(line_length, rcfile)
+    codes = {"ruff": 0, "pylint": 0}
+    batches = [
+        files[start : start + BENCH_BATCH_SIZE]
+        for start in range(0, len(files), BENCH_BATCH_SIZE)
+    ]
+    for batch in batches:
+        codes["ruff"] = max(codes["ruff"], pipeline.run_ruff(batch, root)[0])
+    for batch in batches:
+        code = pipeline.run_pylint(batch, root)[0]
+        codes["pylint"] = max(codes["pylint"], code)
+    return codes
+
+
+def benchmark(
+    root: str,
+    rounds: int = 3,
+    line_length: int = 88,
+    pylint_rcfile: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Time the legacy and fused paths on copies of a tree's Python files.
+
+    Every round formats a fresh copy, so both paths see the same
+    unformatted input.
+
+    Args:
+        root: Repository whose Python files are the sample
+        rounds: Timed runs of each path
+        line_length: Maximum line length
+        pylint_rcfile: pylint configuration, defaults to the shipped one
+
+    Returns:
+        Per path: median seconds, files per second and the worst exit
+        code of each command (127 when a tool is not installed)
+    """
+    rcfile = pylint_rcfile or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "configs", "pylintrc"
+    )
+    files = discover_files(root, ["python"])["python"]
+    results: Dict[str, Any] = {"files": len(files), "rounds": rounds}
+    for name, run in (("legacy", _run_legacy), ("fused", _run_fused)):
+        samples = []
+        codes: Dict[str, int] = {}
+        for _ in range(rounds):
+            with tempfile.TemporaryDirectory() as sample:
+                _copy_sample(files, root, sample)
+                start = time.monotonic()
+                codes = run(files, sample, line_length, rcfile)
+                samples.append(time.monotonic() - start)
+        median = statistics.median(samples) if samples else 0.0
+        results[name] = {
+            "median": median,
+            "files_per_second": len(files) / median if median else None,
+            "exit_codes": codes,
+        }
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point for the Python pipeline CLI.
+
+    Args:
+        argv: Command line arguments, defaults to sys.argv
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(
+        description="Fused Python formatting pipeline for Auto Formatter"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    bench = subparsers.add_parser(
+        "bench", help="Compare the legacy five-pass chain with the pipeline"
+    )
+    bench.add_argument("--root", default=".", help="Repository to sample")
+    bench.add_argument("--rounds", type=int, default=3, help="Runs per path")
+    bench.add_argument("--line-length", type=int, default=88)
+    bench.add_argument("--json", action="store_true", help="Print JSON")
+
+    args = parser.parse_args(argv)
+    results = benchmark(args.root, args.rounds, args.line_length)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"📊 {results['files']} Python files, {args.rounds} rounds")
+    for name in ("legacy", "fused"):
+        row = results[name]
+        rate = row["files_per_second"]
+        rate_text = f"{rate:.0f} files/s" if rate is not None else "-"
+        print(f"  {name:<6} {row['median']:.2f}s  {rate_text}")
+        missing = [
+            tool for tool, code in row["exit_codes"].items() if code == 127
+        ]
+        if missing:
+            print(f"  ⚠️  {name}: not installed: {', '.join(missing)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""# file: scripts/shard_patches.py
+Shard patch export and merge for the Auto Formatter GitHub Action
+
+A sharded run formats one slice of the repository per runner (see
+``file_discovery.py scan --shard-index``). Instead of pushing, each shard
+exports its formatting changes as a binary git patch; a final job
+downloads every shard's patch and applies them together, so the run still
+ends in the single auto-format commit an unsharded run makes.
+
+Shards own disjoint files, so their patches never overlap; two patches
+changing the same file mean the shards were cut from different commits
+and the merge is refused. The series is checked before anything is
+written, so it applies completely or not at all.
+
+Usage:
+    python scripts/shard_patches.py export --output shard-0.patch
+    python scripts/shard_patches.py apply --patch-dir patches/
+"""
+
+import argparse
+import glob
+import os
+import sys
+from typing import Dict, List, Optional
+
+from file_discovery import GitError, run_git, write_github_output
+
+# File name pattern of exported patches inside a patch directory
+PATCH_GLOB = "*.patch"
+
+
+def export_patch(root: str, output: str) -> int:
+    """Write the working tree's changes below root as a binary patch.
+
+    Paths in the patch are relative to the top of the work tree, so it
+    applies from any directory of another checkout of the same commit.
+
+    Args:
+        root: Directory whose changes are exported
+        output: Patch file to write
+
+    Returns:
+        Size of the patch in bytes (0 when nothing changed)
+
+    Raises:
+        GitError: If root is not in a git work tree
+    """
+    patch = run_git(root, "diff", "--binary", "HEAD", "--", ".")
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(output, "wb") as f:
+        f.write(patch)
+    return len(patch)
+
+
+def find_patches(patch_dir: str) -> List[str]:
+    """List the non-empty patches in a directory tree.
+
+    Artifact downloads put each shard's patch in its own subdirectory, so
+    the search is recursive. Shards that changed nothing export empty
+    patches, which ``git apply`` rejects, so they are left out.
+
+    Args:
+        patch_dir: Directory to search
+
+    Returns:
+        Patch paths, sorted
+    """
+    pattern = os.path.join(patch_dir, "**", PATCH_GLOB)
+    return sorted(
+        path
+        for path in glob.glob(pattern, recursive=True)
+        if os.path.isfile(path) and os.path.getsize(path) > 0
+    )
+
+
+def patch_files(root: str, patch: str) -> List[str]:
+    """List the files a patch changes.
+
+    Args:
+        root: Directory inside the work tree
+        patch: Patch file
+
+    Returns:
+        Changed paths, relative to the top of the work tree
+
+    Raises:
+        GitError: If the patch cannot be parsed
+    """
+    numstat = run_git(root, "apply", "--numstat", "-z", patch)
+    # Records are "<added>\t<deleted>\t<path>\0"; renames are never
+    # exported since formatters edit files in place
+    return [
+        record.split(b"\t", 2)[2].decode("utf-8", "surrogateescape")
+        for record in numstat.split(b"\0")
+        if record.count(b"\t") >= 2
+    ]
+
+
+def apply_patches(root: str, patches: List[str]) -> None:
+    """Apply shard patches to the work tree, all or nothing.
+
+    Args:
+        root: Directory inside the work tree
+        patches: Patch files from export_patch
+
+    Raises:
+        GitError: If any patch does not apply
+    """
+    if not patches:
+        return
+    top = run_git(root, "rev-parse", "--show-toplevel").decode().strip()
+    paths = [os.path.abspath(path) for path in patches]
+    owners: Dict[str, str] = {}
+    for path in paths:
+        for changed in patch_files(top, path):
+            if changed in owners:
+                raise GitError(
+                    f"{changed} is changed by both {owners[changed]} and "
+                    f"{path}; were the shards cut from the same commit?"
+                )
+            owners[changed] = path
+    # git apply writes the patches before a failing one, so check the
+    # whole series first
+    run_git(top, "apply", "--check", *paths)
+    run_git(top, "apply", "--whitespace=nowarn", *paths)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point for the shard patch CLI.
+
+    Args:
+        argv: Command line arguments, defaults to sys.argv
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(
+        description="Export and merge Auto Formatter shard patches"
+    )
+    parser.add_argument("--root", default=".", help="Repository directory")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export = subparsers.add_parser(
+        "export", help="Write this shard's changes as a patch"
+    )
+    export.add_argument("--output", required=True, help="Patch file to write")
+
+    apply = subparsers.add_parser(
+        "apply", help="Apply every shard patch in a directory"
+    )
+    apply.add_argument(
+        "--patch-dir", required=True, help="Directory of downloaded patches"
+    )
+
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "export":
+            size = export_patch(args.root, args.output)
+            write_github_output({"patch": args.output, "bytes": size})
+            print(f"📤 Exported {size} byte patch to {args.output}")
+            return 0
+
+        patches = find_patches(args.patch_dir)
+        apply_patches(args.root, patches)
+    except GitError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    print(f"📥 Applied {len(patches)} shard patches from {args.patch_dir}")
+    write_github_output({"applied": len(patches)})
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
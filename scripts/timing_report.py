@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""# file: scripts/timing_report.py
+Timing instrumentation for the Auto Formatter GitHub Action
+
+Every timed unit of work (a tool install, an action step, one formatter or
+linter batch) appends one JSON object to an NDJSON report: wall time, file
+count, bytes processed, exit code and the peak RSS of the process, read
+from ``os.wait4``. The ``summary`` command renders the report as Markdown
+tables for ``$GITHUB_STEP_SUMMARY`` and exposes its path as a step output.
+
+Usage:
+    python scripts/timing_report.py run --category install --name ruff -- \
+        pip install ruff
+    python scripts/timing_report.py record --name setup --since 1700000000
+    python scripts/timing_report.py --report timing.ndjson summary
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from file_discovery import write_github_output
+
+# Environment variable holding the report path, so every step and the
+# format runner append to the same file
+TIMING_ENV = "AUTO_FORMATTER_TIMING"
+
+# Categories of timed work, in the order the summary lists them
+CATEGORIES = ("step", "install", "tool", "extension")
+
+# ru_maxrss is reported in KiB on Linux and in bytes on macOS
+RSS_SCALE = 1 if sys.platform == "darwin" else 1024
+
+# Rows of the per-tool table in the step summary
+SUMMARY_TOP_TOOLS = 25
+
+
+def _exit_code(status: int) -> int:
+    """Convert a wait status to a returncode like subprocess does."""
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def run_timed(
+    argv: List[str],
+    cwd: Optional[str] = None,
+    capture: bool = True,
+    env: Optional[Dict[str, str]] = None,
+) -> Tuple[int, str, float, Optional[int]]:
+    """Run a command and measure it.
+
+    The child is reaped with ``os.wait4`` so its peak RSS is known; where
+    that is unavailable (Windows) RSS is None.
+
+    Args:
+        argv: Command to run
+        cwd: Working directory
+        capture: Collect stdout and stderr (interleaved) instead of
+            passing them through
+        env: Environment of the child, defaults to ours
+
+    Returns:
+        (returncode, output, seconds, peak RSS in bytes)
+
+    Raises:
+        OSError: If the command cannot be started
+    """
+    start = time.monotonic()
+    stream = subprocess.PIPE if capture else None
+    proc = subprocess.Popen(
+        argv,
+        cwd=cwd,
+        env=env,
+        stdout=stream,
+        stderr=subprocess.STDOUT if capture else None,
+    )
+    output = b""
+    if capture:
+        output = proc.stdout.read()
+        proc.stdout.close()
+
+    rss = None
+    if hasattr(os, "wait4"):
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = _exit_code(status)
+        rss = usage.ru_maxrss * RSS_SCALE
+    else:
+        proc.wait()
+    seconds = time.monotonic() - start
+    text = output.decode("utf-8", errors="replace").strip()
+    return proc.returncode, text, seconds, rss
+
+
+def run_tool(argv: List[str], cwd: str) -> Tuple[int, str]:
+    """Run a command, turning a missing executable into exit code 127.
+
+    Args:
+        argv: Command to run
+        cwd: Working directory
+
+    Returns:
+        (returncode, output)
+    """
+    try:
+        code, output, _, _ = run_timed(argv, cwd=cwd)
+    except OSError as e:
+        return 127, f"{argv[0]}: {e}"
+    return code, output
+
+
+def file_bytes(paths: Iterable[str], root: str = ".") -> int:
+    """Total size of the files that exist.
+
+    Args:
+        paths: Files relative to root
+        root: Repository directory
+
+    Returns:
+        Sum of the file sizes in bytes
+    """
+    total = 0
+    for path in paths:
+        with contextlib.suppress(OSError):
+            total += os.path.getsize(os.path.join(root, path))
+    return total
+
+
+class TimingReport:
+    """Append-only NDJSON report shared by threads and processes."""
+
+    def __init__(self, path: str):
+        """Initialize the report.
+
+        Args:
+            path: NDJSON file to append records to
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        category: str,
+        name: str,
+        seconds: float,
+        exit_code: Optional[int] = None,
+        max_rss: Optional[int] = None,
+        **fields: Any,
+    ) -> Dict[str, Any]:
+        """Append one record.
+
+        Args:
+            category: One of CATEGORIES
+            name: What was timed, e.g. "python: ruff format [1/3]"
+            seconds: Wall time
+            exit_code: Process exit code, None if nothing ran
+            max_rss: Peak resident set size in bytes
+            **fields: Extra fields such as language, tool, files, bytes
+
+        Returns:
+            The record written
+        """
+        record = {
+            "category": category,
+            "name": name,
+            "seconds": round(seconds, 3),
+            "exit_code": exit_code,
+            "max_rss_bytes": max_rss,
+            "finished_at": round(time.time(), 3),
+            **fields,
+        }
+        line = json.dumps(record, sort_keys=True) + "\n"
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # One write per O_APPEND open keeps lines whole across processes
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+        return record
+
+
+def load_report(path: str) -> List[Dict[str, Any]]:
+    """Read an NDJSON report, skipping malformed lines.
+
+    Args:
+        path: Report file
+
+    Returns:
+        Records in the order they were written
+    """
+    records = []
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    return records
+
+
+def _mib(value: Optional[int]) -> str:
+    """Format a byte count as MiB for the tables."""
+    if value is None:
+        return "-"
+    return f"{value / (1024 * 1024):.1f}"
+
+
+def _aggregate(
+    records: Iterable[Dict[str, Any]], key: Tuple[str, ...]
+) -> List[Dict[str, Any]]:
+    """Sum records sharing the same key fields, slowest first."""
+    groups: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+    for record in records:
+        group_key = tuple(record.get(k) for k in key)
+        group = groups.setdefault(
+            group_key,
+            {
+                **dict(zip(key, group_key)),
+                "runs": 0,
+                "files": 0,
+                "bytes": 0,
+                "seconds": 0.0,
+                "max_rss_bytes": None,
+                "failures": 0,
+            },
+        )
+        group["runs"] += 1
+        group["files"] += record.get("files") or 0
+        group["bytes"] += record.get("bytes") or 0
+        group["seconds"] += record.get("seconds") or 0.0
+        if record.get("exit_code"):
+            group["failures"] += 1
+        rss = record.get("max_rss_bytes")
+        if rss is not None:
+            group["max_rss_bytes"] = max(group["max_rss_bytes"] or 0, rss)
+    return sorted(groups.values(), key=lambda g: -g["seconds"])
+
+
+def _extension_table(records: List[Dict[str, Any]]) -> List[str]:
+    """Markdown lines of the per-extension table, empty without records."""
+    if not records:
+        return []
+    lines = [
+        "### Extensions",
+        "",
+        "| Extension | Tool | Files | Changed | Cached | Time (s) |",
+        "| --- | --- | ---: | ---: | ---: | ---: |",
+    ]
+    for row in records:
+        lines.append(
+            f"| {row['name']} | {row.get('tool', '-')} | "
+            f"{row.get('files', 0)} | {row.get('changed', 0)} | "
+            f"{row.get('cached', 0)} | {row['seconds']:.1f} |"
+        )
+    lines.append("")
+    return lines
+
+
+def render_markdown(records: List[Dict[str, Any]]) -> str:
+    """Render report records as Markdown tables.
+
+    Args:
+        records: Records from load_report
+
+    Returns:
+        Markdown for $GITHUB_STEP_SUMMARY
+    """
+    lines = ["## ⏱️ Auto Formatter timing", ""]
+    if not records:
+        lines.append("No timing data was recorded.")
+        return "\n".join(lines) + "\n"
+
+    by_category: Dict[str, List[Dict[str, Any]]] = {}
+    for record in records:
+        by_category.setdefault(record.get("category"), []).append(record)
+
+    for category, title in (("step", "Steps"), ("install", "Installs")):
+        rows = by_category.get(category)
+        if not rows:
+            continue
+        lines += [
+            f"### {title}",
+            "",
+            "| Name | Time (s) | Exit | Peak RSS (MiB) | Cache |",
+            "| --- | ---: | ---: | ---: | --- |",
+        ]
+        for row in rows:
+            lines.append(
+                f"| {row['name']} | {row['seconds']:.1f} | "
+                f"{row.get('exit_code', '-')} | "
+                f"{_mib(row.get('max_rss_bytes'))} | {row.get('cache', '-')} |"
+            )
+        lines.append("")
+
+    tools = by_category.get("tool", [])
+    if tools:
+        lines += [
+            "### Languages",
+            "",
+            "| Language | Tool runs | Files | MiB | CPU time (s) | Failures |",
+            "| --- | ---: | ---: | ---: | ---: | ---: |",
+        ]
+        for row in _aggregate(tools, ("language",)):
+            lines.append(
+                f"| {row['language']} | {row['runs']} | {row['files']} | "
+                f"{_mib(row['bytes'])} | {row['seconds']:.1f} | "
+                f"{row['failures']} |"
+            )
+        lines += [
+            "",
+            "### Slowest tools",
+            "",
+            (
+                "| Language | Tool | Batches | Files | Time (s) | "
+                "Peak RSS (MiB) | Failures |"
+            ),
+            "| --- | --- | ---: | ---: | ---: | ---: | ---: |",
+        ]
+        for row in _aggregate(tools, ("language", "tool"))[:SUMMARY_TOP_TOOLS]:
+            lines.append(
+                f"| {row['language']} | {row['tool']} | {row['runs']} | "
+                f"{row['files']} | {row['seconds']:.1f} | "
+                f"{_mib(row['max_rss_bytes'])} | {row['failures']} |"
+            )
+        lines.append("")
+    lines += _extension_table(by_category.get("extension", []))
+    return "\n".join(lines)
+
+
+def run_command(args: argparse.Namespace) -> int:
+    """Run and time a command, passing its output through.
+
+    Args:
+        args: Parsed CLI arguments
+
+    Returns:
+        The command's exit code
+    """
+    argv = args.command
+    if argv and argv[0] == "--":
+        argv = argv[1:]
+    if not argv:
+        print("❌ No command given", file=sys.stderr)
+        return 2
+
+    try:
+        code, _, seconds, rss = run_timed(argv, capture=False)
+    except OSError as e:
+        print(f"❌ {argv[0]}: {e}", file=sys.stderr)
+        code, seconds, rss = 127, 0.0, None
+
+    report = TimingReport(args.report) if args.report else None
+    if report is not None:
+        report.add(
+            args.category, args.name or " ".join(argv), seconds, code, rss
+        )
+    return code
+
+
+def record_command(args: argparse.Namespace) -> int:
+    """Record the time elapsed since a timestamp.
+
+    Used for work that does not run through this script, such as the
+    setup actions.
+
+    Args:
+        args: Parsed CLI arguments
+
+    Returns:
+        Process exit code
+    """
+    if args.report:
+        seconds = max(time.time() - args.since, 0.0)
+        TimingReport(args.report).add(args.category, args.name, seconds)
+    return 0
+
+
+def summary_command(args: argparse.Namespace) -> int:
+    """Write the step summary and the report output.
+
+    Args:
+        args: Parsed CLI arguments
+
+    Returns:
+        Process exit code
+    """
+    if not args.report:
+        print("❌ No report file (--report or AUTO_FORMATTER_TIMING)")
+        return 2
+
+    records = load_report(args.report)
+    markdown = render_markdown(records)
+    summary_path = os.getenv("GITHUB_STEP_SUMMARY")
+    if summary_path:
+        with open(summary_path, "a", encoding="utf-8") as f:
+            f.write(markdown + "\n")
+    else:
+        print(markdown)
+
+    total = sum(
+        r.get("seconds") or 0 for r in records if r.get("category") == "step"
+    )
+    write_github_output(
+        {"report": args.report, "total-seconds": round(total, 1)}
+    )
+    print(f"📊 {len(records)} timing records in {args.report}")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point for the timing report CLI.
+
+    Args:
+        argv: Command line arguments, defaults to sys.argv
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(
+        description="Timing instrumentation for Auto Formatter"
+    )
+    parser.add_argument(
+        "--report",
+        default=os.getenv(TIMING_ENV),
+        help=f"NDJSON report file (default: ${TIMING_ENV})",
+    )
+    subparsers = parser.add_subparsers(dest="command_name", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run and time a command")
+    run_parser.add_argument("--name", help="Record name (default: command)")
+    run_parser.add_argument(
+        "--category", choices=CATEGORIES, default="step", help="Record category"
+    )
+    run_parser.add_argument("command", nargs=argparse.REMAINDER)
+
+    record_parser = subparsers.add_parser(
+        "record", help="Record the time elapsed since a timestamp"
+    )
+    record_parser.add_argument("--name", required=True, help="Record name")
+    record_parser.add_argument(
+        "--category", choices=CATEGORIES, default="step", help="Record category"
+    )
+    record_parser.add_argument(
+        "--since", type=float, required=True, help="Start time (Unix epoch)"
+    )
+
+    subparsers.add_parser("summary", help="Render the step summary")
+
+    args = parser.parse_args(argv)
+    commands = {
+        "run": run_command,
+        "record": record_command,
+        "summary": summary_command,
+    }
+    return commands[args.command_name](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,648 @@
+#!/usr/bin/env python3
+"""# file: scripts/tool_installer.py
+Pinned, cached tool installs for the Auto Formatter GitHub Action
+
+Tool versions are pinned in ``scripts/tools.json``. Each tool installs into
+a content-addressed directory of a tool store: the directory name is a
+hash of the tool's manifest entry, the installing runtime and the
+platform, so a store restored with ``actions/cache`` is reused as-is and a
+changed pin installs next to the old one instead of over it. Only the
+tools the job graph will actually run are installed: the plan is built
+from the discovered file lists with the same ``build_tasks`` as the
+format runner.
+
+Usage:
+    python scripts/tool_installer.py plan --list-dir "$RUNNER_TEMP/files"
+    python scripts/tool_installer.py install --list-dir "$RUNNER_TEMP/files"
+    python scripts/tool_installer.py install --tools ruff,prettier
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import os
+import platform
+import shutil
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from file_discovery import write_github_output
+from format_runner import (
+    RunnerOptions,
+    build_tasks,
+    enabled_languages,
+    load_buckets,
+)
+from timing_report import TIMING_ENV, TimingReport, run_timed
+
+# Pinned tool manifest shipped with the action
+MANIFEST_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "tools.json"
+)
+
+# Tool store restored and saved with actions/cache; the path must be the
+# same on every run because virtualenv scripts embed it
+DEFAULT_STORE = os.path.join(
+    os.path.expanduser("~"), ".cache", "auto-formatter-tools"
+)
+
+# Marker written last into a store entry; entries without it are partial
+COMPLETE_MARKER = ".complete"
+
+# Dated CRAN snapshots pin R package versions
+CRAN_SNAPSHOT_URL = "https://packagemanager.posit.co/cran/{date}"
+
+# Concurrent installs; pip, go and npm installs are mostly network bound
+INSTALL_WORKERS = 4
+
+# Runtime each installer needs, named like the action's setup steps
+INSTALLER_RUNTIMES = {"pip": "python", "go": "go", "npm": "node", "cran": "r"}
+
+# Runtimes the tools of a runner language need while running, e.g. go mod
+# tidy and golangci-lint call the Go toolchain
+LANGUAGE_RUNTIMES = {"go": "go", "csharp": "dotnet", "swift": "swift", "r": "r"}
+
+
+def load_manifest(path: str = MANIFEST_PATH) -> Dict[str, Dict[str, Any]]:
+    """Read the pinned tool manifest.
+
+    Args:
+        path: Manifest file
+
+    Returns:
+        Tool entries by name
+    """
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["tools"]
+
+
+def runtime_id(installer: str) -> str:
+    """Describe what an installer's output depends on besides the pins.
+
+    Args:
+        installer: Manifest installer name
+
+    Returns:
+        Platform, and for pip the Python the virtualenv is built from
+    """
+    parts = [sys.platform, platform.machine()]
+    if installer == "pip":
+        parts += [platform.python_version(), sys.executable]
+    return " ".join(parts)
+
+
+def entry_digest(name: str, entry: Dict[str, Any]) -> str:
+    """Content address of a tool's store directory.
+
+    Args:
+        name: Tool name
+        entry: Manifest entry
+
+    Returns:
+        Hex digest of the entry, its installer runtime and the platform
+    """
+    payload = json.dumps(
+        {
+            "name": name,
+            "entry": entry,
+            "runtime": runtime_id(entry["installer"]),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def required_tools(
+    manifest: Dict[str, Dict[str, Any]],
+    executables: Iterable[str],
+    languages: Iterable[str],
+) -> List[str]:
+    """Select the manifest tools a job graph needs.
+
+    Args:
+        manifest: Tool entries by name
+        executables: Commands the tasks run
+        languages: Languages the tasks belong to
+
+    Returns:
+        Tool names in manifest order
+    """
+    executables = set(executables)
+    languages = set(languages)
+    return [
+        name
+        for name, entry in manifest.items()
+        if executables & set(entry.get("bin", ()))
+        or languages & set(entry.get("languages", ()))
+    ]
+
+
+def required_runtimes(
+    manifest: Dict[str, Dict[str, Any]],
+    names: Iterable[str],
+    languages: Iterable[str],
+) -> List[str]:
+    """Runtimes the action must set up for the selected tools.
+
+    Args:
+        manifest: Tool entries by name
+        names: Selected tool names
+        languages: Languages the planned tasks belong to
+
+    Returns:
+        Sorted runtime names (python, go, node, dotnet, swift, r)
+    """
+    runtimes = {
+        INSTALLER_RUNTIMES[manifest[name]["installer"]]
+        for name in names
+        if manifest[name]["installer"] in INSTALLER_RUNTIMES
+    }
+    runtimes.update(
+        LANGUAGE_RUNTIMES[language]
+        for language in languages
+        if language in LANGUAGE_RUNTIMES
+    )
+    return sorted(runtimes)
+
+
+def plan_tools(
+    list_dir: str,
+    languages: str,
+    root: str = ".",
+    enable_linting: bool = True,
+    fail_on_lint_errors: bool = False,
+    whole_tree: bool = True,
+) -> Tuple[Set[str], Set[str]]:
+    """Find the commands and languages the format runner will run.
+
+    Args:
+        list_dir: Discovery list directory
+        languages: The action's languages input
+        root: Repository directory
+        enable_linting: Whether linters run
+        fail_on_lint_errors: Whether lint failures fail the run
+        whole_tree: Whether whole-tree tools run (not in later shards)
+
+    Returns:
+        (executables, languages) of the planned tasks
+    """
+    options = RunnerOptions(
+        root=root,
+        enable_linting=enable_linting,
+        fail_on_lint_errors=fail_on_lint_errors,
+        whole_tree=whole_tree,
+    )
+    tasks = build_tasks(
+        enabled_languages(languages), load_buckets(list_dir), options
+    )
+    # In-process tools need nothing installed unless they name a command
+    executables = {
+        task.tool.executable or task.tool.argv[0]
+        for task in tasks
+        if task.tool.executable or task.tool.function is None
+    }
+    executables.update(name for task in tasks for name in task.tool.requires)
+    return executables, {task.language for task in tasks}
+
+
+class ToolStore:
+    """Content-addressed directory of installed tools."""
+
+    def __init__(self, path: str = DEFAULT_STORE):
+        """Initialize the store.
+
+        Args:
+            path: Store directory; tools live in ``<path>/<digest>`` and
+                their commands are linked into ``<path>/bin``
+        """
+        self.path = path
+        self.bin_dir = os.path.join(path, "bin")
+
+    def entry_dir(self, digest: str) -> str:
+        """Directory of one installed tool."""
+        return os.path.join(self.path, digest)
+
+    def is_installed(self, digest: str) -> bool:
+        """Whether a complete install of the digest exists."""
+        return os.path.exists(
+            os.path.join(self.entry_dir(digest), COMPLETE_MARKER)
+        )
+
+    def install_commands(
+        self, entry: Dict[str, Any], directory: str
+    ) -> List[Tuple[List[str], Optional[Dict[str, str]]]]:
+        """Commands that install an entry into a directory.
+
+        Args:
+            entry: Manifest entry
+            directory: Target store directory
+
+        Returns:
+            (argv, environment or None) pairs to run in order
+
+        Raises:
+            ValueError: For an unknown installer
+        """
+        installer = entry["installer"]
+        packages = entry.get("packages", {})
+        if installer == "pip":
+            python = os.path.join(directory, "bin", "python")
+            pins = [f"{name}=={version}" for name, version in packages.items()]
+            return [
+                ([sys.executable, "-m", "venv", directory], None),
+                (
+                    [
+                        python,
+                        "-m",
+                        "pip",
+                        "install",
+                        "--disable-pip-version-check",
+                        "--no-input",
+                        *pins,
+                    ],
+                    None,
+                ),
+            ]
+        if installer == "go":
+            env = {**os.environ, "GOBIN": os.path.join(directory, "bin")}
+            return [
+                (["go", "install", f"{name}@{version}"], env)
+                for name, version in packages.items()
+            ]
+        if installer == "npm":
+            pins = [f"{name}@{version}" for name, version in packages.items()]
+            return [
+                (
+                    [
+                        "npm",
+                        "install",
+                        "--prefix",
+                        directory,
+                        "--no-audit",
+                        "--no-fund",
+                        *pins,
+                    ],
+                    None,
+                )
+            ]
+        if installer == "cran":
+            library = os.path.join(directory, "library").replace("'", "\\'")
+            commands = []
+            by_date: Dict[str, List[str]] = {}
+            for name, date in packages.items():
+                by_date.setdefault(date, []).append(f"'{name}'")
+            for date, names in by_date.items():
+                repos = CRAN_SNAPSHOT_URL.format(date=date)
+                script = (
+                    f"dir.create('{library}', recursive = TRUE); "
+                    f"install.packages(c({', '.join(names)}), "
+                    f"lib = '{library}', repos = '{repos}')"
+                )
+                commands.append((["Rscript", "-e", script], None))
+            return commands
+        raise ValueError(f"Unknown installer: {installer}")
+
+    def bin_paths(self, entry: Dict[str, Any], directory: str) -> List[str]:
+        """Installed command paths of an entry."""
+        installer = entry["installer"]
+        if installer == "npm":
+            bin_dir = os.path.join(directory, "node_modules", ".bin")
+        else:
+            bin_dir = os.path.join(directory, "bin")
+        return [os.path.join(bin_dir, name) for name in entry.get("bin", ())]
+
+    def install(
+        self, name: str, entry: Dict[str, Any]
+    ) -> Tuple[str, int, str, float, Optional[int]]:
+        """Install one tool unless the store already has it.
+
+        Args:
+            name: Tool name
+            entry: Manifest entry
+
+        Returns:
+            (cache state "warm"/"cold"/"system", exit code, output,
+            seconds, peak RSS in bytes)
+        """
+        if entry["installer"] == "system":
+            return self._install_system(entry)
+
+        digest = entry_digest(name, entry)
+        directory = self.entry_dir(digest)
+        if self.is_installed(digest):
+            self._link(entry, directory)
+            return "warm", 0, "", 0.0, None
+
+        # A partial directory is from an interrupted install
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+        code, outputs, seconds, peak = 0, [], 0.0, None
+        for argv, env in self.install_commands(entry, directory):
+            try:
+                code, output, elapsed, rss = run_timed(argv, env=env)
+            except OSError as e:
+                code, output, elapsed, rss = 127, f"{argv[0]}: {e}", 0.0, None
+            outputs.append(output)
+            seconds += elapsed
+            if rss is not None:
+                peak = max(peak or 0, rss)
+            if code != 0:
+                break
+
+        if code == 0:
+            with open(os.path.join(directory, COMPLETE_MARKER), "w") as f:
+                f.write(f"{name}\n")
+            self._link(entry, directory)
+        return "cold", code, "\n".join(o for o in outputs if o), seconds, peak
+
+    def _install_system(
+        self, entry: Dict[str, Any]
+    ) -> Tuple[str, int, str, float, Optional[int]]:
+        """Use a tool from PATH, running the platform fallback if absent."""
+        if all(shutil.which(command) for command in entry.get("bin", ())):
+            return "system", 0, "", 0.0, None
+        commands = entry.get("fallback", {}).get(sys.platform, [])
+        if not commands:
+            return (
+                "system",
+                1,
+                "no install command for this platform",
+                0.0,
+                None,
+            )
+        code, outputs, seconds = 0, [], 0.0
+        for argv in commands:
+            try:
+                code, output, elapsed, _ = run_timed(argv)
+            except OSError as e:
+                code, output, elapsed = 127, f"{argv[0]}: {e}", 0.0
+            outputs.append(output)
+            seconds += elapsed
+            if code != 0:
+                break
+        return "cold", code, "\n".join(o for o in outputs if o), seconds, None
+
+    def _link(self, entry: Dict[str, Any], directory: str) -> None:
+        """Link an entry's commands into the store's bin directory."""
+        os.makedirs(self.bin_dir, exist_ok=True)
+        for target in self.bin_paths(entry, directory):
+            link = os.path.join(self.bin_dir, os.path.basename(target))
+            if os.path.lexists(link):
+                os.remove(link)
+            os.symlink(target, link)
+
+    def prune(self, keep: Iterable[str]) -> List[str]:
+        """Remove store entries that are not in keep.
+
+        Args:
+            keep: Digests to keep
+
+        Returns:
+            Removed digests
+        """
+        keep = set(keep) | {"bin"}
+        removed = []
+        if not os.path.isdir(self.path):
+            return removed
+        for name in sorted(os.listdir(self.path)):
+            if name not in keep:
+                shutil.rmtree(os.path.join(self.path, name), ignore_errors=True)
+                removed.append(name)
+        return removed
+
+
+def environment_exports(
+    store: ToolStore, manifest: Dict[str, Dict[str, Any]], names: Iterable[str]
+) -> Dict[str, str]:
+    """Environment later steps need to find the installed tools.
+
+    Args:
+        store: Tool store
+        manifest: Tool entries by name
+        names: Installed tool names
+
+    Returns:
+        Variables to append to $GITHUB_ENV: NODE_PATH so eslint resolves
+        its plugins, R_LIBS for the R packages
+    """
+    node_paths, r_libs = [], []
+    for name in names:
+        entry = manifest[name]
+        directory = store.entry_dir(entry_digest(name, entry))
+        if entry["installer"] == "npm":
+            node_paths.append(os.path.join(directory, "node_modules"))
+        elif entry["installer"] == "cran":
+            r_libs.append(os.path.join(directory, "library"))
+
+    exports = {}
+    for variable, paths in (("NODE_PATH", node_paths), ("R_LIBS", r_libs)):
+        if paths:
+            existing = os.getenv(variable)
+            exports[variable] = os.pathsep.join(
+                paths + ([existing] if existing else [])
+            )
+    return exports
+
+
+def cache_keys(
+    manifest: Dict[str, Dict[str, Any]], names: Iterable[str]
+) -> Tuple[str, str]:
+    """actions/cache key for a selection of tools.
+
+    Args:
+        manifest: Tool entries by name
+        names: Selected tool names
+
+    Returns:
+        (key, restore prefix); the prefix only covers the manifest, so a
+        run needing other tools still restores the shared entries
+    """
+    manifest_hash = hashlib.sha256(
+        json.dumps(manifest, sort_keys=True).encode()
+    ).hexdigest()[:12]
+    selection = hashlib.sha256(
+        "\n".join(sorted(entry_digest(n, manifest[n]) for n in names)).encode()
+    ).hexdigest()[:12]
+    prefix = f"auto-formatter-tools-{sys.platform}-{platform.machine()}-"
+    return f"{prefix}{manifest_hash}-{selection}", f"{prefix}{manifest_hash}-"
+
+
+def _selected(
+    args: argparse.Namespace, manifest: Dict[str, Any]
+) -> Tuple[List[str], Set[str]]:
+    """Tools chosen on the command line or by the job graph.
+
+    Args:
+        args: Parsed CLI arguments
+        manifest: Tool entries by name
+
+    Returns:
+        (tool names, planned languages; empty for --tools)
+
+    Raises:
+        ValueError: For a tool that is not in the manifest
+    """
+    if args.tools:
+        names = [n.strip() for n in args.tools.split(",") if n.strip()]
+        unknown = [n for n in names if n not in manifest]
+        if unknown:
+            raise ValueError(f"Unknown tools: {', '.join(unknown)}")
+        return names, set()
+    executables, languages = plan_tools(
+        args.list_dir,
+        args.languages,
+        args.root,
+        args.enable_linting,
+        args.fail_on_lint_errors,
+        args.whole_tree_tools,
+    )
+    return required_tools(manifest, executables, languages), languages
+
+
+def install_command(
+    args: argparse.Namespace,
+    store: ToolStore,
+    manifest: Dict[str, Dict[str, Any]],
+    names: List[str],
+) -> int:
+    """Install the selected tools concurrently and export their paths.
+
+    Args:
+        args: Parsed CLI arguments
+        store: Tool store
+        manifest: Tool entries by name
+        names: Tools to install
+
+    Returns:
+        Process exit code
+    """
+    report = TimingReport(args.timing_report) if args.timing_report else None
+    with ThreadPoolExecutor(max_workers=INSTALL_WORKERS) as executor:
+        results = list(
+            executor.map(lambda n: store.install(n, manifest[n]), names)
+        )
+
+    failed = []
+    for name, (state, code, output, seconds, rss) in zip(names, results):
+        entry = manifest[name]
+        pins = ", ".join(
+            f"{p} {v}" for p, v in entry.get("packages", {}).items()
+        )
+        icon = "✅" if code == 0 else "❌"
+        print(f"::group::{icon} {name} ({state}, {seconds:.1f}s) {pins}")
+        if output:
+            print(output)
+        print("::endgroup::", flush=True)
+        if report is not None:
+            report.add(
+                "install", name, seconds, code, rss, tool=name, cache=state
+            )
+        if code != 0:
+            failed.append(name)
+
+    if os.getenv("GITHUB_PATH"):
+        with open(os.environ["GITHUB_PATH"], "a", encoding="utf-8") as f:
+            f.write(store.bin_dir + "\n")
+    if os.getenv("GITHUB_ENV"):
+        exports = environment_exports(store, manifest, names)
+        with open(os.environ["GITHUB_ENV"], "a", encoding="utf-8") as f:
+            for variable, value in exports.items():
+                f.write(f"{variable}={value}\n")
+
+    warm = sum(1 for state, *_ in results if state == "warm")
+    print(f"📊 {len(names)} tools: {warm} from cache, {len(failed)} failed")
+    if failed:
+        print(f"❌ Failed to install: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+def _flag(value: str) -> bool:
+    """Parse an action boolean input."""
+    return value.strip().lower() == "true"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point for the tool installer CLI.
+
+    Args:
+        argv: Command line arguments, defaults to sys.argv
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(
+        description="Pinned, cached tool installs for Auto Formatter"
+    )
+    parser.add_argument(
+        "command",
+        choices=["plan", "install", "prune"],
+        help="plan: print languages, runtimes, tools and cache keys; "
+        "install: install the tools; "
+        "prune: drop store entries no longer in the manifest",
+    )
+    parser.add_argument("--store", default=DEFAULT_STORE, help="Tool store")
+    parser.add_argument("--manifest", default=MANIFEST_PATH, help="Manifest")
+    parser.add_argument("--root", default=".", help="Repository directory")
+    parser.add_argument("--list-dir", help="Discovery list directory")
+    parser.add_argument("--languages", default="all")
+    parser.add_argument("--enable-linting", default="true", type=_flag)
+    parser.add_argument("--fail-on-lint-errors", default="false", type=_flag)
+    parser.add_argument(
+        "--whole-tree-tools",
+        default="true",
+        type=_flag,
+        help="Plan whole-tree tools; off in every shard but the first",
+    )
+    parser.add_argument(
+        "--tools", help="Comma-separated tools instead of a plan"
+    )
+    parser.add_argument(
+        "--timing-report",
+        default=os.getenv(TIMING_ENV),
+        help=f"NDJSON timing report (default: ${TIMING_ENV})",
+    )
+
+    args = parser.parse_args(argv)
+    manifest = load_manifest(args.manifest)
+    store = ToolStore(args.store)
+
+    if args.command == "prune":
+        keep = [entry_digest(n, e) for n, e in manifest.items()]
+        for digest in store.prune(keep):
+            print(f"🗑️ Removed stale tool store entry {digest}")
+        return 0
+
+    if not args.tools and not args.list_dir:
+        parser.error("--list-dir or --tools is required")
+    try:
+        names, languages = _selected(args, manifest)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 2
+
+    if args.command == "plan":
+        key, prefix = cache_keys(manifest, names)
+        runtimes = required_runtimes(manifest, names, languages)
+        print(
+            f"🔍 Languages with files: {', '.join(sorted(languages)) or 'none'}"
+        )
+        print(f"🔍 Runtimes needed: {', '.join(runtimes) or 'none'}")
+        print(f"🔍 Tools needed: {', '.join(names) or 'none'}")
+        write_github_output(
+            {
+                "tools": ",".join(names),
+                "key": key,
+                "restore-key": prefix,
+                # Comma-delimited on both ends for exact contains() checks
+                "languages": f",{','.join(sorted(languages))},",
+                "runtimes": f",{','.join(runtimes)},",
+            }
+        )
+        return 0
+    return install_command(args, store, manifest, names)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
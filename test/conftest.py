@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+# file: test/conftest.py
+Shared helpers for the script tests.
+
+pytest puts this directory on the path, so test modules import the helpers
+with ``from conftest import git, write_file``; they are used from
+``setup_method`` where fixtures cannot be requested.
+"""
+
+import os
+import subprocess
+
+
+def write_file(root, rel_path, content=""):
+    """Create a file (and its parent directories) under root."""
+    path = os.path.join(root, *rel_path.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def git(root, *args):
+    """Run git in a repository with a fixed committer identity."""
+    return subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+        cwd=root,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
@@ -7,11 +7,13 @@ This test suite validates the issue manager script and related functionality.
 Run with: python -m pytest test/test_action.py -v
 """
 
+import asyncio
 import json
 import os
 import sys
 import tempfile
-from unittest.mock import MagicMock, patch
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -20,12 +22,20 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
 
 try:
     from issue_manager import (
+        AsyncGitHubAPI,
         CodeQLAlertManager,
         CopilotTicketManager,
         DuplicateIssueManager,
         FormattingManager,
         GitHubAPI,
+        GraphQLBatcher,
+        IssueIndex,
         IssueUpdateProcessor,
+        MinHashLSH,
+        RateLimitError,
+        RateLimitScheduler,
+        ResponseCache,
+        TokenBucket,
     )
 except ImportError as e:
     pytest.skip(f"Could not import issue_manager: {e}", allow_module_level=True)
@@ -54,55 +64,419 @@ class TestGitHubAPI:
         api = GitHubAPI("ghp_test123", "test/repo")
         assert api.headers["Authorization"] == "token ghp_test123"
 
-    @patch('requests.get')
-    def test_test_access_success(self, mock_get):
+    @patch('requests.Session.request')
+    def test_test_access_success(self, mock_request):
         """Test successful API access test."""
-        mock_get.return_value.status_code = 200
+        mock_request.return_value.status_code = 200
         assert self.api.test_access() is True
 
-    @patch('requests.get')
-    def test_test_access_failure(self, mock_get):
+    @patch('requests.Session.request')
+    def test_test_access_failure(self, mock_request):
         """Test failed API access test."""
-        mock_get.return_value.status_code = 404
+        mock_request.return_value.status_code = 404
         assert self.api.test_access() is False
 
-    @patch('requests.post')
-    def test_create_issue_success(self, mock_post):
+    @patch('requests.Session.request')
+    def test_create_issue_success(self, mock_request):
         """Test successful issue creation."""
         mock_response = MagicMock()
         mock_response.json.return_value = {"number": 123, "title": "Test Issue"}
         mock_response.raise_for_status.return_value = None
-        mock_post.return_value = mock_response
+        mock_request.return_value = mock_response
 
         result = self.api.create_issue("Test Issue", "Test Body", ["bug"])
 
         assert result is not None
         assert result["number"] == 123
-        mock_post.assert_called_once()
+        mock_request.assert_called_once()
 
-    @patch('requests.post')
-    def test_create_issue_failure(self, mock_post):
+    @patch('requests.Session.request')
+    def test_create_issue_failure(self, mock_request):
         """Test failed issue creation."""
-        mock_post.side_effect = Exception("API Error")
+        mock_request.side_effect = Exception("API Error")
 
         result = self.api.create_issue("Test Issue", "Test Body")
         assert result is None
 
-    @patch('requests.get')
-    def test_search_issues(self, mock_get):
+    @patch('requests.Session.request')
+    def test_search_issues(self, mock_request):
         """Test issue search functionality."""
         mock_response = MagicMock()
         mock_response.json.return_value = {
             "items": [{"number": 1, "title": "Test Issue"}]
         }
+        mock_response.links = {}
         mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
+        mock_request.return_value = mock_response
 
         results = self.api.search_issues("test query")
 
         assert len(results) == 1
         assert results[0]["number"] == 1
 
+    def test_session_is_pooled(self):
+        """Test the session mounts a pooled adapter with retries."""
+        api = GitHubAPI("test_token", "test/repo", pool_size=4, max_retries=2)
+        adapter = api.session.get_adapter("https://api.github.com")
+
+        assert adapter._pool_maxsize == 4
+        assert adapter.max_retries.total == 2
+        assert "POST" not in adapter.max_retries.allowed_methods
+        assert api.session.headers["Authorization"] == "token test_token"
+        assert "gzip" in api.session.headers["Accept-Encoding"]
+
+    @patch('requests.Session.request')
+    def test_requests_share_session(self, mock_request):
+        """Test every call goes through the shared session and is counted."""
+        mock_request.return_value.status_code = 200
+        mock_request.return_value.json.return_value = []
+        mock_request.return_value.links = {}
+
+        self.api.test_access()
+        self.api.get_all_issues()
+        self.api.close_issue(1)
+
+        assert mock_request.call_count == 3
+        assert self.api.connection_stats()["requests_sent"] == 3
+
+    @patch('requests.Session.request')
+    def test_close_issue_sends_reason(self, mock_request):
+        """Test the close reason reaches the REST API."""
+        mock_request.return_value.status_code = 200
+
+        assert self.api.close_issue(7, "duplicate")
+
+        assert mock_request.call_args.kwargs["json"] == {
+            "state": "closed",
+            "state_reason": "duplicate",
+        }
+
+    @patch('requests.Session.request')
+    def test_iter_issues_follows_next_links(self, mock_request):
+        """Test issue listing follows Link headers across pages."""
+        next_url = "https://api.github.com/repositories/1/issues?page=2"
+        first_page = MagicMock()
+        first_page.json.return_value = [
+            {"number": 1, "title": "First"},
+            {"number": 2, "title": "A PR", "pull_request": {}},
+        ]
+        first_page.links = {"next": {"url": next_url}}
+        second_page = MagicMock()
+        second_page.json.return_value = [{"number": 3, "title": "Second"}]
+        second_page.links = {}
+        mock_request.side_effect = [first_page, second_page]
+
+        issues = self.api.iter_issues("open")
+        assert next(issues)["number"] == 1
+        assert mock_request.call_count == 1  # Second page not fetched yet
+        assert [issue["number"] for issue in issues] == [3]
+
+        first_call, second_call = mock_request.call_args_list
+        assert first_call.kwargs["params"] == {"per_page": 100, "state": "open"}
+        assert second_call.args[1] == next_url
+        assert second_call.kwargs["params"] is None
+
+    @patch('requests.Session.request')
+    def test_search_issues_collects_all_pages(self, mock_request):
+        """Test search results are materialized across every page."""
+        first_page = MagicMock()
+        first_page.json.return_value = {"items": [{"number": 1}]}
+        first_page.links = {"next": {"url": "https://api.github.com/next"}}
+        second_page = MagicMock()
+        second_page.json.return_value = {"items": [{"number": 2}]}
+        second_page.links = {}
+        mock_request.side_effect = [first_page, second_page]
+
+        results = self.api.search_issues("is:open")
+
+        assert [issue["number"] for issue in results] == [1, 2]
+        params = mock_request.call_args_list[0].kwargs["params"]
+        assert params["q"] == "is:open repo:test/repo"
+
+
+class TestRateLimitScheduler:
+    """Tests for the token buckets and rate limit feedback."""
+
+    def test_token_bucket_queues_reservations(self):
+        """Test an empty bucket hands out increasing waits."""
+        bucket = TokenBucket(60, capacity=2)
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == pytest.approx(1.0, abs=0.05)
+        assert bucket.reserve() == pytest.approx(2.0, abs=0.05)
+
+    def test_search_and_core_buckets_are_separate(self):
+        """Test exhausting search does not slow down core requests."""
+        scheduler = RateLimitScheduler(search_per_minute=1)
+        assert scheduler.acquire("GET", "/search/issues") == 0
+        assert scheduler.acquire("GET", "/search/issues") > 0
+        assert scheduler.acquire("GET", "/repos/o/r/issues") == 0
+
+    def test_retry_after_blocks_resource(self):
+        """Test a secondary limit response blocks later requests."""
+        scheduler = RateLimitScheduler()
+        wait = scheduler.record_response(
+            "/repos/o/r/issues", 403, {"Retry-After": "30"}
+        )
+        assert wait == 30
+        assert scheduler.acquire("GET", "/repos/o/r/issues") > 25
+        assert scheduler.acquire("GET", "/search/issues") == 0
+
+    def test_exhausted_primary_limit_waits_for_reset(self):
+        """Test remaining=0 waits until the reset timestamp."""
+        scheduler = RateLimitScheduler()
+        headers = {
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset": str(int(time.time()) + 60),
+            "X-RateLimit-Resource": "search",
+        }
+        wait = scheduler.record_response("/search/issues", 403, headers)
+        assert 55 < wait <= 62
+
+    def test_plain_forbidden_is_not_rate_limit(self):
+        """Test a permission error is left to the caller."""
+        scheduler = RateLimitScheduler()
+        assert scheduler.record_response("/repos/o/r", 403, {}, "Forbidden") is None
+
+    @patch('time.sleep')
+    @patch('requests.Session.request')
+    def test_rate_limited_search_raises(self, mock_request, mock_sleep):
+        """Test a persistent rate limit is not reported as "no issues"."""
+        mock_request.return_value.status_code = 403
+        mock_request.return_value.headers = {"Retry-After": "1"}
+        mock_request.return_value.text = "secondary rate limit"
+        api = GitHubAPI("test_token", "test/repo")
+
+        with pytest.raises(RateLimitError):
+            api.search_issues("Some title")
+
+        assert mock_request.call_count == api.scheduler.max_retries + 1
+        mock_sleep.assert_any_call(1.0)
+
+    @patch('time.sleep')
+    @patch('requests.Session.request')
+    def test_rate_limited_request_is_retried(self, mock_request, mock_sleep):
+        """Test a request succeeds once the Retry-After wait has passed."""
+        limited = MagicMock(status_code=429, headers={"Retry-After": "2"})
+        limited.text = ""
+        ok = MagicMock(status_code=200, headers={})
+        mock_request.side_effect = [limited, ok]
+        api = GitHubAPI("test_token", "test/repo")
+
+        assert api.test_access() is True
+        mock_sleep.assert_any_call(2.0)
+
+
+class TestResponseCache:
+    """Tests for the conditional-request response cache."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, "responses.json")
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        self.temp_dir.cleanup()
+
+    @patch('requests.Session.request')
+    def test_not_modified_served_from_cache(self, mock_request):
+        """Test a 304 revalidation returns the cached body."""
+        fresh = MagicMock(status_code=200, text='{"full_name": "test/repo"}')
+        fresh.headers = {"ETag": '"abc"', "Content-Type": "application/json"}
+        not_modified = MagicMock(status_code=304, text="", headers={})
+        mock_request.side_effect = [fresh, not_modified, not_modified]
+        api = GitHubAPI("test_token", "test/repo", cache=ResponseCache(self.cache_path))
+
+        assert api.test_access() is True
+        assert api.test_access() is True
+
+        second_headers = mock_request.call_args_list[1].kwargs["headers"]
+        assert second_headers["If-None-Match"] == '"abc"'
+        assert api.cache.stats()["hits"] == 1
+        assert api.cache.stats()["misses"] == 1
+
+        response = api._request("GET", "/repos/test/repo")
+        assert response.status_code == 200
+        assert response.json() == {"full_name": "test/repo"}
+        assert api.cache.stats()["hits"] == 2
+
+    def test_cache_persists_and_is_scoped_by_token(self):
+        """Test entries survive a reload and are keyed by auth scope."""
+        cache = ResponseCache(self.cache_path)
+        key = cache.key("https://api.github.com/x", {"page": 1}, "token-a")
+        cache.store(key, {"ETag": '"v1"'}, "[]")
+        cache.save()
+
+        reloaded = ResponseCache(self.cache_path)
+        assert reloaded.get(key)["headers"]["ETag"] == '"v1"'
+        other = reloaded.key("https://api.github.com/x", {"page": 1}, "token-b")
+        assert other != key
+        assert reloaded.get(other) is None
+
+    def test_lru_eviction_bounds_size(self):
+        """Test the least recently used entries are evicted first."""
+        cache = ResponseCache(self.cache_path, max_bytes=10)
+        cache.store("a", {"ETag": "1"}, "aaaa")
+        cache.store("b", {"ETag": "2"}, "bbbb")
+        cache.mark_hit("a")
+        cache.store("c", {"ETag": "3"}, "cccc")
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_responses_without_validators_not_stored(self):
+        """Test responses GitHub cannot revalidate are not cached."""
+        cache = ResponseCache(self.cache_path)
+        cache.store("k", {"Content-Type": "application/json"}, "{}")
+        assert cache.get("k") is None
+
+
+class TestAsyncGitHubAPI:
+    """Tests for the AsyncGitHubAPI class."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.api = AsyncGitHubAPI("github_pat_test", "test/repo")
+
+    def test_init_shares_headers(self):
+        """Test the async client builds the same auth headers."""
+        assert self.api.headers["Authorization"] == "Bearer github_pat_test"
+        assert self.api.repo == "test/repo"
+
+    def test_get_all_issues_follows_pages(self):
+        """Test async listing follows next links and skips pull requests."""
+        self.api._request_json = AsyncMock(
+            side_effect=[
+                (200, [{"number": 1}, {"number": 2, "pull_request": {}}], "next"),
+                (200, [{"number": 3}], None),
+            ]
+        )
+
+        issues = asyncio.run(self.api.get_all_issues())
+
+        assert [issue["number"] for issue in issues] == [1, 3]
+        assert self.api._request_json.call_args_list[1].args[1] == "next"
+
+    def test_close_issue_sends_reason(self):
+        """Test the close reason reaches the REST API."""
+        self.api._request_json = AsyncMock(return_value=(200, {}, None))
+
+        assert asyncio.run(self.api.close_issue(1, "not_planned"))
+
+        assert self.api._request_json.call_args.kwargs["json"] == {
+            "state": "closed",
+            "state_reason": "not_planned",
+        }
+
+    def test_close_issue_failure(self):
+        """Test failed requests map to False like the sync client."""
+        self.api._request_json = AsyncMock(side_effect=Exception("boom"))
+        assert asyncio.run(self.api.close_issue(1)) is False
+
+    def test_requests_bounded_by_semaphore(self):
+        """Test concurrent calls never exceed max_concurrency in flight."""
+        api = AsyncGitHubAPI("test_token", "test/repo", max_concurrency=3)
+        in_flight = 0
+        peak = 0
+
+        class FakeResponse:
+            status = 200
+
+            def __init__(self):
+                self.headers = {}
+                self.links = {}
+
+            async def __aenter__(self):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                return self
+
+            async def __aexit__(self, *exc_info):
+                nonlocal in_flight
+                in_flight -= 1
+
+            def raise_for_status(self):
+                return None
+
+            async def text(self):
+                return "{}"
+
+        session = MagicMock()
+        session.request.side_effect = lambda *args, **kwargs: FakeResponse()
+        api._session = session
+
+        async def run():
+            return await asyncio.gather(*(api.close_issue(n) for n in range(10)))
+
+        assert all(asyncio.run(run()))
+        assert peak == 3
+        assert api.requests_sent == 10
+
+
+class TestIssueIndex:
+    """Tests for the in-memory issue index."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.mock_api = MagicMock()
+        self.mock_api.iter_issues.return_value = iter([
+            {
+                "number": 1,
+                "title": "Copilot Review: src/app.py",
+                "state": "open",
+                "labels": [{"name": "copilot-review"}],
+                "body": "text\n<!-- copilot-data: 987 -->",
+            },
+            {
+                "number": 2,
+                "title": "Fix the Build!",
+                "state": "closed",
+                "labels": [{"name": "bug"}],
+                "body": None,
+            },
+        ])
+        self.index = IssueIndex(self.mock_api)
+
+    def test_loads_once_and_looks_up(self):
+        """Test the listing is fetched once and every key resolves."""
+        assert self.index.find_by_title("Fix the Build!")[0]["number"] == 2
+        assert self.index.find_by_title("fix  the build", normalized=True)
+        assert self.index.find_by_title("fix the build") == []
+        assert self.index.find_by_copilot_id(987)[0]["number"] == 1
+        assert self.index.find_by_label("copilot-review", "open")
+        assert self.index.find_by_label("bug", "open") == []
+
+        self.mock_api.iter_issues.assert_called_once_with("all")
+        self.mock_api.search_issues.assert_not_called()
+
+    def test_updates_in_place(self):
+        """Test created and closed issues are reflected immediately."""
+        self.index.add({"number": 3, "title": "New", "state": "open"})
+        self.index.mark_closed(1)
+
+        assert self.index.find_by_title("New")[0]["number"] == 3
+        assert self.index.find_by_label("copilot-review", "open") == []
+        assert len(self.index) == 3
+
+        self.index.remove(3)
+        assert self.index.find_by_title("New") == []
+
+    def test_processor_uses_index(self):
+        """Test creates consult the index instead of the search API."""
+        self.mock_api.create_issue.return_value = {"number": 4, "title": "New"}
+        processor = IssueUpdateProcessor(self.mock_api, index=self.index)
+
+        assert processor._create_issue({"title": "FIX THE BUILD"}) is False
+        assert processor._create_issue({"title": "New"}) is True
+        assert processor._create_issue({"title": "New"}) is False
+
+        self.mock_api.search_issues.assert_not_called()
+        self.mock_api.create_issue.assert_called_once()
+
 
 class TestIssueUpdateProcessor:
     """Tests for the IssueUpdateProcessor class."""
@@ -170,6 +544,53 @@ class TestIssueUpdateProcessor:
         assert result is False
         self.mock_api.create_issue.assert_not_called()
 
+    def test_process_directory_concurrently_keeps_group_order(self):
+        """Test concurrent mode keeps create-then-comment ordering."""
+        updates = [
+            {"action": "create", "title": "First", "body": "Body"},
+            {"action": "close", "number": 7},
+            {"action": "comment", "title": "First", "body": "Follow-up"},
+        ]
+        self.mock_api.search_issues.return_value = []
+        self.mock_api.create_issue.return_value = {"number": 42}
+        self.mock_api.add_comment.return_value = True
+        self.mock_api.close_issue.return_value = True
+
+        processor = IssueUpdateProcessor(self.mock_api, max_workers=4)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for index, update in enumerate(updates):
+                path = os.path.join(temp_dir, f"{index:02d}.json")
+                with open(path, 'w') as f:
+                    json.dump(update, f)
+
+            assert processor.process_updates(temp_dir) is True
+
+        self.mock_api.add_comment.assert_called_once_with(42, "Follow-up")
+        self.mock_api.close_issue.assert_called_once_with(7, "completed")
+        assert [r["index"] for r in processor.results] == [0, 1, 2]
+        assert [r["status"] for r in processor.results] == [
+            "created", "closed", "commented"
+        ]
+
+        table = processor.format_results_table()
+        assert "| 1 | create | First | created | #42 |" in table
+
+    def test_rate_limited_search_does_not_create(self):
+        """Test a rate-limited lookup never falls through to creation."""
+        self.mock_api.search_issues.side_effect = RateLimitError("limited")
+
+        results = self.processor._process_group(
+            [(0, {"action": "create", "title": "Maybe exists"})]
+        )
+
+        assert results[0]["status"] == "rate_limited"
+        self.mock_api.create_issue.assert_not_called()
+
+    def test_max_workers_is_bounded(self):
+        """Test the worker count is clamped to a safe range."""
+        assert IssueUpdateProcessor(self.mock_api, max_workers=0).max_workers == 1
+        assert IssueUpdateProcessor(self.mock_api, max_workers=500).max_workers == 8
+
 
 class TestFormattingManager:
     """Tests for the FormattingManager class."""
@@ -181,23 +602,23 @@ class TestFormattingManager:
 
     def test_check_python_formatting_no_files(self):
         """Test Python formatting check with no files."""
-        with patch('glob.glob') as mock_glob:
-            mock_glob.return_value = []
+        with patch('issue_manager.discover_files') as mock_discover:
+            mock_discover.return_value = {"python": []}
             result = self.manager._check_python_formatting()
             assert result["status"] == "no_files"
             assert result["files"] == []
 
     def test_check_go_formatting_no_files(self):
         """Test Go formatting check with no files."""
-        with patch('glob.glob') as mock_glob:
-            mock_glob.return_value = []
+        with patch('issue_manager.discover_files') as mock_discover:
+            mock_discover.return_value = {"go": []}
             result = self.manager._check_go_formatting()
             assert result["status"] == "no_files"
 
-    @patch('glob.glob')
-    def test_check_python_formatting_with_files(self, mock_glob):
+    @patch('issue_manager.discover_files')
+    def test_check_python_formatting_with_files(self, mock_discover):
         """Test Python formatting check with files present."""
-        mock_glob.return_value = ["test1.py", "test2.py"]
+        mock_discover.return_value = {"python": ["test1.py", "test2.py"]}
 
         with patch('subprocess.run') as mock_run:
             # Mock ruff returning no issues
@@ -208,6 +629,23 @@ class TestFormattingManager:
             assert result["status"] == "checked"
             assert len(result["files"]) == 2
 
+    @patch('issue_manager.discover_files')
+    def test_checks_share_one_walk(self, mock_discover):
+        """Test every language check reads from a single tree walk."""
+        mock_discover.return_value = {
+            "python": ["a.py"],
+            "go": ["b.go"],
+            "nodejs": ["c.ts", "d.jsx"],
+        }
+
+        results = self.manager.check_formatting_issues()
+
+        mock_discover.assert_called_once_with(
+            ".", ["python", "go", "nodejs"], mode="walk", base=None
+        )
+        assert results["javascript_files"]["total_files"] == 2
+        assert results["go_files"]["files"] == ["b.go"]
+
     def test_build_formatting_summary(self):
         """Test building formatting summary."""
         results = {
@@ -332,6 +770,10 @@ class TestDuplicateIssueManager:
         closed_count = self.manager._close_duplicate_group(issues)
         assert closed_count == 2  # Two duplicates closed
         assert self.mock_api.close_issue.call_count == 2
+        self.mock_api.add_comment.assert_any_call(
+            3, "Closing as duplicate of #1"
+        )
+        self.mock_api.close_issue.assert_any_call(2, "duplicate")
 
     def test_close_duplicates_dry_run(self):
         """Test dry run mode."""
@@ -344,6 +786,259 @@ class TestDuplicateIssueManager:
         assert closed_count == 0  # Nothing actually closed
         self.mock_api.close_issue.assert_not_called()
 
+    def test_near_duplicates_grouped_with_scores(self):
+        """Test similar titles and bodies are grouped, unrelated ones not."""
+        body = "Running the formatter on main fails with a traceback in ruff"
+        issues = [
+            {"number": 7, "title": "Formatter crashes on main", "body": body},
+            {"number": 3, "title": "Formatter crashes on main!", "body": body},
+            {"number": 5, "title": "Add Swift support", "body": "Please"},
+            {"number": 9, "title": "Add swift support", "body": "Other"},
+        ]
+        manager = DuplicateIssueManager(
+            self.mock_api, similarity_threshold=0.7
+        )
+
+        groups = manager.find_near_duplicates(issues)
+
+        assert [g["original"]["number"] for g in groups] == [3, 5]
+        assert groups[0]["duplicates"][0]["issue"]["number"] == 7
+        assert groups[0]["duplicates"][0]["score"] >= 0.7
+        # Identical normalized titles are grouped whatever the score
+        assert groups[1]["duplicates"][0]["issue"]["number"] == 9
+        report = manager.format_near_duplicate_report(groups)
+        assert "#3 Formatter crashes on main!" in report
+
+    def test_near_duplicate_dry_run(self):
+        """Test the threshold mode counts near-duplicates without closing."""
+        self.mock_api.iter_issues.return_value = iter([
+            {"number": 1, "title": "Lint step times out on large repo"},
+            {"number": 2, "title": "Lint step time out on large repos"},
+            {"number": 3, "title": "Unrelated feature request"},
+        ])
+        manager = DuplicateIssueManager(
+            self.mock_api, similarity_threshold=0.5
+        )
+
+        assert manager.close_duplicates(dry_run=True) == 1
+        self.mock_api.close_issue.assert_not_called()
+
+    def test_near_duplicates_do_not_chain(self):
+        """Test an issue only matching a duplicate is not grouped."""
+        def words(start, end):
+            return " ".join(f"w{i}" for i in range(start, end))
+
+        # 1~2 and 2~3 score about 0.6, 1 and 3 only about 0.3
+        issues = [
+            {"number": 1, "title": "Alpha", "body": words(0, 80)},
+            {"number": 2, "title": "Beta", "body": words(20, 100)},
+            {"number": 3, "title": "Gamma", "body": words(40, 120)},
+        ]
+        manager = DuplicateIssueManager(
+            self.mock_api, similarity_threshold=0.5
+        )
+
+        groups = manager.find_near_duplicates(issues)
+
+        assert len(groups) == 1
+        assert groups[0]["original"]["number"] == 1
+        assert [d["issue"]["number"] for d in groups[0]["duplicates"]] == [2]
+        assert groups[0]["duplicates"][0]["score"] >= 0.5
+
+
+class TestMinHashLSH:
+    """Tests for the MinHash/LSH index."""
+
+    def test_estimates_jaccard_similarity(self):
+        """Test signature agreement tracks the true Jaccard similarity."""
+        lsh = MinHashLSH(threshold=0.5)
+        first = {f"s{i}" for i in range(100)}
+        second = {f"s{i}" for i in range(50, 150)}  # Jaccard 1/3
+        lsh.add("a", first)
+        lsh.add("b", second)
+        lsh.add("c", first)
+
+        assert abs(lsh.similarity("a", "b") - 1 / 3) < 0.15
+        assert lsh.similarity("a", "c") == 1.0
+        assert [p[:2] for p in lsh.near_duplicate_pairs()] == [("a", "c")]
+
+    def test_band_layout_matches_threshold(self):
+        """Test the band/row split puts the LSH threshold near the target."""
+        lsh = MinHashLSH(threshold=0.8)
+
+        assert abs((1 / lsh.bands) ** (1 / lsh.rows) - 0.8) < 0.05
+        with pytest.raises(ValueError):
+            MinHashLSH(threshold=0)
+
+
+class TestGraphQLBatcher:
+    """Tests for batched GraphQL issue mutations."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.mock_api = MagicMock()
+        self.mock_api.repo = "owner/repo"
+        self.batcher = GraphQLBatcher(self.mock_api, batch_size=2)
+        self.issues = [
+            {"number": n, "node_id": f"I_{n}", "title": "Dup"}
+            for n in (2, 3, 4)
+        ]
+
+    def test_batches_aliased_mutations(self):
+        """Test mutations are split by batch size and sent with aliases."""
+        self.mock_api.graphql.side_effect = [
+            {"data": {"m0": {"issue": {"number": 2}},
+                      "m1": {"issue": {"number": 3}}}},
+            {"data": {"m0": {"issue": {"number": 4}}}},
+        ]
+
+        results = self.batcher.close_issues(self.issues, "duplicate")
+
+        assert [r["success"] for r in results] == [True, True, True]
+        assert {r["via"] for r in results} == {"graphql"}
+        assert self.mock_api.graphql.call_count == 2
+        query, variables = self.mock_api.graphql.call_args_list[0][0]
+        assert "m1: closeIssue(input: $i1)" in query
+        assert variables["i0"] == {"issueId": "I_2", "stateReason": "DUPLICATE"}
+        assert self.mock_api.graphql.call_args_list[0][1]["weight"] == 2
+        self.mock_api.close_issue.assert_not_called()
+
+    def test_maps_errors_per_mutation(self):
+        """Test a failing alias only fails its own mutation."""
+        self.mock_api.graphql.return_value = {
+            "data": {"m0": {"clientMutationId": None}, "m1": None},
+            "errors": [{"path": ["m1"], "message": "Issue is locked"}],
+        }
+
+        results = self.batcher.add_comments(
+            [(self.issues[0], "hi"), (self.issues[1], "hi")]
+        )
+
+        assert results[0]["success"] is True
+        assert results[1]["success"] is False
+        assert results[1]["error"] == "Issue is locked"
+        self.mock_api.add_comment.assert_not_called()
+
+    def test_falls_back_to_rest(self):
+        """Test failed batches and items without node ids use REST."""
+        self.mock_api.graphql.side_effect = Exception("502 Bad Gateway")
+        self.mock_api.close_issue.return_value = True
+
+        results = self.batcher.close_issues(
+            [self.issues[0], {"number": 9, "title": "No node id"}]
+        )
+
+        assert [r["via"] for r in results] == ["rest", "rest"]
+        assert results[0]["error"] == "502 Bad Gateway"
+        assert self.mock_api.close_issue.call_count == 2
+        assert self.mock_api.graphql.call_count == 1
+
+    def test_rate_limit_propagates(self):
+        """Test GraphQL rate limiting is not masked by the REST fallback."""
+        self.mock_api.graphql.side_effect = RateLimitError("limited")
+
+        with pytest.raises(RateLimitError):
+            self.batcher.close_issues(self.issues[:1])
+        self.mock_api.close_issue.assert_not_called()
+
+    def test_create_resolves_labels(self):
+        """Test creates use repository and label node ids, else REST."""
+        self.mock_api.graphql.side_effect = [
+            {"data": {"repository": {
+                "id": "R_1",
+                "labels": {"nodes": [{"id": "L_1", "name": "bug"}]},
+            }}},
+            {"data": {"m0": {"issue": {"number": 10, "title": "A"}}}},
+        ]
+        self.mock_api.create_issue.return_value = {"number": 11}
+
+        results = self.batcher.create_issues([
+            {"title": "A", "labels": ["bug"]},
+            {"title": "B", "labels": ["missing"]},
+        ])
+
+        _, variables = self.mock_api.graphql.call_args_list[1][0]
+        assert variables["i0"]["repositoryId"] == "R_1"
+        assert variables["i0"]["labelIds"] == ["L_1"]
+        assert results[0]["data"]["issue"]["number"] == 10
+        assert results[1]["via"] == "rest"
+        self.mock_api.create_issue.assert_called_once_with("B", "", ["missing"])
+
+    def test_duplicate_manager_batches(self):
+        """Test duplicates are commented on and closed in one batch."""
+        self.mock_api.iter_issues.return_value = iter(
+            [{"number": 1, "node_id": "I_1", "title": "Dup"}] + self.issues[:2]
+        )
+        self.mock_api.graphql.return_value = {
+            "data": {f"m{i}": {"ok": True} for i in range(4)}
+        }
+        batcher = GraphQLBatcher(self.mock_api, batch_size=50)
+        manager = DuplicateIssueManager(self.mock_api, batcher)
+
+        assert manager.close_duplicates() == 2
+        query, variables = self.mock_api.graphql.call_args[0]
+        assert query.count("addComment") == 2
+        assert variables["i0"]["body"] == "Closing as duplicate of #1"
+        self.mock_api.close_issue.assert_not_called()
+
+
+class FakeAsyncAPI:
+    """Minimal async client double for the manager fan-out tests."""
+
+    def __init__(self, issues):
+        self.issues = issues
+        self.close_issue = AsyncMock(return_value=True)
+        self.add_comment = AsyncMock(return_value=True)
+        self.search_issues = AsyncMock(return_value=[])
+
+    async def iter_issues(self, state="open"):
+        for issue in self.issues:
+            yield issue
+
+
+class TestAsyncManagers:
+    """Tests for the asyncio fan-out paths of the managers."""
+
+    def test_close_duplicates_async(self):
+        """Test duplicates are closed concurrently, keeping the oldest."""
+        api = FakeAsyncAPI([
+            {"number": 5, "title": "Dup"},
+            {"number": 2, "title": "Dup"},
+            {"number": 9, "title": "Dup"},
+            {"number": 4, "title": "Unique"},
+        ])
+        manager = DuplicateIssueManager(api)
+
+        assert asyncio.run(manager.close_duplicates_async(dry_run=True)) == 2
+        api.close_issue.assert_not_called()
+
+        assert asyncio.run(manager.close_duplicates_async()) == 2
+        closed = sorted(call.args[0] for call in api.close_issue.call_args_list)
+        assert closed == [5, 9]
+        api.close_issue.assert_any_call(5, "duplicate")
+        api.add_comment.assert_any_call(9, "Closing as duplicate of #2")
+
+    def test_filter_new_alerts_async(self):
+        """Test alert lookups fan out and keep input order."""
+        api = FakeAsyncAPI([])
+        api.search_issues.side_effect = [[], [{"number": 1}], []]
+        manager = CodeQLAlertManager(api)
+
+        alerts = [{"number": 1}, {"number": 2}, {"number": 3}]
+        new_alerts = asyncio.run(manager.filter_new_alerts_async(alerts))
+
+        assert [alert["number"] for alert in new_alerts] == [1, 3]
+        api.search_issues.assert_any_call("CodeQL Security Alert #2")
+
+    def test_handle_pr_closed_async(self):
+        """Test copilot issues for a merged PR are closed concurrently."""
+        api = FakeAsyncAPI([])
+        api.search_issues.return_value = [{"number": 7}, {"number": 8}]
+        manager = CopilotTicketManager(api)
+
+        event = {"pull_request": {"merged": True}}
+        assert asyncio.run(manager.handle_pr_closed_async(event)) == 2
+
 
 class TestCodeQLAlertManager:
     """Tests for the CodeQLAlertManager class."""
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+# file: test/test_change_set.py
+Tests for collecting and staging formatter rewrites.
+
+Run with: python -m pytest test/test_change_set.py -v
+"""
+
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+from conftest import git, write_file
+import pytest
+
+# Add the scripts directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+try:
+    from change_set import (
+        blob_id,
+        collect_changes,
+        main,
+        rewritten_files,
+        stage_changes,
+        stat_snapshot,
+        write_patch,
+    )
+except ImportError as e:
+    pytest.skip(f"Could not import change_set: {e}", allow_module_level=True)
+
+
+class TestChangeSet:
+    """Tests for finding, staging and exporting rewrites."""
+
+    def setup_method(self):
+        """Set up a repository with a committed subdirectory."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = self.tmpdir.name
+        git(self.root, "init", "-q")
+        for rel_path in ["app/a.py", "app/b.py", "app/c.py", "top.md"]:
+            write_file(self.root, rel_path, "x=1\n")
+        git(self.root, "add", "-A")
+        git(self.root, "commit", "-q", "-m", "base")
+        self.app = os.path.join(self.root, "app")
+
+    def teardown_method(self):
+        """Clean up the temporary repository."""
+        self.tmpdir.cleanup()
+
+    def test_blob_id_matches_git(self):
+        """Test in-process blob ids agree with git hash-object."""
+        path = os.path.join(self.root, "top.md")
+        expected = git(self.root, "hash-object", path).strip()
+
+        with open(path, "rb") as f:
+            assert blob_id(f.read()) == expected
+
+    def test_rewritten_files(self):
+        """Test only files whose size or mtime moved are reported."""
+        before = stat_snapshot(["a.py", "b.py", "gone.py"], self.app)
+        write_file(self.app, "a.py", "x = 1\n")
+        os.remove(os.path.join(self.app, "b.py"))
+
+        assert sorted(before) == ["a.py", "b.py"]
+        assert rewritten_files(before, self.app) == ["a.py", "b.py"]
+
+    def test_stage_and_patch(self):
+        """Test real rewrites are staged from a subdirectory and exported."""
+        write_file(self.app, "a.py", "x = 1\n")
+        write_file(self.app, "new.py", "untracked\n")
+        # b.py is rewritten with identical contents, c.py is left alone
+        write_file(self.app, "b.py", "x=1\n")
+        write_file(self.root, "top.md", "outside the candidates\n")
+
+        changes = collect_changes(self.app, ["a.py", "b.py", "new.py"])
+        staged, tree = stage_changes(self.app, changes)
+
+        assert [c.path for c in staged] == ["a.py"]
+        assert git(self.root, "diff", "--cached", "--name-only") == "app/a.py\n"
+        assert git(self.root, "write-tree").strip() == tree
+        output = os.path.join(self.root, "out", "format.patch")
+        assert write_patch(self.app, output) > 0
+        with open(output) as f:
+            assert "+x = 1" in f.read()
+
+    def test_collect_cli(self):
+        """Test the collect command stages changes and sets outputs."""
+        write_file(self.app, "a.py", "x = 1\n")
+        listing = os.path.join(self.root, "rewritten.list")
+        with open(listing, "w") as f:
+            f.write("a.py\0c.py\0")
+        output = os.path.join(self.root, "github_output")
+
+        with patch.dict(os.environ, {"GITHUB_OUTPUT": output}):
+            assert main(["--root", self.app, "collect", "--list", listing]) == 0
+
+        with open(output) as f:
+            outputs = dict(line.split("=", 1) for line in f.read().splitlines())
+        assert (outputs["changes"], outputs["files"]) == ("true", "1")
+        assert outputs["tree"] == git(self.root, "write-tree").strip()
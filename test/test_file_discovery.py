@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+# file: test/test_file_discovery.py
+Tests for the single-pass file discovery walker.
+
+Run with: python -m pytest test/test_file_discovery.py -v
+"""
+
+import itertools
+import os
+import sys
+import tempfile
+
+from conftest import git, write_file
+import pytest
+
+# Add the scripts directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+try:
+    from file_discovery import (
+        GitError,
+        IgnoreRules,
+        classify,
+        discover_files,
+        main,
+        select_files,
+        shard_files,
+        walk_files,
+        whole_tree_files,
+    )
+except ImportError as e:
+    pytest.skip(
+        f"Could not import file_discovery: {e}", allow_module_level=True
+    )
+
+
+class TestIgnoreRules:
+    """Tests for gitignore-style pattern matching."""
+
+    def test_patterns(self):
+        """Test anchoring, directory-only rules, wildcards and negation."""
+        rules = IgnoreRules()
+        rules.add_lines(
+            [
+                "# comment",
+                "",
+                "*.log",
+                "!keep.log",
+                "/build",
+                "cache/",
+                "docs/**/*.tmp",
+                "*.py[cod]",
+            ]
+        )
+
+        assert rules.is_ignored("a/b/debug.log")
+        assert not rules.is_ignored("a/keep.log")
+        assert rules.is_ignored("build", is_dir=True)
+        assert not rules.is_ignored("src/build", is_dir=True)
+        assert rules.is_ignored("src/cache", is_dir=True)
+        assert not rules.is_ignored("src/cache")
+        assert rules.is_ignored("docs/x/y/z.tmp")
+        assert not rules.is_ignored("src/docs/z.tmp")
+        assert rules.is_ignored("pkg/mod.pyc")
+        assert not rules.is_ignored("pkg/mod.py")
+
+    def test_rules_are_scoped_to_their_directory(self):
+        """Test a nested ignore file only applies below its directory."""
+        rules = IgnoreRules()
+        rules.add_lines(["/generated"], base="web")
+
+        assert rules.is_ignored("web/generated", is_dir=True)
+        assert not rules.is_ignored("generated", is_dir=True)
+
+
+class TestWalkFiles:
+    """Tests for the single-pass walker."""
+
+    def setup_method(self):
+        """Set up a small repository tree."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = self.tmpdir.name
+        for rel_path in [
+            "main.py",
+            "cmd/tool/main.go",
+            "web/app.component.ts",
+            "web/view.vue",
+            "web/dist/bundle.js",
+            "web/generated/api.ts",
+            "node_modules/pkg/index.js",
+            ".git/hooks/pre-commit.sh",
+            "docs/README.md",
+            "scripts/run.sh",
+            "data.json",
+        ]:
+            write_file(self.root, rel_path)
+        write_file(self.root, ".gitignore", "dist/\n")
+        write_file(self.root, ".prettierignore", "*.json\n")
+        write_file(self.root, "web/.gitignore", "/generated\n")
+
+    def teardown_method(self):
+        """Clean up the temporary tree."""
+        self.tmpdir.cleanup()
+
+    def test_prunes_ignored_and_vendored_directories(self):
+        """Test ignored, pruned and nested-ignored paths are never yielded."""
+        files = list(walk_files(self.root))
+
+        assert "main.py" in files
+        assert "cmd/tool/main.go" in files
+        assert "web/view.vue" in files
+        assert "web/dist/bundle.js" not in files
+        assert "web/generated/api.ts" not in files
+        assert "data.json" not in files
+        assert not any(f.startswith(("node_modules/", ".git/")) for f in files)
+
+    def test_buckets_by_language(self):
+        """Test files are classified into every matching bucket."""
+        buckets = discover_files(self.root, ["python", "nodejs", "angular"])
+
+        assert buckets == {
+            "python": ["main.py"],
+            "nodejs": ["web/app.component.ts", "web/view.vue"],
+            "angular": ["web/app.component.ts"],
+        }
+        assert classify("script.bash") == ["shell"]
+        assert classify("analysis.R") == ["r"]
+
+    def test_cli_writes_lists_and_outputs(self, capsys, monkeypatch):
+        """Test the scan subcommand writes NUL lists and step outputs."""
+        output_dir = os.path.join(self.root, "out")
+        github_output = os.path.join(self.root, "github_output")
+        monkeypatch.setenv("GITHUB_OUTPUT", github_output)
+
+        assert (
+            main(
+                [
+                    "scan",
+                    "--root",
+                    self.root,
+                    "--languages",
+                    "shell,go",
+                    "--output-dir",
+                    output_dir,
+                ]
+            )
+            == 0
+        )
+
+        with open(os.path.join(output_dir, "shell.list")) as f:
+            assert f.read() == "scripts/run.sh\0"
+        with open(github_output) as f:
+            assert f.read() == (
+                'mode=walk\nshell=1\ngo=1\ncounts={"go": 1, "shell": 1}\n'
+            )
+        assert "shell: 1 files" in capsys.readouterr().out
+
+    def test_cli_rejects_unknown_language(self):
+        """Test an unknown bucket name is a usage error."""
+        assert main(["scan", "--root", self.root, "--languages", "cobol"]) == 2
+
+
+class TestShardFiles:
+    """Tests for splitting a listing across runners."""
+
+    def setup_method(self):
+        """Set up files of different sizes."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = self.tmpdir.name
+        self.paths = [f"src/f{i}.py" for i in range(20)]
+        for i, rel_path in enumerate(self.paths):
+            write_file(self.root, rel_path, "x" * (i * 1000))
+
+    def teardown_method(self):
+        """Clean up the temporary tree."""
+        self.tmpdir.cleanup()
+
+    def test_shards_partition_and_balance(self):
+        """Test shards are disjoint, complete and of similar weight."""
+        shards = [shard_files(self.paths, i, 3, self.root) for i in range(3)]
+
+        assert sorted(itertools.chain.from_iterable(shards)) == sorted(
+            self.paths
+        )
+        assert all(
+            shard == sorted(shard, key=self.paths.index) for shard in shards
+        )
+        sizes = [
+            sum(os.path.getsize(os.path.join(self.root, p)) for p in shard)
+            for shard in shards
+        ]
+        assert max(sizes) - min(sizes) <= 19000
+        assert shard_files(self.paths, 1, 3, self.root) == shards[1]
+
+    def test_single_shard_and_bad_index(self):
+        """Test one shard is everything and out-of-range shards fail."""
+        assert shard_files(self.paths, 0, 1, self.root) == self.paths
+        with pytest.raises(ValueError, match=r"Shard 3 is not in 0\.\.2"):
+            shard_files(self.paths, 3, 3, self.root)
+        assert (
+            main(
+                [
+                    "scan",
+                    "--root",
+                    self.root,
+                    "--shard-index",
+                    "2",
+                    "--shard-count",
+                    "2",
+                ]
+            )
+            == 2
+        )
+
+    def test_whole_tree_files_stay_in_shard_zero(self):
+        """Test R/C# files and one Go file are pinned to the first shard."""
+        extra = ["b.go", "a.go", "x.R", "App.csproj", "Program.cs"]
+        for rel_path in extra:
+            write_file(self.root, rel_path, "x" * 5000)
+        paths = self.paths + extra
+
+        pinned = whole_tree_files(paths)
+        assert sorted(pinned) == ["App.csproj", "Program.cs", "a.go", "x.R"]
+
+        shards = [shard_files(paths, i, 2, self.root, pinned) for i in range(2)]
+        assert sorted(itertools.chain.from_iterable(shards)) == sorted(paths)
+        assert set(pinned) <= set(shards[0])
+        # The pinned weight counts towards shard 0's balance
+        sizes = [
+            sum(os.path.getsize(os.path.join(self.root, p)) for p in shard)
+            for shard in shards
+        ]
+        assert abs(sizes[0] - sizes[1]) <= 19000
+
+
+class TestGitDiscovery:
+    """Tests for the tracked and changed-files discovery modes."""
+
+    def setup_method(self):
+        """Set up a repository with a base commit and a feature commit."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = self.tmpdir.name
+        git(self.root, "init", "-q")
+        for rel_path in ["app.py", "lib/util.py", "vendor/dep.go", "README.md"]:
+            write_file(self.root, rel_path, "base\n")
+        write_file(self.root, ".prettierignore", "vendor/\n")
+        self._commit("base")
+        self.base = git(self.root, "rev-parse", "HEAD").strip()
+
+        write_file(self.root, "lib/util.py", "changed\n")
+        write_file(self.root, "lib/new.py", "new\n")
+        write_file(self.root, "vendor/dep.go", "changed\n")
+        os.remove(os.path.join(self.root, "README.md"))
+        self._commit("feature")
+
+    def teardown_method(self):
+        """Clean up the temporary repository."""
+        self.tmpdir.cleanup()
+
+    def _commit(self, message):
+        """Commit every change in the temporary repository."""
+        git(self.root, "add", "-A")
+        git(self.root, "commit", "-q", "-m", message)
+
+    def test_tracked_mode_lists_index(self):
+        """Test tracked mode lists tracked files minus ignored ones."""
+        write_file(self.root, "untracked.py")
+
+        files, mode = select_files(self.root, "tracked")
+
+        assert mode == "tracked"
+        assert sorted(files) == [
+            ".prettierignore",
+            "app.py",
+            "lib/new.py",
+            "lib/util.py",
+        ]
+
+    def test_changed_mode_lists_only_changes(self):
+        """Test changed mode drops unchanged, deleted and ignored files."""
+        buckets = discover_files(
+            self.root,
+            ["python", "go", "markdown"],
+            mode="changed",
+            base=self.base,
+        )
+
+        assert buckets == {
+            "python": ["lib/new.py", "lib/util.py"],
+            "go": [],
+            "markdown": [],
+        }
+
+    def test_changed_mode_falls_back_to_tracked(self):
+        """Test config changes and unknown bases trigger a full run."""
+        write_file(self.root, ".prettierrc.json", "{}\n")
+        self._commit("config")
+
+        files, mode = select_files(self.root, "changed", self.base)
+        assert mode == "tracked"
+        assert "app.py" in files
+
+        files, mode = select_files(self.root, "changed", "no-such-ref")
+        assert mode == "tracked"
+        assert select_files(self.root, "changed")[1] == "tracked"
+
+    def test_git_modes_need_a_work_tree(self):
+        """Test git modes outside a repository raise GitError."""
+        with tempfile.TemporaryDirectory() as outside, pytest.raises(GitError):
+            select_files(outside, "tracked")
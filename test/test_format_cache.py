@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+# file: test/test_format_cache.py
+Tests for the content-hash formatting cache.
+
+Run with: python -m pytest test/test_format_cache.py -v
+"""
+
+import json
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+from conftest import write_file
+import pytest
+
+# Add the scripts directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+try:
+    from format_cache import (
+        FINGERPRINTS_FILE,
+        FormatCache,
+        filter_clean,
+        fingerprint,
+        main,
+        record_clean,
+        selected_languages,
+        write_list,
+    )
+    from format_runner import FormatRunner, Task, Tool
+except ImportError as e:
+    pytest.skip(f"Could not import format_cache: {e}", allow_module_level=True)
+
+
+@pytest.fixture
+def _mock_version():
+    """Pin the formatter versions the fingerprints include."""
+    with patch("format_cache.tool_version", return_value="v1.0"):
+        yield
+
+
+class TestFormatCache:
+    """Tests for the LRU cache and its persistence."""
+
+    def setup_method(self):
+        """Set up a temporary directory."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = self.tmpdir.name
+        self.path = os.path.join(self.root, "cache", "format-cache.json")
+
+    def teardown_method(self):
+        """Clean up the temporary directory."""
+        self.tmpdir.cleanup()
+
+    def test_lru_eviction_and_persistence(self):
+        """Test the least recently used entry is evicted and order saved."""
+        cache = FormatCache(self.path, max_entries=2)
+        cache.add("a")
+        cache.add("b")
+        assert cache.contains("a")  # "b" is now least recently used
+        cache.add("c")
+
+        assert not cache.contains("b")
+        assert cache.stats()["evictions"] == 1
+        cache.save()
+
+        reloaded = FormatCache(self.path, max_entries=2)
+        assert len(reloaded) == 2
+        reloaded.add("d")
+        assert not reloaded.contains("a")
+        assert reloaded.contains("c")
+
+    def test_ignores_corrupt_or_foreign_files(self):
+        """Test unreadable or other-version cache files start empty."""
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory)
+        write_file(directory, "format-cache.json", "not json")
+        assert len(FormatCache(self.path)) == 0
+
+        write_file(
+            directory,
+            "format-cache.json",
+            json.dumps({"version": 0, "entries": ["a"]}),
+        )
+        assert len(FormatCache(self.path)) == 0
+
+    def test_filter_and_record_follow_content(self):
+        """Test only unchanged recorded contents are filtered out."""
+        write_file(self.root, "a.py", "x = 1\n")
+        write_file(self.root, "b.py", "y = 2\n")
+        cache = FormatCache(self.path)
+
+        assert filter_clean(cache, "fp", ["a.py", "b.py"], self.root) == [
+            "a.py",
+            "b.py",
+        ]
+        assert (
+            record_clean(cache, "fp", ["a.py", "b.py", "gone.py"], self.root)
+            == 2
+        )
+
+        write_file(self.root, "b.py", "y = 3\n")
+        assert filter_clean(cache, "fp", ["a.py", "b.py"], self.root) == [
+            "b.py"
+        ]
+        assert filter_clean(cache, "other", ["a.py"], self.root) == ["a.py"]
+
+    def test_go_is_cached_per_package(self):
+        """Test one changed file brings its whole package back."""
+        os.makedirs(os.path.join(self.root, "pkg"))
+        files = ["pkg/a.go", "main.go", "pkg/b.go"]
+        for name in files:
+            write_file(self.root, name, "package x\n")
+        cache = FormatCache(self.path)
+
+        assert (
+            record_clean(cache, "fp", files, self.root, per_package=True) == 3
+        )
+        assert filter_clean(cache, "fp", files, self.root, True) == []
+
+        write_file(self.root, "pkg/b.go", "package x // changed\n")
+        assert filter_clean(cache, "fp", files, self.root, True) == [
+            "pkg/a.go",
+            "pkg/b.go",
+        ]
+        assert filter_clean(cache, "fp", ["pkg/a.go"], self.root, True) == [
+            "pkg/a.go"
+        ]
+
+    @pytest.mark.usefixtures("_mock_version")
+    def test_fingerprint_covers_configs_and_settings(self):
+        """Test config contents and settings change the fingerprint."""
+        base = fingerprint("python", self.root, {"line-length": "88"})
+        assert base == fingerprint("python", self.root, {"line-length": "88"})
+        assert base != fingerprint("python", self.root, {"line-length": "100"})
+
+        write_file(self.root, ".ruff.toml", "line-length = 80\n")
+        assert base != fingerprint("python", self.root, {"line-length": "88"})
+
+    def test_selected_languages(self):
+        """Test the action's languages input maps to cached languages."""
+        assert "yaml" in selected_languages("all")
+        assert selected_languages("python, typescript, yaml") == [
+            "python",
+            "nodejs",
+        ]
+
+
+class TestFormatCacheCLI:
+    """Tests for the filter/record commands over file lists."""
+
+    def setup_method(self):
+        """Set up a repository directory and a list directory."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmpdir.name, "repo")
+        self.lists = os.path.join(self.tmpdir.name, "lists")
+        os.makedirs(self.root)
+        os.makedirs(self.lists)
+        for name in ("a.sh", "b.sh"):
+            write_file(self.root, name, "echo hi\n")
+        write_list(os.path.join(self.lists, "shell.list"), ["a.sh", "b.sh"])
+        self.args = [
+            "--root",
+            self.root,
+            "--list-dir",
+            self.lists,
+            "--cache-file",
+            os.path.join(self.tmpdir.name, "cache.json"),
+            "--setting",
+            "enable-linting=true",
+        ]
+
+    def teardown_method(self):
+        """Clean up the temporary directories."""
+        self.tmpdir.cleanup()
+
+    def _list(self):
+        """Read the shell list back."""
+        with open(os.path.join(self.lists, "shell.list")) as f:
+            return [name for name in f.read().split("\0") if name]
+
+    @pytest.mark.usefixtures("_mock_version")
+    def test_round_trip(self):
+        """Test recorded files are dropped from the next run's list."""
+        assert main(["filter", *self.args]) == 0
+        assert self._list() == ["a.sh", "b.sh"]
+        with open(os.path.join(self.lists, FINGERPRINTS_FILE)) as f:
+            assert list(json.load(f)) == ["shell"]
+        assert main(["record", *self.args]) == 0
+
+        write_file(self.root, "b.sh", "echo changed\n")
+        write_list(os.path.join(self.lists, "shell.list"), ["a.sh", "b.sh"])
+        assert main(["filter", *self.args]) == 0
+        assert self._list() == ["b.sh"]
+
+    @pytest.mark.usefixtures("_mock_version")
+    def test_lint_failures_are_not_recorded(self):
+        """Test a lint-failed marker keeps the language out of the cache."""
+        assert main(["filter", *self.args]) == 0
+        write_file(self.lists, "shell.lint-failed", "")
+        assert main(["record", *self.args]) == 0
+
+        assert main(["filter", *self.args]) == 0
+        assert self._list() == ["a.sh", "b.sh"]
+
+    @pytest.mark.usefixtures("_mock_version")
+    def test_attributed_lint_failures(self):
+        """Test only the files named in the marker stay out of the cache."""
+        write_file(self.root, "b.sh", "echo $1\n")
+        assert main(["filter", *self.args]) == 0
+        write_file(self.lists, "shell.lint-failed", "b.sh\0")
+        assert main(["record", *self.args]) == 0
+
+        assert main(["filter", *self.args]) == 0
+        assert self._list() == ["b.sh"]
+
+    @pytest.mark.usefixtures("_mock_version")
+    def test_angular_lint_failures_on_html(self):
+        """Test a tolerated Angular lint failure keeps the html file out."""
+        write_file(self.root, "app.html", "<p>app</p>\n")
+        write_file(self.root, "ok.html", "<p>ok</p>\n")
+        html_list = os.path.join(self.lists, "html.list")
+        write_list(html_list, ["app.html", "ok.html"])
+        assert main(["filter", *self.args]) == 0
+
+        lint = Tool(
+            "eslint (angular)",
+            [sys.executable, "-c", "print('app.html:1:1: error'); exit(1)"],
+            ["typescript", "html"],
+            writes=False,
+            tolerate_failure=True,
+        )
+        tasks = [Task(0, "angular", lint, ["app.html", "ok.html"])]
+        runner = FormatRunner(
+            tasks, jobs=1, root=self.root, list_dir=self.lists
+        )
+        assert runner.run()
+        assert main(["record", *self.args]) == 0
+
+        write_list(html_list, ["app.html", "ok.html"])
+        assert main(["filter", *self.args]) == 0
+        with open(html_list) as f:
+            assert f.read().split("\0")[:-1] == ["app.html"]
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+# file: test/test_format_daemon.py
+Tests for the long-lived formatter daemon.
+
+Run with: python -m pytest test/test_format_daemon.py -v
+"""
+
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import threading
+from unittest.mock import patch
+
+import pytest
+
+# Add the scripts directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+try:
+    from format_daemon import (
+        NOT_INSTALLED,
+        UNSUPPORTED,
+        WORKER_SCRIPT,
+        DaemonClient,
+        DaemonServer,
+        Worker,
+        WorkerPool,
+        benchmark,
+        try_daemon,
+    )
+    from format_runner import FormatRunner, Task, Tool
+except ImportError as e:
+    pytest.skip(f"Could not import format_daemon: {e}", allow_module_level=True)
+
+
+# Worker double speaking the protocol of daemon_worker.js: serves prettier,
+# declines everything else and exits on "crash"
+FAKE_WORKER = """
+import json, sys
+for line in sys.stdin:
+    request = json.loads(line)
+    tool = request["argv"][0]
+    if tool == "crash":
+        sys.exit(1)
+    code = 0 if tool == "prettier" else 125
+    output = " ".join(request["argv"]) + " in " + request["cwd"]
+    print(json.dumps({"id": request["id"], "returncode": code,
+                      "output": output}), flush=True)
+"""
+
+
+class TestFormatDaemon:
+    """Tests for the socket server, client and runner integration."""
+
+    def setup_method(self):
+        """Start a daemon with fake workers on a temporary socket."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.socket = os.path.join(self.tmpdir.name, "daemon.sock")
+        pool = WorkerPool(2, [sys.executable, "-c", FAKE_WORKER])
+        self.server = DaemonServer(self.socket, pool)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.client = DaemonClient(self.socket)
+
+    def teardown_method(self):
+        """Stop the daemon and clean up."""
+        self.server.shutdown()
+        self.thread.join()
+        self.server.server_close()
+        self.tmpdir.cleanup()
+
+    def test_run_and_ping(self):
+        """Test commands are served by the workers and counted."""
+        code, output = self.client.run(["prettier", "--write", "a.js"], "/repo")
+
+        assert code == 0
+        assert output == "prettier --write a.js in /repo"
+        status = self.client.ping()
+        assert (status["workers"], status["requests"]) == (2, 1)
+
+    def test_try_daemon_falls_back(self):
+        """Test declined, unserved and unreachable commands return None."""
+        assert try_daemon(self.client, ["prettier", "--check", "a.js"])
+        assert try_daemon(self.client, ["eslint", "a.js"]) is None
+        assert try_daemon(self.client, ["ruff", "format", "a.py"]) is None
+        assert try_daemon(None, ["prettier", "--write", "a.js"]) is None
+        missing = DaemonClient(os.path.join(self.tmpdir.name, "none.sock"))
+        assert try_daemon(missing, ["prettier", "--write", "a.js"]) is None
+
+    def test_dead_worker_is_replaced(self):
+        """Test a crashed worker declines its request and is restarted."""
+        assert self.client.run(["crash"])[0] == UNSUPPORTED
+        assert self.client.run(["crash"])[0] == UNSUPPORTED
+        assert self.client.run(["prettier", "x.md"])[0] == 0
+
+    def test_runner_sends_tasks_to_daemon(self):
+        """Test prettier tasks are served and others run as processes."""
+        prettier = Tool("prettier", ["prettier", "--write"], ["markdown"])
+        other = Tool(
+            "echo",
+            [sys.executable, "-c", "print('direct')"],
+            ["x"],
+            pass_files=False,
+        )
+        tasks = [
+            Task(0, "markdown", prettier, ["README.md"]),
+            Task(1, "x", other, ["a.x"]),
+        ]
+
+        runner = FormatRunner(
+            tasks, jobs=2, root=self.tmpdir.name, daemon=self.client
+        )
+
+        assert runner.run()
+        assert tasks[0].output.startswith("prettier --write README.md in ")
+        assert tasks[1].output == "direct"
+
+    def test_benchmark(self):
+        """Test the benchmark times a cold CLI against the warm daemon."""
+        bin_dir = os.path.join(self.tmpdir.name, "bin")
+        os.makedirs(bin_dir)
+        fake = os.path.join(bin_dir, "prettier")
+        with open(fake, "w") as f:
+            f.write(f"#!{sys.executable}\nimport time\ntime.sleep(0.2)\n")
+        os.chmod(fake, os.stat(fake).st_mode | stat.S_IEXEC)
+        path = os.pathsep.join([bin_dir, os.environ.get("PATH", "")])
+
+        with patch.dict(os.environ, {"PATH": path}):
+            results = benchmark(["a.js"], self.client, rounds=2)
+
+        assert len(results["cold"]["seconds"]) == 2
+        assert results["cold"]["median"] >= 0.2
+        assert results["speedup"] > 1
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs node")
+def test_node_worker_declines_what_it_cannot_serve():
+    """Test the real Node worker answers unknown tools and flags."""
+    worker = Worker(["node", WORKER_SCRIPT])
+    try:
+        assert (
+            worker.request(["ruff", "a.py"], ".")["returncode"] == UNSUPPORTED
+        )
+        response = worker.request(["prettier", "--bogus", "a.js"], ".")
+        assert response["returncode"] in (UNSUPPORTED, NOT_INSTALLED)
+    finally:
+        worker.close()
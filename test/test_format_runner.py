@@ -0,0 +1,565 @@
+#!/usr/bin/env python3
+"""
+# file: test/test_format_runner.py
+Tests for the parallel formatter and linter runner.
+
+Run with: python -m pytest test/test_format_runner.py -v
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from conftest import git, write_file
+import pytest
+
+# Add the scripts directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+try:
+    from file_discovery import bucket_files, shard_files, whole_tree_files
+    from format_runner import (
+        FormatRunner,
+        RunnerOptions,
+        Task,
+        Tool,
+        attribute_output,
+        build_tasks,
+        enabled_languages,
+        main,
+        pack_batches,
+        pack_packages,
+        validate_json,
+    )
+    from lint_store import LintStore
+    from timing_report import TimingReport, load_report
+except ImportError as e:
+    pytest.skip(f"Could not import format_runner: {e}", allow_module_level=True)
+
+
+def _labels(tasks, ids):
+    """Labels of the tasks with the given ids."""
+    return sorted(tasks[i].label for i in ids)
+
+
+def _python_tool(name, code, **kwargs):
+    """A tool that runs a Python snippet."""
+    return Tool(name, [sys.executable, "-c", code], ["x"], **kwargs)
+
+
+class TestBuildTasks:
+    """Tests for the job graph."""
+
+    def setup_method(self):
+        """Set up a temporary repository root."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.options = RunnerOptions(root=self.tmpdir.name)
+
+    def teardown_method(self):
+        """Clean up the temporary directory."""
+        self.tmpdir.cleanup()
+
+    def test_enabled_languages(self):
+        """Test the languages input maps to runner languages."""
+        assert enabled_languages("python, typescript") == ["python", "nodejs"]
+        assert enabled_languages("markdown") == ["markdown"]
+        assert "yaml" not in enabled_languages("yaml")
+        assert "yaml" in enabled_languages("all")
+
+    def test_python_chain_per_batch(self):
+        """Test the fused ruff pass runs per batch and pylint waits for it."""
+        buckets = {"python": ["a.py", "b.py", "c.py"]}
+        tasks = build_tasks(["python"], buckets, self.options, batch_size=2)
+
+        assert [t.label for t in tasks] == [
+            "python: ruff [1/2]",
+            "python: ruff [2/2]",
+            "python: pylint [1/2]",
+            "python: pylint [2/2]",
+        ]
+        assert _labels(tasks, tasks[2].deps) == ["python: ruff [1/2]"]
+        assert not tasks[0].deps
+        assert tasks[0].tool.executable == "ruff"
+        assert "--output-format=json" in tasks[0].tool.argv
+        assert "--jobs=0" in tasks[2].tool.argv
+
+    def test_independent_languages_do_not_depend(self):
+        """Test languages without shared files have no edges between them."""
+        buckets = {"python": ["a.py"], "go": ["main.go"], "cpp": ["x.cc"]}
+        tasks = build_tasks(["python", "go", "cpp"], buckets, self.options)
+
+        by_id = {t.id: t for t in tasks}
+        for task in tasks:
+            assert all(by_id[d].language == task.language for d in task.deps)
+        roots = [t.label for t in tasks if not t.deps]
+        assert roots == [
+            "python: ruff",
+            "go: goimports+golines",
+            "cpp: clang-format",
+        ]
+
+    def test_prettier_runs_once_for_every_language(self):
+        """Test one prettier pass covers each file once, linters after it."""
+        options = RunnerOptions(root=self.tmpdir.name, prettier_cache="pc")
+        buckets = {
+            "nodejs": ["app.js"],
+            "json": ["package.json"],
+            "markdown": ["README.md"],
+        }
+        tasks = build_tasks(["nodejs", "json", "markdown"], buckets, options)
+
+        prettier = [t for t in tasks if t.tool.name == "prettier"]
+        assert [t.label for t in prettier] == ["shared: prettier"]
+        assert prettier[0].files == ["app.js", "package.json", "README.md"]
+        assert prettier[0].argv[:5] == [
+            "prettier",
+            "--write",
+            "--cache",
+            "--cache-location=pc",
+            "--cache-strategy=content",
+        ]
+        json_syntax = next(t for t in tasks if t.tool.name == "json syntax")
+        assert _labels(tasks, json_syntax.deps) == ["shared: prettier"]
+
+    def test_whole_tree_tool_and_gating(self):
+        """Test go mod tidy runs once and C# needs a project file."""
+        open(os.path.join(self.tmpdir.name, "go.mod"), "w").close()
+        buckets = {
+            "go": ["a.go", "b.go"],
+            "csharp": ["Program.cs"],
+            "dotnet": [],
+        }
+        tasks = build_tasks(
+            ["go", "csharp"], buckets, self.options, batch_size=1
+        )
+
+        tidy = [t for t in tasks if t.tool.name == "go mod tidy"]
+        assert len(tidy) == 1
+        assert tidy[0].argv == ["go", "mod", "tidy"]
+        lint = next(t for t in tasks if t.tool.name == "golangci-lint")
+        assert tidy[0].id in lint.deps
+        assert not any(t.language == "csharp" for t in tasks)
+
+    def test_whole_tree_tools_run_in_one_shard(self):
+        """Test two shards never both run a whole-tree tool."""
+        paths = [
+            "go.mod",
+            "a/1.go",
+            "a/2.go",
+            "b/1.go",
+            "b/2.go",
+            "App.csproj",
+            "Program.cs",
+            "x.R",
+        ]
+        for rel_path in paths:
+            path = os.path.join(self.tmpdir.name, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write("x" * 100)
+
+        labels = []
+        for index in range(2):
+            shard = shard_files(
+                paths, index, 2, self.tmpdir.name, whole_tree_files(paths)
+            )
+            options = RunnerOptions(
+                root=self.tmpdir.name, platform="linux", whole_tree=index == 0
+            )
+            tasks = build_tasks(
+                ["go", "csharp", "r"], bucket_files(shard), options
+            )
+            labels.append([t.tool.name for t in tasks])
+
+        whole_tree = [
+            "go mod tidy",
+            "golangci-lint",
+            "dotnet format",
+            "styler",
+            "lintr",
+        ]
+        assert all(name in labels[0] for name in whole_tree)
+        assert not any(name in labels[1] for name in whole_tree)
+        # Go files are still formatted in both shards
+        assert all("goimports+golines" in names for names in labels)
+
+    def test_batches_fit_the_command_line(self):
+        """Test batches are cut by file count and by argv bytes."""
+        files = [f"{i:03d}.cc" for i in range(10)]  # 6 bytes + 9 overhead
+        argv = ["clang-format", "-i"]  # 12 + 2 + 18 overhead = 32 bytes
+
+        assert pack_batches(argv, files, 4) == [
+            files[0:4],
+            files[4:8],
+            files[8:10],
+        ]
+        assert pack_batches(argv, files, 100, max_bytes=32 + 3 * 15) == [
+            files[0:3],
+            files[3:6],
+            files[6:9],
+            files[9:10],
+        ]
+        # A file longer than the limit still gets a batch of its own
+        assert pack_batches(argv, ["x" * 100], 10, max_bytes=50) == [
+            ["x" * 100]
+        ]
+
+    def test_go_batches_keep_packages_together(self):
+        """Test Go is formatted in one pass per whole package."""
+        files = ["a/1.go", "b/1.go", "b/2.go", "b/3.go", "a/2.go", "c/1.go"]
+
+        assert pack_packages(["golines"], files, 4) == [
+            ["a/1.go", "a/2.go"],
+            ["b/1.go", "b/2.go", "b/3.go", "c/1.go"],
+        ]
+        # A package larger than a batch is split on its own
+        assert pack_packages(["golines"], files, 2) == [
+            ["a/1.go", "a/2.go"],
+            ["b/1.go", "b/2.go"],
+            ["b/3.go", "c/1.go"],
+        ]
+
+        tasks = build_tasks(["go"], {"go": files}, self.options, batch_size=4)
+        formats = [t for t in tasks if t.tool.name == "goimports+golines"]
+        assert [len(t.files) for t in formats] == [2, 4]
+        assert formats[0].tool.requires == ("goimports", "golines", "gofumpt")
+        assert not [t for t in tasks if t.tool.name in ("gofumpt", "goimports")]
+
+    def test_byte_limit_splits_tasks(self):
+        """Test build_tasks applies the command line limit."""
+        buckets = {"cpp": [f"src/file{i}.cc" for i in range(50)]}
+        options = RunnerOptions(root=self.tmpdir.name, enable_linting=False)
+
+        tasks = build_tasks(["cpp"], buckets, options, max_bytes=300)
+
+        assert len(tasks) > 1
+        assert sum(len(t.files) for t in tasks) == 50
+        assert all(len(" ".join(t.argv)) < 300 for t in tasks)
+
+    def test_lint_configs_are_passed_by_flag(self):
+        """Test linters use the shipped configs instead of repo files."""
+        options = RunnerOptions(root=self.tmpdir.name, python_line_length=100)
+        tasks = build_tasks(["python"], {"python": ["a.py"]}, options)
+
+        pylint = next(t for t in tasks if t.tool.name == "pylint")
+        rcfile = pylint.argv[1].split("=", 1)[1]
+        assert os.path.isfile(rcfile)
+        assert "--max-line-length=100" in pylint.argv
+
+    def test_linting_disabled(self):
+        """Test only formatters run without linting."""
+        options = RunnerOptions(root=self.tmpdir.name, enable_linting=False)
+        tasks = build_tasks(
+            ["python", "json"],
+            {
+                "python": ["a.py"],
+                "json": ["a.json"],
+            },
+            options,
+        )
+
+        assert all(t.tool.writes for t in tasks)
+
+
+class TestFormatRunner:
+    """Tests for running the graph."""
+
+    def setup_method(self):
+        """Set up a temporary directory."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = self.tmpdir.name
+
+    def teardown_method(self):
+        """Clean up the temporary directory."""
+        self.tmpdir.cleanup()
+
+    def test_independent_tasks_run_in_parallel(self):
+        """Test tasks without dependencies overlap."""
+        sleep = _python_tool("sleep", "import time; time.sleep(0.5)")
+        tasks = [Task(i, f"lang{i}", sleep, [f"f{i}"]) for i in range(4)]
+
+        start = time.monotonic()
+        assert FormatRunner(tasks, jobs=4, root=self.root).run()
+
+        assert time.monotonic() - start < 1.5
+        assert all(t.status == "ok" for t in tasks)
+
+    def test_failure_skips_dependents(self):
+        """Test a failed formatter skips its chain but not other languages."""
+        fail = _python_tool("fail", "raise SystemExit(2)")
+        ok = _python_tool("ok", "pass")
+        tasks = [
+            Task(0, "python", fail, ["a.py"]),
+            Task(1, "python", ok, ["a.py"]),
+            Task(2, "go", ok, ["a.go"]),
+        ]
+        tasks[1].deps.add(0)
+
+        assert not FormatRunner(tasks, jobs=2, root=self.root).run()
+        assert [t.status for t in tasks] == ["failed", "skipped", "ok"]
+
+    def test_tolerated_failure_leaves_marker(self):
+        """Test a tolerated lint failure writes the format cache marker."""
+        lint = _python_tool(
+            "lint", "raise SystemExit(1)", writes=False, tolerate_failure=True
+        )
+        tasks = [Task(0, "python", lint, ["a.py"])]
+
+        runner = FormatRunner(tasks, jobs=1, root=self.root, list_dir=self.root)
+        assert runner.run()
+        assert tasks[0].status == "tolerated"
+        assert os.path.exists(os.path.join(self.root, "python.lint-failed"))
+        assert "tolerated" in runner.summary()
+
+    def test_markers_follow_discovery_buckets(self):
+        """Test failures are marked under each file's buckets."""
+        lint = _python_tool(
+            "eslint (angular)",
+            "print('app.html:1:1: error'); print('a.component.ts:2:1: x');"
+            "raise SystemExit(1)",
+            writes=False,
+            tolerate_failure=True,
+        )
+        files = ["a.component.ts", "app.html", "ok.html"]
+        tasks = [Task(0, "angular", lint, files)]
+
+        runner = FormatRunner(tasks, jobs=1, root=self.root, list_dir=self.root)
+        assert runner.run()
+
+        markers = {}
+        for bucket in ("html", "nodejs", "typescript", "angular"):
+            with open(os.path.join(self.root, f"{bucket}.lint-failed")) as f:
+                markers[bucket] = f.read()
+        assert markers["html"] == "app.html\0"
+        assert markers["nodejs"] == "a.component.ts\0"
+        assert markers["typescript"] == markers["angular"] == markers["nodejs"]
+
+    def test_attribute_output(self):
+        """Test diagnostic lines are assigned to the files they name."""
+        files = ["src/a.cc", "src/b.cc", "c.json"]
+        output = "\n".join(
+            [
+                "src/a.cc:12:  Missing space  [whitespace/comma] [3]",
+                "Done processing src/a.cc",
+                "./src/b.cc:1:1: warning: unused",
+                "[error] c.json: SyntaxError: Unexpected token (1:2)",
+                os.path.join(self.root, "src", "a.cc") + ":3:1: error",
+                "Total errors found: 3",
+            ]
+        )
+
+        errors = attribute_output(files, output, self.root)
+
+        assert sorted(errors) == ["c.json", "src/a.cc", "src/b.cc"]
+        assert len(errors["src/a.cc"]) == 2
+
+    def test_batch_failures_are_attributed(self):
+        """Test a failing batch reports only the files it named."""
+        with open(os.path.join(self.root, "good.json"), "w") as f:
+            f.write('{"a": 1}')
+        with open(os.path.join(self.root, "bad.json"), "w") as f:
+            f.write('{"a": }')
+        assert validate_json(["good.json"], self.root) == (0, "")
+
+        tool = Tool(
+            "json syntax",
+            [],
+            ["json"],
+            writes=False,
+            tolerate_failure=True,
+            function=validate_json,
+        )
+        tasks = [Task(0, "json", tool, ["good.json", "bad.json"])]
+        runner = FormatRunner(tasks, jobs=1, root=self.root, list_dir=self.root)
+
+        assert runner.run()
+        assert list(tasks[0].file_errors) == ["bad.json"]
+        assert runner.file_statuses() == {
+            "bad.json": {"json: json syntax": "tolerated"},
+        }
+        with open(os.path.join(self.root, "json.lint-failed")) as f:
+            assert f.read() == "bad.json\0"
+
+    def test_unattributed_failure_marks_whole_batch(self):
+        """Test a failure naming no file is charged to every file."""
+        crash = _python_tool(
+            "crash", "raise SystemExit('boom')", tolerate_failure=True
+        )
+        tasks = [Task(0, "cpp", crash, ["a.cc", "b.cc"])]
+        runner = FormatRunner(tasks, jobs=1, root=self.root, list_dir=self.root)
+
+        assert runner.run()
+        assert sorted(runner.file_statuses()) == ["a.cc", "b.cc"]
+        with open(os.path.join(self.root, "cpp.lint-failed")) as f:
+            assert f.read() == "a.cc\0b.cc\0"
+
+    def test_tasks_are_timed(self):
+        """Test each task adds a tool record to the timing report."""
+        with open(os.path.join(self.root, "a.py"), "w") as f:
+            f.write("x = 1\n")
+        ok = _python_tool("ok", "pass")
+        tasks = [Task(0, "python", ok, ["a.py"])]
+        path = os.path.join(self.root, "timing.ndjson")
+
+        assert FormatRunner(
+            tasks, jobs=1, root=self.root, report=TimingReport(path)
+        ).run()
+
+        [record] = load_report(path)
+        assert record["category"] == "tool"
+        assert (record["language"], record["tool"]) == ("python", "ok")
+        assert (record["files"], record["bytes"], record["exit_code"]) == (
+            1,
+            6,
+            0,
+        )
+
+    def test_missing_optional_tool_is_skipped(self):
+        """Test a tool with an unavailable executable does not fail."""
+        tool = Tool(
+            "missing", ["no-such-tool"], ["x"], executable="no-such-tool"
+        )
+        tasks = [Task(0, "shell", tool, ["a.sh"])]
+
+        assert FormatRunner(tasks, jobs=1, root=self.root).run()
+        assert tasks[0].status == "unavailable"
+
+    def _lint_store_tasks(self, linted):
+        """A per-file linter flagging lines with "bad", in a fresh task."""
+
+        def lint(files, root):
+            linted.extend(files)
+            lines = []
+            for path in files:
+                with open(os.path.join(root, path)) as f:
+                    for number, line in enumerate(f, 1):
+                        if "bad" in line:
+                            lines.append(
+                                f"{path}:{number}:1: E1 {line.strip()}"
+                            )
+            return (1 if lines else 0), "\n".join(lines)
+
+        tool = Tool("lint", [], ["sh"], writes=False, function=lint)
+        return [Task(0, "shell", tool, ["a.sh", "b.sh"])]
+
+    def test_lint_store_replays_known_contents(self):
+        """Test stored results are replayed instead of linting again."""
+        with open(os.path.join(self.root, "a.sh"), "w") as f:
+            f.write("bad\n")
+        with open(os.path.join(self.root, "b.sh"), "w") as f:
+            f.write("ok\n")
+        path = os.path.join(self.root, "lint-store.json")
+        linted = []
+
+        store = LintStore(path)
+        tasks = self._lint_store_tasks(linted)
+        assert not FormatRunner(tasks, 1, self.root, lint_store=store).run()
+        store.save()
+        assert linted == ["a.sh", "b.sh"]
+
+        with open(os.path.join(self.root, "b.sh"), "w") as f:
+            f.write("still ok\n")
+        store = LintStore(path)
+        tasks = self._lint_store_tasks(linted)
+        assert not FormatRunner(tasks, 1, self.root, lint_store=store).run()
+
+        assert linted == ["a.sh", "b.sh", "b.sh"]
+        assert tasks[0].replayed == 1
+        assert tasks[0].status == "failed"
+        assert tasks[0].file_errors == {"a.sh": ["a.sh:1:1: E1 bad"]}
+
+    def test_lint_store_keeps_what_a_fixer_left(self):
+        """Test a --fix linter is replayed once its output is on disk."""
+
+        def fix(files, root):
+            linted.extend(files)
+            lines = []
+            for path in files:
+                with open(os.path.join(root, path)) as f:
+                    text = f.read().replace("bad", "fixed")
+                with open(os.path.join(root, path), "w") as f:
+                    f.write(text)
+                if "worse" in text:
+                    lines.append(f"{path}:2:1: E2 worse")
+            return (1 if lines else 0), "\n".join(lines)
+
+        with open(os.path.join(self.root, "a.md"), "w") as f:
+            f.write("bad\nworse\n")
+        store = LintStore(os.path.join(self.root, "lint-store.json"))
+        linted = []
+
+        for _ in range(2):
+            tool = Tool(
+                "fixer",
+                [],
+                ["md"],
+                tolerate_failure=True,
+                function=fix,
+                fixes=True,
+            )
+            tasks = [Task(0, "markdown", tool, ["a.md"])]
+            assert FormatRunner(tasks, 1, self.root, lint_store=store).run()
+
+        assert linted == ["a.md"]
+        assert tasks[0].replayed == 1
+        assert tasks[0].file_errors == {"a.md": ["a.md:2:1: E2 worse"]}
+        with open(os.path.join(self.root, "a.md")) as f:
+            assert f.read() == "fixed\nworse\n"
+
+    def test_base_findings_do_not_fail(self):
+        """Test only findings the base revision lacks fail the run."""
+        git(self.root, "init", "-q")
+        write_file(self.root, "a.sh", "bad\n")
+        write_file(self.root, "b.sh", "ok\n")
+        git(self.root, "add", "-A")
+        git(self.root, "commit", "-q", "-m", "base")
+        store = LintStore(os.path.join(self.root, "lint-store.json"))
+        linted = []
+        FormatRunner(
+            self._lint_store_tasks(linted), 1, self.root, lint_store=store
+        ).run()
+
+        # The base's finding moved down a line and b.sh stayed the same
+        with open(os.path.join(self.root, "a.sh"), "w") as f:
+            f.write("ok\nbad\n")
+        tasks = self._lint_store_tasks(linted)
+        runner = FormatRunner(
+            tasks, 1, self.root, lint_store=store, base="HEAD"
+        )
+        assert runner.run()
+        assert tasks[0].status == "tolerated"
+        assert tasks[0].new_findings == {}
+
+        # A second finding is new
+        with open(os.path.join(self.root, "a.sh"), "w") as f:
+            f.write("ok\nbad\nbad again\n")
+        tasks = self._lint_store_tasks(linted)
+        runner = FormatRunner(
+            tasks, 1, self.root, lint_store=store, base="HEAD"
+        )
+        assert not runner.run()
+        assert tasks[0].new_findings == {"a.sh": ["a.sh:3:1: E1 bad again"]}
+
+    def test_plan_cli(self, capsys):
+        """Test --plan prints the graph from discovery lists."""
+        with open(os.path.join(self.root, "python.list"), "w") as f:
+            f.write("a.py\0b.py\0")
+
+        code = main(
+            [
+                "--root",
+                self.root,
+                "--list-dir",
+                self.root,
+                "--languages",
+                "python",
+                "--enable-linting",
+                "false",
+                "--plan",
+            ]
+        )
+
+        assert code == 0
+        lines = capsys.readouterr().out.splitlines()
+        assert lines == ["   0 python: ruff (2 files) <- -"]
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+# file: test/test_format_state.py
+Tests for the formatted-state trailers.
+
+Run with: python -m pytest test/test_format_state.py -v
+"""
+
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+from conftest import git, write_file
+import pytest
+
+# Add the scripts directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+try:
+    from format_state import (
+        config_fingerprint,
+        format_trailers,
+        is_formatted,
+        main,
+        parse_trailers,
+        staged_tree,
+    )
+except ImportError as e:
+    pytest.skip(f"Could not import format_state: {e}", allow_module_level=True)
+
+
+class TestFormatState:
+    """Tests for recording and checking the formatted state."""
+
+    def setup_method(self):
+        """Set up a repository with a subdirectory and a fake action."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmpdir.name, "repo")
+        self.action = os.path.join(self.tmpdir.name, "action")
+        write_file(self.action, "action.yml", "name: x\n")
+        write_file(self.action, "scripts/configs/pylintrc", "[MASTER]\n")
+        os.makedirs(self.root)
+        git(self.root, "init", "-q")
+        write_file(self.root, "app/a.py", "x = 1\n")
+        write_file(self.root, "other.md", "# Other\n")
+        git(self.root, "add", "-A")
+        git(self.root, "commit", "-q", "-m", "base")
+        self.app = os.path.join(self.root, "app")
+        self.fingerprint = config_fingerprint(self.action, {"languages": "all"})
+
+    def teardown_method(self):
+        """Clean up the temporary directories."""
+        self.tmpdir.cleanup()
+
+    def _commit_formatted(self, message="chore: tidy"):
+        """Commit the staged tree of app/ with its trailers."""
+        trailers = format_trailers(staged_tree(self.app), self.fingerprint)
+        git(
+            self.root,
+            "commit",
+            "-q",
+            "--allow-empty",
+            "-m",
+            f"{message}\n\nBody.\n\n{trailers}",
+        )
+
+    def test_fingerprint_follows_action_files_and_settings(self):
+        """Test the action's files and inputs change the fingerprint."""
+        other = config_fingerprint(self.action, {"languages": "python"})
+        assert other != self.fingerprint
+
+        write_file(
+            self.action, "scripts/configs/pylintrc", "[MASTER]\njobs=0\n"
+        )
+        assert (
+            config_fingerprint(self.action, {"languages": "all"})
+            != self.fingerprint
+        )
+
+    def test_parse_trailers(self):
+        """Test only the last paragraph holds trailers."""
+        message = (
+            "style: x\n\nAuto-Formatter-Tree: early\n\n"
+            "Signed-off-by: t\nAuto-Formatter-Tree: abc\n"
+            "Auto-Formatter-Config: def\n"
+        )
+        assert parse_trailers(message) == {
+            "Auto-Formatter-Tree": "abc",
+            "Auto-Formatter-Config": "def",
+        }
+        assert parse_trailers("") == {}
+
+    def test_custom_message_is_recognized(self):
+        """Test the skip follows the trailers, not the commit message."""
+        assert is_formatted(self.app, self.fingerprint)[0] is False
+
+        self._commit_formatted("docs: any custom message")
+
+        assert is_formatted(self.app, self.fingerprint) == (
+            True,
+            "HEAD is already formatted with this configuration",
+        )
+        assert is_formatted(self.app, "other")[0] is False
+
+    def test_copied_trailers_need_the_same_tree(self):
+        """Test a rebased or amended commit is checked against its tree."""
+        self._commit_formatted()
+
+        # Amending keeps the message: outside app/ nothing counts ...
+        write_file(self.root, "other.md", "# Changed\n")
+        git(self.root, "commit", "-q", "-a", "--amend", "--no-edit")
+        assert is_formatted(self.app, self.fingerprint)[0] is True
+
+        # ... inside it the recorded tree no longer matches
+        write_file(self.app, "a.py", "x = 2\n")
+        git(self.root, "commit", "-q", "-a", "--amend", "--no-edit")
+        assert is_formatted(self.app, self.fingerprint) == (
+            False,
+            "the tree changed since the last formatted state",
+        )
+
+    def test_cli(self):
+        """Test check exposes skip and fingerprint, trailers prints them."""
+        output = os.path.join(self.tmpdir.name, "output")
+        args = ["--root", self.app, "--action-path", self.action]
+
+        with patch.dict(os.environ, {"GITHUB_OUTPUT": output}):
+            assert main([*args, "check", "--setting", "languages=all"]) == 0
+        with open(output) as f:
+            outputs = dict(line.split("=", 1) for line in f.read().splitlines())
+        assert outputs == {"skip": "false", "fingerprint": self.fingerprint}
+
+        self._commit_formatted()
+        os.remove(output)
+        with patch.dict(os.environ, {"GITHUB_OUTPUT": output}):
+            assert main([*args, "check", "--setting", "languages=all"]) == 0
+        with open(output) as f:
+            assert f.readline() == "skip=true\n"
+
+        assert main([*args, "check", "--setting", "languages"]) == 2
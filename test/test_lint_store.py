@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+# file: test/test_lint_store.py
+Tests for the incremental lint results store.
+
+Run with: python -m pytest test/test_lint_store.py -v
+"""
+
+import os
+import sys
+import tempfile
+
+from conftest import git, write_file
+import pytest
+
+# Add the scripts directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+try:
+    from file_discovery import GitError
+    from format_cache import file_digest
+    from lint_store import (
+        LintResult,
+        LintStore,
+        base_digests,
+        lint_fingerprint,
+        new_findings,
+        restore_path,
+        strip_path,
+    )
+except ImportError as e:
+    pytest.skip(f"Could not import lint_store: {e}", allow_module_level=True)
+
+
+class TestLintStore:
+    """Tests for storing and comparing lint results."""
+
+    def setup_method(self):
+        """Set up a temporary directory."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = self.tmpdir.name
+        self.path = os.path.join(self.root, "cache", "lint-store.json")
+
+    def teardown_method(self):
+        """Clean up the temporary directory."""
+        self.tmpdir.cleanup()
+
+    def test_paths_are_stored_as_placeholder(self):
+        """Test every spelling of the path is replaced and restored."""
+        absolute = os.path.join(os.path.abspath(self.root), "src", "a.sh")
+        lines = [
+            f"{absolute}:3:1: SC2086 quote this",
+            "./src/a.sh:4:1: SC2034 unused",
+            "In src/a.sh line 7:",
+            "unrelated line",
+        ]
+
+        stripped = strip_path(lines, "src/a.sh", self.root)
+
+        assert stripped == [
+            "<path>:3:1: SC2086 quote this",
+            "<path>:4:1: SC2034 unused",
+            "In <path> line 7:",
+            "unrelated line",
+        ]
+        assert restore_path(stripped, "b.sh")[:2] == [
+            "b.sh:3:1: SC2086 quote this",
+            "b.sh:4:1: SC2034 unused",
+        ]
+
+    def test_new_findings_ignore_positions(self):
+        """Test moved findings are not new but extra reports are."""
+        base = ["<path>:3:1: E1 bad", "In <path> line 9:"]
+        lines = [
+            "<path>:10:5: E1 bad",
+            "<path>:12:1: E1 bad",
+            "In <path> line 2:",
+            "<path>:1:1: E2 worse",
+        ]
+
+        assert new_findings(lines, base) == [
+            "<path>:12:1: E1 bad",
+            "<path>:1:1: E2 worse",
+        ]
+        assert new_findings(base, base) == []
+
+    def test_round_trip_and_lru(self):
+        """Test saved results load again and the oldest are evicted."""
+        store = LintStore(self.path, max_entries=2)
+        store.put("a", LintResult(["<path>:1:1: E1 bad"], True))
+        store.put("b", LintResult([], False))
+        assert store.get("a").failed
+        store.put("c", LintResult([], False))
+
+        assert store.peek("b") is None
+        assert store.stats() == {
+            "entries": 2,
+            "hits": 1,
+            "misses": 0,
+            "evictions": 1,
+        }
+
+        store.save()
+        loaded = LintStore(self.path)
+        assert len(loaded) == 2
+        assert loaded.get("a") == LintResult(["<path>:1:1: E1 bad"], True)
+        assert loaded.get("b") is None
+        assert loaded.stats()["misses"] == 1
+
+    def test_corrupt_store_starts_empty(self):
+        """Test an unreadable store file is ignored."""
+        write_file(self.root, "cache/lint-store.json", "{not json")
+        assert len(LintStore(self.path)) == 0
+
+    def test_fingerprint_follows_config_contents(self):
+        """Test a config named on the command line is hashed by content."""
+        write_file(self.root, "shellcheckrc", "disable=SC2086\n")
+        config = os.path.join(self.root, "shellcheckrc")
+        argv = ["no-such-linter", f"--rcfile={config}"]
+
+        before = lint_fingerprint("shell", "shellcheck", argv, self.root)
+        assert (
+            lint_fingerprint("shell", "shellcheck", argv, self.root) == before
+        )
+
+        write_file(self.root, "shellcheckrc", "disable=SC2034\n")
+        assert (
+            lint_fingerprint("shell", "shellcheck", argv, self.root) != before
+        )
+        assert LintStore.key(before, "x") != LintStore.key(before, "y")
+
+    def test_base_digests(self):
+        """Test base contents are hashed like files on disk."""
+        git(self.root, "init", "-q")
+        write_file(self.root, "app/a.sh", "echo $a\n")
+        git(self.root, "add", "-A")
+        git(self.root, "commit", "-q", "-m", "base")
+        base = git(self.root, "rev-parse", "HEAD").strip()
+        expected = file_digest(os.path.join(self.root, "app", "a.sh"))
+        write_file(self.root, "app/a.sh", 'echo "$a"\n')
+        write_file(self.root, "app/new.sh", "echo\n")
+
+        app = os.path.join(self.root, "app")
+        assert base_digests(app, base, ["a.sh", "new.sh"]) == {
+            "a.sh": expected,
+            "new.sh": None,
+        }
+        with pytest.raises(GitError):
+            base_digests(app, "no-such-rev", ["a.sh"])
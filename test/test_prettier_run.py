@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+# file: test/test_prettier_run.py
+Tests for the shared prettier run.
+
+Run with: python -m pytest test/test_prettier_run.py -v
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add the scripts directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+try:
+    from prettier_run import (
+        extension,
+        extension_stats,
+        prettier_argv,
+        render_stats,
+    )
+except ImportError as e:
+    pytest.skip(f"Could not import prettier_run: {e}", allow_module_level=True)
+
+
+class TestPrettierRun:
+    """Tests for the prettier command and its per-extension statistics."""
+
+    def test_argv(self):
+        """Test the cache is keyed by content at the given location."""
+        assert prettier_argv() == ["prettier", "--write"]
+        assert prettier_argv("/tmp/pc") == [
+            "prettier",
+            "--write",
+            "--cache",
+            "--cache-location=/tmp/pc",
+            "--cache-strategy=content",
+        ]
+
+    def test_extension(self):
+        """Test files are grouped by lower-case suffix or name."""
+        assert extension("src/App.TSX") == ".tsx"
+        assert extension("docs/README.md") == ".md"
+        assert extension(".prettierrc") == ".prettierrc"
+
+    def test_extension_stats(self):
+        """Test prettier's --write log becomes per-extension totals."""
+        files = ["a.ts", "b.ts", "c.json", "d.md", "ignored.md"]
+        outputs = [
+            "a.ts 120ms\nb.ts 30ms (unchanged)",
+            "c.json 0ms (unchanged) (cached)\n./d.md 50ms",
+        ]
+
+        stats = extension_stats(files, outputs)
+
+        assert list(stats) == [".json", ".md", ".ts"]
+        assert stats[".ts"] == {
+            "files": 2,
+            "seconds": 0.15,
+            "changed": 1,
+            "cached": 0,
+        }
+        assert stats[".json"]["cached"] == 1
+        assert stats[".md"]["files"] == 2
+        assert stats[".md"]["seconds"] == 0.05
+        assert render_stats(stats).splitlines()[3].split() == [
+            ".ts",
+            "2",
+            "1",
+            "0",
+            "0.1s",
+        ]
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+# file: test/test_python_pipeline.py
+Tests for the fused Python formatting pipeline.
+
+Run with: python -m pytest test/test_python_pipeline.py -v
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+# Add the scripts directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+try:
+    from python_pipeline import PythonPipeline, benchmark, parse_ruff_json
+except ImportError as e:
+    pytest.skip(
+        f"Could not import python_pipeline: {e}", allow_module_level=True
+    )
+
+
+needs_ruff = pytest.mark.skipif(
+    shutil.which("ruff") is None, reason="needs ruff"
+)
+
+
+class TestPythonPipeline:
+    """Tests for the fused ruff pass and the pylint selection."""
+
+    def setup_method(self):
+        """Set up a directory of Python files."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = self.tmpdir.name
+        self.files = {
+            "clean.py": '"""Clean."""\n\nVALUE = 1\n',
+            "messy.py": "import sys\nimport os\nx=[1,\n2]\nprint(os, sys)\n",
+            "flagged.py": '"""Flagged."""\n\nprint(undefined_name)\n',
+        }
+        for name, content in self.files.items():
+            with open(os.path.join(self.root, name), "w") as f:
+                f.write(content)
+        self.pipeline = PythonPipeline(88, "pylintrc")
+
+    def teardown_method(self):
+        """Clean up the temporary directory."""
+        self.tmpdir.cleanup()
+
+    def test_parse_ruff_json(self):
+        """Test ruff's JSON report becomes root-relative diagnostics."""
+        text = json.dumps(
+            [
+                {
+                    "filename": os.path.join(self.root, "pkg", "a.py"),
+                    "code": "F821",
+                    "message": "Undefined name `x`",
+                    "location": {"row": 3, "column": 7},
+                }
+            ]
+        )
+
+        assert parse_ruff_json(text, self.root) == [
+            {
+                "path": os.path.join("pkg", "a.py"),
+                "row": 3,
+                "column": 7,
+                "code": "F821",
+                "message": "Undefined name `x`",
+            }
+        ]
+        assert parse_ruff_json("warning: not json", self.root) == []
+
+    @needs_ruff
+    def test_one_pass_fixes_sorts_formats_and_reports(self):
+        """Test the fused pass rewrites and remembers what pylint needs."""
+        code, output = self.pipeline.run_ruff(sorted(self.files), self.root)
+
+        with open(os.path.join(self.root, "messy.py")) as f:
+            assert (
+                f.read()
+                == "import os\nimport sys\n\nx = [1, 2]\nprint(os, sys)\n"
+            )
+        assert code == 1
+        assert "flagged.py:3:7: F821 Undefined name `undefined_name`" in output
+        assert self.pipeline.selected == {"messy.py", "flagged.py"}
+
+    def test_pylint_skips_untouched_batches(self):
+        """Test pylint only sees files ruff rewrote or flagged."""
+        self.pipeline.selected.update({"messy.py"})
+
+        assert self.pipeline.run_pylint(["clean.py"], self.root) == (
+            0,
+            "ruff left all 1 files untouched and clean",
+        )
+        code, output = self.pipeline.run_pylint(
+            ["clean.py", "messy.py"], self.root
+        )
+        if shutil.which("pylint") is None:
+            assert code == 127
+            assert output.startswith("pylint:")
+
+    @needs_ruff
+    def test_benchmark(self):
+        """Test both paths are timed on copies, leaving the tree alone."""
+        results = benchmark(self.root, rounds=1)
+
+        assert results["files"] == 3
+        for name in ("legacy", "fused"):
+            assert results[name]["median"] > 0
+            assert results[name]["files_per_second"] > 0
+        assert results["fused"]["exit_codes"]["ruff"] == 1
+        with open(os.path.join(self.root, "messy.py")) as f:
+            assert f.read() == self.files["messy.py"]
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+# file: test/test_shard_patches.py
+Tests for exporting and merging shard patches.
+
+Run with: python -m pytest test/test_shard_patches.py -v
+"""
+
+import os
+import sys
+import tempfile
+
+from conftest import git, write_file
+import pytest
+
+# Add the scripts directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+try:
+    from file_discovery import GitError
+    from shard_patches import apply_patches, export_patch, find_patches, main
+except ImportError as e:
+    pytest.skip(f"Could not import shard_patches: {e}", allow_module_level=True)
+
+
+def _read(root, rel_path):
+    """Read a file under root."""
+    with open(os.path.join(root, *rel_path.split("/"))) as f:
+        return f.read()
+
+
+class TestShardPatches:
+    """Tests for the export and apply round trip."""
+
+    def setup_method(self):
+        """Set up an origin repository and a clone per shard and merge."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.origin = os.path.join(self.tmpdir.name, "origin")
+        os.makedirs(self.origin)
+        git(self.origin, "init", "-q")
+        for rel_path in ["app/a.py", "app/b.go", "other/c.sh"]:
+            write_file(self.origin, rel_path, "unformatted\n")
+        git(self.origin, "add", "-A")
+        git(self.origin, "commit", "-q", "-m", "base")
+        self.patches = os.path.join(self.tmpdir.name, "patches")
+
+    def teardown_method(self):
+        """Clean up the temporary repositories."""
+        self.tmpdir.cleanup()
+
+    def _clone(self, name):
+        """Clone the origin repository."""
+        path = os.path.join(self.tmpdir.name, name)
+        git(self.tmpdir.name, "clone", "-q", self.origin, path)
+        return path
+
+    def test_round_trip_from_subdirectory(self):
+        """Test shard patches made in a subdirectory merge in one go."""
+        for shard, rel_path in enumerate(["app/a.py", "app/b.go"]):
+            clone = self._clone(f"shard-{shard}")
+            write_file(clone, rel_path, "formatted\n")
+            write_file(clone, "other/c.sh", "outside working directory\n")
+            output = os.path.join(
+                self.patches, f"shard-{shard}", f"shard-{shard}.patch"
+            )
+            assert export_patch(os.path.join(clone, "app"), output) > 0
+        empty = os.path.join(self.patches, "shard-2", "shard-2.patch")
+        assert export_patch(self._clone("shard-2"), empty) == 0
+
+        merge = self._clone("merge")
+        patches = find_patches(self.patches)
+        assert len(patches) == 2
+        apply_patches(os.path.join(merge, "app"), patches)
+
+        assert _read(merge, "app/a.py") == "formatted\n"
+        assert _read(merge, "app/b.go") == "formatted\n"
+        assert _read(merge, "other/c.sh") == "unformatted\n"
+
+    def test_conflicting_patches_apply_nothing(self):
+        """Test a patch that does not apply leaves the tree untouched."""
+        for shard, content in enumerate(["one\n", "two\n"]):
+            clone = self._clone(f"shard-{shard}")
+            write_file(clone, "app/a.py", content)
+            export_patch(clone, os.path.join(self.patches, f"{shard}.patch"))
+        merge = self._clone("merge")
+
+        with pytest.raises(GitError):
+            apply_patches(merge, find_patches(self.patches))
+        assert git(merge, "status", "--porcelain") == ""
+        assert (
+            main(["--root", merge, "apply", "--patch-dir", self.patches]) == 1
+        )
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+# file: test/test_timing_report.py
+Tests for the timing instrumentation and report.
+
+Run with: python -m pytest test/test_timing_report.py -v
+"""
+
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+import pytest
+
+# Add the scripts directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+try:
+    from timing_report import (
+        TimingReport,
+        file_bytes,
+        load_report,
+        main,
+        render_markdown,
+        run_timed,
+    )
+except ImportError as e:
+    pytest.skip(f"Could not import timing_report: {e}", allow_module_level=True)
+
+
+class TestRunTimed:
+    """Tests for measuring a child process."""
+
+    def test_output_exit_code_and_rss(self):
+        """Test output, exit code and peak RSS are reported."""
+        code, output, seconds, rss = run_timed(
+            [
+                sys.executable,
+                "-c",
+                (
+                    "import sys; b = bytearray(32 * 1024 * 1024); "
+                    "print('out'); print('err', file=sys.stderr); sys.exit(3)"
+                ),
+            ]
+        )
+
+        assert code == 3
+        assert output.splitlines() == ["out", "err"]
+        assert seconds > 0
+        if hasattr(os, "wait4"):
+            assert rss > 32 * 1024 * 1024
+
+    @pytest.mark.skipif(not hasattr(os, "wait4"), reason="needs os.wait4")
+    def test_signal_exit_code(self):
+        """Test a killed child reports a negative signal number."""
+        code, _, _, _ = run_timed(
+            [
+                sys.executable,
+                "-c",
+                "import os, signal; os.kill(os.getpid(), 9)",
+            ]
+        )
+
+        assert code == -9
+
+    def test_missing_command(self):
+        """Test a command that cannot start raises OSError."""
+        with pytest.raises(OSError, match="no-such-command-for-timing"):
+            run_timed(["no-such-command-for-timing"])
+
+
+class TestTimingReport:
+    """Tests for the NDJSON report and its rendering."""
+
+    def setup_method(self):
+        """Set up a temporary directory."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "timing", "report.ndjson")
+
+    def teardown_method(self):
+        """Clean up the temporary directory."""
+        self.tmpdir.cleanup()
+
+    def test_append_and_load(self):
+        """Test records round-trip and malformed lines are skipped."""
+        report = TimingReport(self.path)
+        report.add("install", "ruff", 1.25, 0, 1024)
+        with open(self.path, "a") as f:
+            f.write("not json\n")
+        report.add(
+            "tool",
+            "python: ruff format",
+            0.5,
+            1,
+            None,
+            language="python",
+            tool="ruff format",
+            files=3,
+            bytes=10,
+        )
+
+        records = load_report(self.path)
+
+        assert [r["name"] for r in records] == ["ruff", "python: ruff format"]
+        assert records[1]["files"] == 3
+        assert load_report(os.path.join(self.tmpdir.name, "missing")) == []
+
+    def test_file_bytes(self):
+        """Test sizes are summed and missing files ignored."""
+        with open(os.path.join(self.tmpdir.name, "a.py"), "w") as f:
+            f.write("x = 1\n")
+
+        assert file_bytes(["a.py", "gone.py"], self.tmpdir.name) == 6
+
+    def test_render_markdown(self):
+        """Test steps, languages and tools are tabulated."""
+        records = [
+            {
+                "category": "step",
+                "name": "discover files",
+                "seconds": 0.4,
+                "exit_code": 0,
+                "max_rss_bytes": 20 * 1024 * 1024,
+            },
+            {
+                "category": "tool",
+                "name": "go: gofumpt",
+                "seconds": 1.0,
+                "exit_code": 0,
+                "max_rss_bytes": 1024 * 1024,
+                "language": "go",
+                "tool": "gofumpt",
+                "files": 4,
+                "bytes": 100,
+            },
+            {
+                "category": "tool",
+                "name": "python: pylint [1/2]",
+                "seconds": 5.0,
+                "exit_code": 1,
+                "max_rss_bytes": None,
+                "language": "python",
+                "tool": "pylint",
+                "files": 2,
+                "bytes": 50,
+            },
+            {
+                "category": "tool",
+                "name": "python: pylint [2/2]",
+                "seconds": 3.0,
+                "exit_code": 0,
+                "max_rss_bytes": 2097152,
+                "language": "python",
+                "tool": "pylint",
+                "files": 2,
+                "bytes": 50,
+            },
+            {
+                "category": "extension",
+                "name": ".md",
+                "seconds": 0.25,
+                "exit_code": None,
+                "max_rss_bytes": None,
+                "tool": "prettier",
+                "files": 3,
+                "changed": 1,
+                "cached": 2,
+            },
+        ]
+
+        markdown = render_markdown(records)
+
+        assert "| discover files | 0.4 | 0 | 20.0 | - |" in markdown
+        assert "| python | pylint | 2 | 4 | 8.0 | 2.0 | 1 |" in markdown
+        languages = markdown.split("### Languages")[1]
+        assert languages.index("| python |") < languages.index("| go |")
+        assert "| .md | prettier | 3 | 1 | 2 | 0.2 |" in markdown
+        assert "No timing data" in render_markdown([])
+
+
+class TestTimingReportCLI:
+    """Tests for the run, record and summary commands."""
+
+    def setup_method(self):
+        """Set up a temporary directory."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.report = os.path.join(self.tmpdir.name, "report.ndjson")
+        self.output = os.path.join(self.tmpdir.name, "output")
+        self.summary = os.path.join(self.tmpdir.name, "summary.md")
+
+    def teardown_method(self):
+        """Clean up the temporary directory."""
+        self.tmpdir.cleanup()
+
+    def test_run_record_and_summary(self):
+        """Test commands are timed and the summary exposes the report."""
+        code = main(
+            [
+                "--report",
+                self.report,
+                "run",
+                "--category",
+                "install",
+                "--name",
+                "fake tool",
+                "--",
+                sys.executable,
+                "-c",
+                "raise SystemExit(4)",
+            ]
+        )
+        assert code == 4
+        assert (
+            main(
+                [
+                    "--report",
+                    self.report,
+                    "record",
+                    "--name",
+                    "setup",
+                    "--since",
+                    "0",
+                ]
+            )
+            == 0
+        )
+
+        env = {
+            "GITHUB_OUTPUT": self.output,
+            "GITHUB_STEP_SUMMARY": self.summary,
+        }
+        with patch.dict(os.environ, env):
+            assert main(["--report", self.report, "summary"]) == 0
+
+        records = load_report(self.report)
+        assert [
+            (r["category"], r["name"], r["exit_code"]) for r in records
+        ] == [
+            ("install", "fake tool", 4),
+            ("step", "setup", None),
+        ]
+        with open(self.output) as f:
+            assert f"report={self.report}\n" in f.read()
+        with open(self.summary) as f:
+            assert "| fake tool |" in f.read()
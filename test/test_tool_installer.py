@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+# file: test/test_tool_installer.py
+Tests for the pinned, cached tool installer.
+
+Run with: python -m pytest test/test_tool_installer.py -v
+"""
+
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+import pytest
+
+# Add the scripts directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+try:
+    from tool_installer import (
+        ToolStore,
+        cache_keys,
+        entry_digest,
+        environment_exports,
+        load_manifest,
+        main,
+        plan_tools,
+        required_runtimes,
+        required_tools,
+    )
+except ImportError as e:
+    pytest.skip(
+        f"Could not import tool_installer: {e}", allow_module_level=True
+    )
+
+
+MANIFEST = {
+    "ruff": {
+        "installer": "pip",
+        "packages": {"ruff": "0.6.9"},
+        "bin": ["ruff"],
+    },
+    "gofumpt": {
+        "installer": "go",
+        "packages": {"mvdan.cc/gofumpt": "v0.7.0"},
+        "bin": ["gofumpt"],
+    },
+    "eslint": {
+        "installer": "npm",
+        "packages": {"eslint": "8.57.1"},
+        "bin": ["eslint"],
+    },
+    "r-packages": {
+        "installer": "cran",
+        "packages": {"styler": "2024-10-01"},
+        "languages": ["r"],
+    },
+    "shellcheck": {
+        "installer": "system",
+        "bin": ["shellcheck"],
+        "fallback": {sys.platform: [["install-shellcheck"]]},
+    },
+}
+
+
+def _write_list(list_dir, language, files):
+    """Write a NUL-separated discovery list."""
+    with open(os.path.join(list_dir, f"{language}.list"), "w") as f:
+        f.write("".join(f"{name}\0" for name in files))
+
+
+def _fake_install(argv, env=None, **_kwargs):
+    """Stand-in for run_timed that creates the installed command."""
+    if env and "GOBIN" in env:
+        os.makedirs(env["GOBIN"], exist_ok=True)
+        open(os.path.join(env["GOBIN"], "gofumpt"), "w").close()
+    return 0, "installed", 1.5, 2048
+
+
+@pytest.fixture
+def _failed_install():
+    """Make every install command fail."""
+    with patch(
+        "tool_installer.run_timed",
+        return_value=(1, "network down", 0.2, None),
+    ):
+        yield
+
+
+class TestPlanning:
+    """Tests for choosing tools and cache keys."""
+
+    def setup_method(self):
+        """Set up a temporary list directory."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.lists = self.tmpdir.name
+
+    def teardown_method(self):
+        """Clean up the temporary directory."""
+        self.tmpdir.cleanup()
+
+    def test_shipped_manifest_is_pinned(self):
+        """Test every shipped tool pins exact versions."""
+        for name, entry in load_manifest().items():
+            for package, version in entry.get("packages", {}).items():
+                assert version, (name, package)
+                assert "latest" not in version, (name, package)
+
+    def test_only_languages_with_files(self):
+        """Test the plan follows the job graph of the discovered files."""
+        _write_list(self.lists, "python", ["a.py"])
+
+        executables, languages = plan_tools(
+            self.lists, "all", self.lists, enable_linting=False
+        )
+
+        assert executables == {"ruff"}
+        assert languages == {"python"}
+        assert required_tools(load_manifest(), executables, languages) == [
+            "ruff"
+        ]
+
+    def test_language_entries(self):
+        """Test entries without commands are selected by language."""
+        assert required_tools(MANIFEST, {"Rscript"}, {"r"}) == ["r-packages"]
+        assert required_tools(MANIFEST, {"eslint"}, {"nodejs"}) == ["eslint"]
+
+    def test_runtimes(self):
+        """Test runtimes follow installers and languages that run them."""
+        _write_list(self.lists, "python", ["a.py"])
+        _write_list(self.lists, "shell", ["run.sh"])
+        _write_list(self.lists, "csharp", ["Program.cs"])
+        _write_list(self.lists, "dotnet", ["App.csproj"])
+        manifest = load_manifest()
+
+        executables, languages = plan_tools(self.lists, "all", self.lists)
+        names = required_tools(manifest, executables, languages)
+
+        # shfmt is built with go install; dotnet format needs the SDK
+        assert required_runtimes(manifest, names, languages) == [
+            "dotnet",
+            "go",
+            "python",
+        ]
+        assert required_runtimes(MANIFEST, ["r-packages"], {"r"}) == ["r"]
+
+    def test_cache_keys(self):
+        """Test the key follows the selection and the prefix the manifest."""
+        key, prefix = cache_keys(MANIFEST, ["ruff"])
+        other_key, other_prefix = cache_keys(MANIFEST, ["ruff", "gofumpt"])
+
+        assert key.startswith(prefix)
+        assert prefix == other_prefix
+        assert key != other_key
+        assert cache_keys(MANIFEST, ["gofumpt", "ruff"])[0] == other_key
+
+    def test_digest_follows_pins(self):
+        """Test a changed pin gets a new store directory."""
+        bumped = {**MANIFEST["ruff"], "packages": {"ruff": "0.7.0"}}
+
+        assert entry_digest("ruff", MANIFEST["ruff"]) != entry_digest(
+            "ruff", bumped
+        )
+
+    def test_plan_cli(self):
+        """Test plan exposes the tools and cache keys as step outputs."""
+        _write_list(self.lists, "go", ["main.go"])
+        output = os.path.join(self.tmpdir.name, "output")
+
+        with patch.dict(os.environ, {"GITHUB_OUTPUT": output}):
+            code = main(
+                [
+                    "plan",
+                    "--list-dir",
+                    self.lists,
+                    "--root",
+                    self.lists,
+                    "--enable-linting",
+                    "false",
+                ]
+            )
+
+        assert code == 0
+        with open(output) as f:
+            outputs = dict(line.split("=", 1) for line in f.read().splitlines())
+        assert outputs["tools"] == "gofumpt,goimports,golines"
+        assert outputs["languages"] == ",go,"
+        assert outputs["runtimes"] == ",go,"
+        assert outputs["key"].startswith(outputs["restore-key"])
+
+
+class TestToolStore:
+    """Tests for installing into the content-addressed store."""
+
+    def setup_method(self):
+        """Set up a temporary store."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = ToolStore(os.path.join(self.tmpdir.name, "store"))
+
+    def teardown_method(self):
+        """Clean up the temporary directory."""
+        self.tmpdir.cleanup()
+
+    @patch("tool_installer.run_timed", side_effect=_fake_install)
+    def test_cold_then_warm(self, mock_run):
+        """Test a second install of the same pin is served from the store."""
+        entry = MANIFEST["gofumpt"]
+
+        state, code, _, seconds, rss = self.store.install("gofumpt", entry)
+        assert (state, code, seconds, rss) == ("cold", 0, 1.5, 2048)
+        argv = mock_run.call_args[0][0]
+        assert argv == ["go", "install", "mvdan.cc/gofumpt@v0.7.0"]
+        link = os.path.join(self.store.bin_dir, "gofumpt")
+        assert os.path.islink(link)
+
+        state, code, _, seconds, _ = self.store.install("gofumpt", entry)
+        assert (state, code, seconds) == ("warm", 0, 0.0)
+        assert mock_run.call_count == 1
+
+    @pytest.mark.usefixtures("_failed_install")
+    def test_failed_install_is_not_marked_complete(self):
+        """Test a failed install is retried on the next run."""
+        entry = MANIFEST["ruff"]
+
+        state, code, output, _, _ = self.store.install("ruff", entry)
+
+        assert (state, code, output) == ("cold", 1, "network down")
+        assert not self.store.is_installed(entry_digest("ruff", entry))
+
+    @patch("tool_installer.run_timed", return_value=(0, "", 3.0, None))
+    @patch("tool_installer.shutil.which")
+    def test_system_tool(self, mock_which, mock_run):
+        """Test a system tool on PATH is used and a missing one installed."""
+        mock_which.return_value = "/usr/bin/shellcheck"
+        assert self.store.install("shellcheck", MANIFEST["shellcheck"])[:2] == (
+            "system",
+            0,
+        )
+        mock_run.assert_not_called()
+
+        mock_which.return_value = None
+        assert self.store.install("shellcheck", MANIFEST["shellcheck"])[:2] == (
+            "cold",
+            0,
+        )
+        mock_run.assert_called_once_with(["install-shellcheck"])
+
+    def test_prune_and_exports(self):
+        """Test stale entries are removed and npm/R paths exported."""
+        keep = entry_digest("eslint", MANIFEST["eslint"])
+        os.makedirs(self.store.entry_dir(keep))
+        os.makedirs(self.store.entry_dir("stale"))
+        os.makedirs(self.store.bin_dir)
+
+        assert self.store.prune([keep]) == ["stale"]
+        assert sorted(os.listdir(self.store.path)) == sorted(["bin", keep])
+
+        with patch.dict(os.environ, {"NODE_PATH": "/existing"}):
+            exports = environment_exports(
+                self.store, MANIFEST, ["eslint", "r-packages", "ruff"]
+            )
+        node_path = os.path.join(self.store.entry_dir(keep), "node_modules")
+        assert exports["NODE_PATH"] == os.pathsep.join([node_path, "/existing"])
+        assert exports["R_LIBS"].endswith("library")